@@ -0,0 +1,56 @@
+"""
+Micro-benchmark for NetworkFileTalker.write_work_nodes_edges.
+
+    python benchmarks/bench_talker_write.py --works 100000 --refs 40
+
+Writes synthetic Work pages to a temporary directory and reports records per second.
+Anything the talker prints to stdout is discarded so terminal speed does not skew results.
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import Work
+
+
+def synthetic_page(start: int, size: int, refs: int):
+    return [
+        Work(
+            id=f"https://openalex.org/W{i}",
+            title=f"Synthetic work {i}",
+            references=[f"https://openalex.org/W{(i * 7919 + k) % 10_000_000}" for k in range(refs)],
+            publication_year=2000 + i % 25,
+            doi=f"https://doi.org/10.0000/{i}",
+            cited_by_count=i % 1000,
+        )
+        for i in range(start, start + size)
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--works", type=int, default=100_000)
+    ap.add_argument("--refs", type=int, default=40, help="references per work")
+    ap.add_argument("--page-size", type=int, default=200)
+    args = ap.parse_args()
+
+    pages = [synthetic_page(s, min(args.page_size, args.works - s), args.refs) for s in range(0, args.works, args.page_size)]
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            talker = NetworkFileTalker(json_out_file=os.path.join(tmp, "work_nodes.json"),
+                                       reference_edge_file=os.path.join(tmp, "reference_edges.csv"))
+            start = time.perf_counter()
+            for page in pages:
+                talker.write_work_nodes_edges(page)
+            elapsed = time.perf_counter() - start
+    print(f"{args.works} works, {args.works * args.refs} edges in {elapsed:.2f}s: {args.works / elapsed:,.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
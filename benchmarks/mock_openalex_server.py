@@ -0,0 +1,211 @@
+"""
+Local stand-in for api.openalex.org, serving a synthetic corpus for benchmarks.
+
+    python benchmarks/mock_openalex_server.py --works 100000 --port 8765 --latency 0.02 --rate-429 0.01
+
+Endpoints:
+  /topics, /topics/{id}            topic search and lookup (one synthetic topic, T1)
+  /topics/{id}/works, /works       page=N or cursor=* pagination, per-page up to 200,
+                                   select=, filter=openalex_id:W1|W2|...
+  /works/{id}                      one work
+  /__stats                         request counters
+Works are generated deterministically from their index, so any corpus size costs no memory.
+"""
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+TOPIC_ID = "T1"
+MAX_PER_PAGE = 200
+
+
+class SyntheticCorpus:
+    """
+    num_works works W1..Wn. Each cites a skewed-random number of earlier works
+    (mean `mean_refs`), preferring older works, so in-degree is heavy-tailed.
+    """
+    def __init__(self, num_works: int, mean_refs: int = 40, seed: int = 0):
+        self.num_works = num_works
+        self.mean_refs = mean_refs
+        self.seed = seed
+
+    def work(self, index: int) -> Dict[str, Any]:
+        rnd = random.Random(self.seed * 1_000_003 + index)
+        n_refs = min(index, int(rnd.expovariate(1 / self.mean_refs))) if self.mean_refs else 0
+        refs = sorted({int(index * rnd.random() ** 2) + 1 for _ in range(n_refs)})
+        wid = index + 1
+        return {
+            "id": f"https://openalex.org/W{wid}",
+            "doi": f"https://doi.org/10.5555/synthetic.{wid}",
+            "title": f"Synthetic climate work {wid}",
+            "display_name": f"Synthetic climate work {wid}",
+            "publication_year": 1950 + index * 75 // max(1, self.num_works),
+            "cited_by_count": int(rnd.paretovariate(1.2)) - 1,
+            "best_oa_location": {"pdf_url": f"https://example.org/{wid}.pdf"} if wid % 3 == 0 else None,
+            "primary_location": {"source": {"display_name": f"Journal {wid % 97}"}},
+            "referenced_works": [f"https://openalex.org/W{r}" for r in refs],
+            "topics": [{"id": f"https://openalex.org/{TOPIC_ID}", "display_name": "Synthetic climate topic"}],
+        }
+
+    def index_of(self, work_id: str) -> Optional[int]:
+        key = work_id.rstrip("/").rsplit("/", 1)[-1]
+        if not key.startswith("W") or not key[1:].isdigit():
+            return None
+        index = int(key[1:]) - 1
+        return index if 0 <= index < self.num_works else None
+
+
+def _project(record: Dict[str, Any], select: Optional[str]) -> Dict[str, Any]:
+    if not select:
+        return record
+    return {f: record.get(f) for f in select.split(",")}
+
+
+def _encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(str(offset).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    return 0 if cursor == "*" else int(base64.urlsafe_b64decode(cursor.encode()).decode())
+
+
+class MockOpenAlexServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, corpus: SyntheticCorpus, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, rate_429: float = 0.0, seed: int = 0):
+        super().__init__((host, port), _Handler)
+        self.corpus = corpus
+        self.latency = latency
+        self.rate_429 = rate_429
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self._throttled: set = set()
+        self.counts: Dict[str, int] = {"requests": 0, "rate_limited": 0, "bytes_sent": 0}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockOpenAlexServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def should_throttle(self, request_key: str) -> bool:
+        """
+        Inject a 429 with probability rate_429, but never twice in a row for one request,
+        so a client that retries once always gets through.
+        """
+        with self._lock:
+            self.counts["requests"] += 1
+            if request_key in self._throttled:
+                self._throttled.discard(request_key)
+                return False
+            if self.rate_429 and self._rnd.random() < self.rate_429:
+                self._throttled.add(request_key)
+                self.counts["rate_limited"] += 1
+                return True
+            return False
+
+    def count_bytes(self, n: int) -> None:
+        with self._lock:
+            self.counts["bytes_sent"] += n
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockOpenAlexServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        query.pop("mailto", None)
+        if parts.path == "/__stats":
+            return self._send(200, server.snapshot())
+        if server.latency:
+            time.sleep(server.latency)
+        if server.should_throttle(self.path):
+            return self._send(429, {"error": "rate limited"}, {"Retry-After": "0"})
+        segments = [s for s in parts.path.split("/") if s]
+        corpus = server.corpus
+        if segments == ["topics"]:
+            return self._send(200, {"meta": {"count": 1}, "results": [self._topic()]})
+        if len(segments) == 2 and segments[0] == "topics":
+            return self._send(200, self._topic()) if segments[1] == TOPIC_ID else self._send(404, {"error": "not found"})
+        if len(segments) == 3 and segments[0] == "topics" and segments[2] == "works":
+            return self._send(200, self._list(range(corpus.num_works), query))
+        if segments == ["works"]:
+            filter_q = query.get("filter", "")
+            if filter_q.startswith("openalex_id:"):
+                found = (corpus.index_of(i) for i in filter_q.split(":", 1)[1].split("|"))
+                return self._send(200, self._list([i for i in found if i is not None], query))
+            if filter_q:
+                return self._send(400, {"error": f"unsupported filter {filter_q}"})
+            return self._send(200, self._list(range(corpus.num_works), query))
+        if len(segments) == 2 and segments[0] == "works":
+            index = corpus.index_of(segments[1])
+            if index is None:
+                return self._send(404, {"error": "not found"})
+            return self._send(200, _project(corpus.work(index), query.get("select")))
+        return self._send(404, {"error": "not found"})
+
+    def _topic(self) -> Dict[str, Any]:
+        return {"id": f"https://openalex.org/{TOPIC_ID}", "display_name": "Synthetic climate topic", "works_count": self.server.corpus.num_works}
+
+    def _list(self, indices: Any, query: Dict[str, str]) -> Dict[str, Any]:
+        per_page = min(int(query.get("per-page") or query.get("per_page") or 25), MAX_PER_PAGE)
+        total = len(indices)
+        meta: Dict[str, Any] = {"count": total, "per_page": per_page}
+        if "cursor" in query:
+            offset = _decode_cursor(query["cursor"])
+            meta["next_cursor"] = _encode_cursor(offset + per_page) if offset + per_page < total else None
+        else:
+            page = int(query.get("page", 1))
+            offset = (page - 1) * per_page
+            meta["page"] = page
+        select = query.get("select")
+        corpus = self.server.corpus
+        results: List[Dict[str, Any]] = [_project(corpus.work(i), select) for i in indices[offset:offset + per_page]]
+        return {"meta": meta, "results": results}
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count_bytes(len(body))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--works", type=int, default=100_000)
+    ap.add_argument("--mean-refs", type=int, default=40)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    ap.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    args = ap.parse_args()
+    server = MockOpenAlexServer(SyntheticCorpus(args.works, args.mean_refs), port=args.port, latency=args.latency, rate_429=args.rate_429)
+    print(f"Serving {args.works} synthetic works at {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
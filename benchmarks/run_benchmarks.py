@@ -0,0 +1,201 @@
+"""
+Benchmark the harvest -> write -> load pipeline against the local mock OpenAlex server.
+
+    python benchmarks/run_benchmarks.py --sizes 1000,100000,1000000 --output benchmark_results.json
+
+For every corpus size this times
+  harvest      OpenAlexClient.get_works_for_topic (including its talker writes)
+  write        NetworkFileTalker.write_work_nodes_edges of the harvested works
+  read         NetworkFileTalker.iter_records over the written node file
+  build        TopicCitationNetworkBuilder.build_network_for_topic
+  save_graph   TopicCitationNetworkBuilder.save_graph
+and records wall time, throughput, memory and the requests the server saw, as JSON.
+Memory per stage is the peak RSS sampled while that stage ran (stage_peak_rss_mb, and
+its growth over the RSS at the start of the stage); process_peak_rss_mb is the peak of
+the whole process so far, which includes every earlier stage and size.
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient
+from climate_citations.topic_citation_network import TopicCitationNetworkBuilder
+from mock_openalex_server import TOPIC_ID, MockOpenAlexServer, SyntheticCorpus
+
+
+PAGE_SIZE = resource.getpagesize()
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak RSS of the process since it started (never goes down between stages).
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Current RSS of the process, or None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * PAGE_SIZE / (1024 * 1024)
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class RssSampler:
+    """
+    Sample the current RSS every `interval` seconds in a background thread, keeping
+    the start value and the peak seen while the sampler runs.
+    """
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_mb = current_rss_mb()
+        self.peak_mb = self.start_mb
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _sample(self) -> None:
+        rss = current_rss_mb()
+        if rss is not None and (self.peak_mb is None or rss > self.peak_mb):
+            self.peak_mb = rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        if self.start_mb is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._thread.is_alive():
+            self._stop.set()
+            self._thread.join()
+        self._sample()
+
+
+def run_stage(server: MockOpenAlexServer, fn: Callable[[], int]) -> Dict[str, Any]:
+    """
+    Run fn (which returns the number of items it processed) and measure it.
+    """
+    before = server.snapshot()
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        items = fn()
+        elapsed = time.perf_counter() - start
+    after = server.snapshot()
+    sampled = rss.peak_mb is not None
+    return {
+        "seconds": round(elapsed, 4),
+        "items": items,
+        "items_per_second": round(items / elapsed, 1) if elapsed > 0 else None,
+        "stage_peak_rss_mb": round(rss.peak_mb, 1) if sampled else None,
+        "stage_rss_growth_mb": round(rss.peak_mb - rss.start_mb, 1) if sampled else None,
+        "process_peak_rss_mb": round(peak_rss_mb(), 1),
+        "requests": after["requests"] - before["requests"],
+        "rate_limited": after["rate_limited"] - before["rate_limited"],
+        "bytes_received": after["bytes_sent"] - before["bytes_sent"],
+    }
+
+
+def benchmark_size(num_works: int, args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    server = MockOpenAlexServer(SyntheticCorpus(num_works, args.mean_refs), latency=args.latency, rate_429=args.rate_429).start()
+    stages: Dict[str, Any] = {}
+    try:
+        harvest_talker = NetworkFileTalker(json_out_file=os.path.join(workdir, "harvest_nodes.json"),
+                                           reference_edge_file=os.path.join(workdir, "harvest_edges.csv"))
+        client = OpenAlexClient(talker=harvest_talker, sleep_on_rate_limit=args.rate_limit_sleep)
+        client._client.BASE = server.base_url
+        works = []
+
+        def harvest() -> int:
+            works.extend(client.get_works_for_topic(TOPIC_ID, per_page=args.per_page, workers=args.workers))
+            return len(works)
+
+        node_file = os.path.join(workdir, "work_nodes.json")
+        talker = NetworkFileTalker(json_out_file=node_file, reference_edge_file=os.path.join(workdir, "reference_edges.csv"))
+
+        def write() -> int:
+            for start in range(0, len(works), args.per_page):
+                talker.write_work_nodes_edges(works[start:start + args.per_page])
+            return len(works)
+
+        def read() -> int:
+            return sum(1 for _ in talker.iter_records(node_file))
+
+        stages["harvest"] = run_stage(server, harvest)
+        stages["write"] = run_stage(server, write)
+        works.clear()
+        stages["read"] = run_stage(server, read)
+
+        builder = TopicCitationNetworkBuilder(client=client._client, max_works=num_works, per_page=args.per_page)
+        graphs = []
+
+        def build() -> int:
+            graphs.append(builder.build_network_for_topic(TOPIC_ID))
+            return graphs[0].number_of_edges()
+
+        def save() -> int:
+            builder.save_graph(graphs[0], os.path.join(workdir, f"graph.{args.graph_format}"), fmt=args.graph_format)
+            return graphs[0].number_of_edges()
+
+        stages["build"] = run_stage(server, build)
+        stages["save_graph"] = run_stage(server, save)
+        return {"works": num_works, "stages": stages}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv: Optional[list] = None) -> Dict[str, Any]:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,100000,1000000", help="comma-separated corpus sizes")
+    ap.add_argument("--mean-refs", type=int, default=40, help="mean referenced_works per work")
+    ap.add_argument("--per-page", type=int, default=200)
+    ap.add_argument("--workers", type=int, default=1, help="workers for get_works_for_topic")
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds of server latency per request")
+    ap.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    ap.add_argument("--rate-limit-sleep", type=float, default=0.0, help="client sleep_on_rate_limit")
+    ap.add_argument("--graph-format", default="graphml", choices=["gexf", "gml", "graphml", "json"])
+    ap.add_argument("--output", default="benchmark_results.json")
+    args = ap.parse_args(argv)
+
+    report: Dict[str, Any] = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": [],
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as workdir, open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                result = benchmark_size(size, args, workdir)
+        report["results"].append(result)
+        print(json.dumps(result))
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Wrote {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -3,4 +3,4 @@ This file marks the directory as a Python package.
 """
 
 # package marker and re-exports
-__all__ = ["openalex", "openalex_topic_client", "topic_citation_network"]
\ No newline at end of file
+__all__ = ["async_openalex_client", "batch_harvester", "checkpoint", "citation_index", "citation_matrix", "codec", "csr", "dedup_index", "edge_store", "enrichment", "graph_export", "harvest_pipeline", "http_cache", "incremental_refresh", "instrumentation", "line_index", "openalex", "openalex_topic_client", "parquet_store", "rate_limiter", "retry_policy", "snowball_crawler", "topic_citation_network", "transport", "work_ids"]
\ No newline at end of file
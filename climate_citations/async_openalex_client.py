@@ -0,0 +1,110 @@
+"""
+asyncio counterpart of OpenAlexTopicClient, built on aiohttp.
+All coroutines using one client share its token-bucket rate limiter, so several
+topics can be harvested concurrently from one process within one request budget.
+Methods return raw OpenAlex JSON dicts, as TopicCitationNetworkBuilder expects.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from . import codec
+from .rate_limiter import AsyncRateLimiter
+from .retry_policy import RetryPolicy
+
+
+class AsyncOpenAlexTopicClient:
+    BASE = "https://api.openalex.org"
+
+    def __init__(self, mailto: Optional[str] = None, session: Optional[Any] = None, requests_per_second: float = 10.0, rate_limiter: Optional[AsyncRateLimiter] = None, retry_policy: Optional[RetryPolicy] = None, timeout: float = 30.0):
+        """
+        `session` is an aiohttp.ClientSession (or compatible object); if omitted, one is
+        created on first use and closed by close() / `async with`.
+        """
+        self.mailto = mailto
+        self.session = session
+        self._owns_session = session is None
+        self.rate_limiter = rate_limiter or AsyncRateLimiter(requests_per_second)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timeout = timeout
+
+    async def __aenter__(self) -> "AsyncOpenAlexTopicClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> Any:
+        if self.session is None:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise ImportError("AsyncOpenAlexTopicClient requires aiohttp: pip install aiohttp") from e
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self.session
+
+    async def _get(self, path: str, params: Optional[Dict] = None) -> Dict:
+        """
+        GET path with the shared rate limiter. Retryable statuses (429, 5xx) are retried
+        with exponential backoff plus jitter; a Retry-After header on a 429 response
+        also pushes back every other coroutine sharing the limiter.
+        """
+        params = {k: str(v) for k, v in (params or {}).items()}
+        if self.mailto:
+            params.setdefault("mailto", self.mailto)
+        url = path if path.startswith("http") else f"{self.BASE}{path}"
+        session = self._get_session()
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            async with session.get(url, params=params) as resp:
+                if self.retry_policy.should_retry(resp.status, attempt):
+                    delay = self.retry_policy.delay(attempt, resp.headers.get("Retry-After"))
+                    if resp.status == 429:
+                        self.rate_limiter.penalize(delay)
+                else:
+                    resp.raise_for_status()
+                    return codec.loads(await resp.read())
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get_topic(self, topic_id: str) -> Dict:
+        path = f"/topics/{topic_id}" if not str(topic_id).startswith("/") and not str(topic_id).startswith("http") else topic_id
+        return await self._get(path)
+
+    async def search_topics(self, query: str, per_page: int = 25, max_pages: int = 1) -> List[Dict]:
+        results: List[Dict] = []
+        for page in range(1, max_pages + 1):
+            data = await self._get("/topics", params={"search": query, "per-page": per_page, "page": page})
+            results.extend(data.get("results", []))
+        return results
+
+    async def get_work(self, work_id: str, select: Optional[Sequence[str]] = None) -> Dict:
+        path = f"/works/{work_id}" if not str(work_id).startswith("/") and not str(work_id).startswith("http") else work_id
+        return await self._get(path, params={"select": ",".join(select)} if select else None)
+
+    async def iter_topic_works(self, topic_id: str, per_page: int = 200, max_results: Optional[int] = None, filter_q: Optional[str] = None, select: Optional[Sequence[str]] = None) -> AsyncIterator[Dict]:
+        """
+        Yield raw work records for a topic using cursor paging, up to max_results.
+        select limits the records to the given OpenAlex fields (default: full records).
+        """
+        cursor: Optional[str] = "*"
+        yielded = 0
+        while cursor:
+            params: Dict[str, Any] = {"per-page": per_page, "cursor": cursor}
+            if filter_q:
+                params["filter"] = filter_q
+            if select:
+                params["select"] = ",".join(select)
+            data = await self._get(f"/topics/{topic_id}/works", params=params)
+            items = data.get("results", [])
+            for item in items:
+                yield item
+                yielded += 1
+                if max_results and yielded >= max_results:
+                    return
+            cursor = data.get("meta", {}).get("next_cursor") if items else None
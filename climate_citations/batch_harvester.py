@@ -0,0 +1,200 @@
+"""
+Batch harvest of many (overlapping) topics, e.g. every topic matching search_topics("climate").
+
+Topic page fetches are scheduled across a thread pool: each topic is a chain of cursor
+pages, and up to `workers` topics have a page in flight at once, all through the one
+client (and so under its one rate limiter). Works already harvested for another topic
+are recognised by their raw "id" before they are parsed and are not written again;
+instead every (work, topic) pair is appended to a membership side table.
+"""
+import csv
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, TextIO
+
+from .dedup_index import SqliteIdIndex, _compact_key
+from .openalex import OpenAlexClient, select_param
+from .work_ids import short_id
+
+
+@dataclass
+class TopicProgress:
+    topic: str
+    # meta.count of the topic, known after its first page
+    total: Optional[int] = None
+    fetched: int = 0
+    new_works: int = 0
+    pages: int = 0
+    started: float = field(default_factory=time.monotonic)
+    done: bool = False
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.fetched / elapsed if elapsed > 0 else 0.0
+
+    def eta(self) -> Optional[float]:
+        """
+        Estimated seconds until the topic is harvested, or None while unknown.
+        """
+        if self.done:
+            return 0.0
+        rate = self.rate()
+        if self.total is None or rate == 0:
+            return None
+        return max(self.total - self.fetched, 0) / rate
+
+    def __str__(self) -> str:
+        total = "?" if self.total is None else self.total
+        eta = self.eta()
+        eta_text = "done" if self.done else ("ETA ?" if eta is None else f"ETA {eta:.0f}s")
+        return f"{self.topic}: {self.fetched}/{total} works ({self.new_works} new), {self.rate():.0f} works/s, {eta_text}"
+
+
+@dataclass
+class BatchHarvestStats:
+    topics: int = 0
+    records_fetched: int = 0
+    works_written: int = 0
+    duplicates_skipped: int = 0
+    memberships: int = 0
+    requests: int = 0
+
+
+class BatchHarvester:
+    """
+    Harvest a list of topics (or the topics found by a search query) through one
+    OpenAlexClient, writing each distinct work once with client.talker and recording
+    (work_id, topic_id) rows in membership_file.
+
+    The request rate is bounded by the client's rate limiter (requests_per_second).
+    Works are deduplicated against `index` when given (a persistent SqliteIdIndex,
+    shared across runs), otherwise against an in-memory set kept by the harvester.
+    `progress` is called with a topic's TopicProgress after each of its pages; the
+    default prints it, at most every progress_interval seconds per topic.
+    """
+    def __init__(self, client: OpenAlexClient, workers: int = 4, per_page: int = 200, membership_file: str = "work_topics.csv", select: Optional[Sequence[str]] = None, index: Optional[SqliteIdIndex] = None, progress: Optional[Callable[[TopicProgress], None]] = None, progress_interval: float = 5.0):
+        self.client = client
+        self.workers = workers
+        self.per_page = per_page
+        self.membership_file = membership_file
+        self.select = select
+        self.index = index
+        self.progress = progress or self._print_progress
+        self.progress_interval = progress_interval
+        self.topics: Dict[str, TopicProgress] = {}
+        self.stats = BatchHarvestStats()
+        self._seen: set = set()
+        self._last_report: Dict[str, float] = {}
+
+    def _print_progress(self, progress: TopicProgress) -> None:
+        now = time.monotonic()
+        if progress.done or now - self._last_report.get(progress.topic, 0.0) >= self.progress_interval:
+            self._last_report[progress.topic] = now
+            print(progress)
+
+    def _new_flags(self, work_ids: List[str]) -> List[bool]:
+        """
+        For each work ID, whether this is its first sighting. Nothing is marked seen
+        until _register, once the works are written.
+        """
+        if self.index is not None:
+            return self.index.new_keys(_compact_key(w) for w in work_ids)
+        flags = []
+        pending = set()
+        for w in work_ids:
+            flags.append(w not in self._seen and w not in pending)
+            pending.add(w)
+        return flags
+
+    def _register(self, work_ids: List[str]) -> None:
+        if self.index is not None:
+            self.index.add(_compact_key(w) for w in work_ids)
+        else:
+            self._seen.update(work_ids)
+
+    def _fetch_page(self, topic: str, cursor: str) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"per-page": self.per_page, "cursor": cursor}
+        select = select_param(self.select)
+        if select:
+            params["select"] = select
+        return self.client._get(f"/topics/{topic}/works", params=params)
+
+    def _process_page(self, topic: str, data: Dict[str, Any], membership: TextIO, max_items: Optional[int]) -> Optional[str]:
+        """
+        Dedupe, parse and write one page of a topic; returns the topic's next cursor, or None when it is done.
+        """
+        progress = self.topics[topic]
+        progress.pages += 1
+        meta = data.get("meta", {})
+        if progress.total is None and meta.get("count") is not None:
+            progress.total = min(meta["count"], max_items) if max_items else meta["count"]
+        items = [i for i in data.get("results", []) if i.get("id")]
+        if max_items:
+            items = items[:max_items - progress.fetched]
+
+        ids = [i["id"] for i in items]
+        new_items = [i for i, is_new in zip(items, self._new_flags(ids)) if is_new]
+        new_works = [self.client.build_work(i) for i in new_items]
+        self.client.talker.write_work_nodes_edges(new_works)
+        # only written works count as harvested, so a failed write is retried by the next run
+        self._register([i["id"] for i in new_items])
+        csv.writer(membership).writerows((work_id, topic) for work_id in ids)
+
+        progress.fetched += len(items)
+        progress.new_works += len(new_works)
+        self.stats.records_fetched += len(items)
+        self.stats.works_written += len(new_works)
+        self.stats.duplicates_skipped += len(items) - len(new_works)
+        self.stats.memberships += len(ids)
+
+        next_cursor = meta.get("next_cursor") if items else None
+        if max_items and progress.fetched >= max_items:
+            next_cursor = None
+        progress.done = next_cursor is None
+        self.progress(progress)
+        return next_cursor
+
+    def harvest(self, topic_ids: Optional[List[str]] = None, query: Optional[str] = None, max_topics: int = 25, max_items_per_topic: Optional[int] = None) -> BatchHarvestStats:
+        """
+        Harvest topic_ids, or the first max_topics topics returned by search_topics(query).
+        Returns the stats of this call; per-topic progress is kept in self.topics.
+        """
+        if topic_ids is None:
+            if not query:
+                raise ValueError("Pass topic_ids or a search query")
+            topic_ids = [t.id for t in self.client.search_topics(query, per_page=max_topics)]
+        topics = list(dict.fromkeys(short_id(t) for t in topic_ids))
+        self.stats = BatchHarvestStats(topics=len(topics))
+        self.topics = {t: TopicProgress(t) for t in topics}
+        queued: Deque[str] = deque(topics)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool, \
+                open(self.membership_file, "a", newline="", encoding="utf-8") as membership:
+            in_flight: Dict[Future, str] = {}
+
+            def submit(topic: str, cursor: str) -> None:
+                if cursor == "*":
+                    self.topics[topic].started = time.monotonic()
+                in_flight[pool.submit(self._fetch_page, topic, cursor)] = topic
+                self.stats.requests += 1
+
+            while queued and len(in_flight) < self.workers:
+                submit(queued.popleft(), "*")
+            try:
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        topic = in_flight.pop(fut)
+                        next_cursor = self._process_page(topic, fut.result(), membership, max_items_per_topic)
+                        if next_cursor:
+                            submit(topic, next_cursor)
+                        elif queued:
+                            submit(queued.popleft(), "*")
+            finally:
+                for fut in in_flight:
+                    fut.cancel()
+        print(f"Harvested {len(topics)} topics: {self.stats}")
+        print(f"HTTP: {self.client.transport_stats}")
+        return self.stats
@@ -0,0 +1,42 @@
+import json
+import os
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+
+@dataclass
+class HarvestCheckpoint:
+    """
+    Progress of a cursor-paged harvest, committed after each page has been written.
+    `cursor` is the OpenAlex cursor of the next page to fetch; None means the harvest finished.
+    `node_offset` and `edge_offset` are the sizes of the node and edge files at commit time,
+    so anything past them is a partial write from an interrupted page.
+    """
+    topic: str
+    filter: Optional[str] = None
+    cursor: Optional[str] = "*"
+    records_written: int = 0
+    node_offset: int = 0
+    edge_offset: int = 0
+
+    @classmethod
+    def load(cls, path: str) -> Optional["HarvestCheckpoint"]:
+        """
+        Return the checkpoint stored at path, or None if there is none yet.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                return cls(**json.load(fh))
+        except FileNotFoundError:
+            return None
+
+    def save(self, path: str) -> None:
+        """
+        Atomically replace the checkpoint file, so a crash never leaves a half-written one.
+        """
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(asdict(self), fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
@@ -0,0 +1,333 @@
+"""
+Local citation index over harvested data, so questions like "who in our corpus cites
+W123" are answered without re-reading work_nodes.json / reference_edges.csv or
+calling OpenAlex again.
+
+CitationIndex.load() imports NetworkFileTalker output into a SQLite file with a node
+attribute table (works) and an edge table clustered on (source, target) plus an index
+on (target, source), giving forward and reverse adjacency by B-tree lookup. Work IDs
+are stored as int keys (W123 -> 123). serve() exposes the queries as a small local
+JSON HTTP endpoint:
+
+    GET /works/W123              attributes and references
+    GET /works/W123/references   referenced works
+    GET /works/W123/cited_by     works in the index citing W123
+    GET /works/W123/degree       {"in": ..., "out": ...}
+    GET /expand?ids=W1,W2&k=2&direction=both&max_nodes=1000
+    GET /top_cited?n=10&by=local|openalex&min_year=&max_year=
+"""
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from . import codec
+from .dedup_index import QUERY_CHUNK_SIZE
+from .network_file_talker import NetworkFileTalker
+from .openalex import Work
+from .work_ids import work_id_from_key, work_key
+
+DIRECTIONS = ("references", "cited_by", "both")
+ATTRIBUTE_COLUMNS = ("title", "publication_year", "doi", "cited_by_count", "best_oa_location__pdf_url")
+LOAD_BATCH_SIZE = 100000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS works (
+    key INTEGER PRIMARY KEY,
+    title TEXT,
+    publication_year INTEGER,
+    doi TEXT,
+    cited_by_count INTEGER,
+    best_oa_location__pdf_url TEXT
+);
+CREATE TABLE IF NOT EXISTS edges (
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    PRIMARY KEY (source, target)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_by_target ON edges (target, source);
+CREATE INDEX IF NOT EXISTS works_by_cited_by_count ON works (cited_by_count);
+"""
+
+
+def _key(work_id: Any) -> Optional[int]:
+    try:
+        return work_key(work_id)
+    except (TypeError, ValueError):
+        return None
+
+
+class CitationIndex:
+    """
+    SQLite-backed citation index, safe to share between threads. Queries take and
+    return OpenAlex work IDs (short or full URL form in, full URLs out); IDs that are
+    not OpenAlex work IDs are ignored. Adjacency lists come back sorted by work key.
+    """
+    def __init__(self, path: str = "citation_index.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "CitationIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _query_chunked(self, sql: str, keys: Sequence[int]) -> List[Tuple]:
+        """
+        Run sql, whose "{marks}" is an IN (...) list, over keys in QUERY_CHUNK_SIZE chunks.
+        """
+        rows: List[Tuple] = []
+        with self._lock:
+            for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+                chunk = keys[start:start + QUERY_CHUNK_SIZE]
+                rows.extend(self._conn.execute(sql.format(marks=",".join("?" * len(chunk))), chunk))
+        return rows
+
+    def load(self, node_file: Optional[str] = None, edge_file: Optional[str] = None, batch_size: int = LOAD_BATCH_SIZE) -> Tuple[int, int]:
+        """
+        Import a NetworkFileTalker node file (NDJSON) and edge file (CSV or BinaryEdgeSink
+        directory). Loading again adds new edges and replaces the attributes of works
+        seen before. Returns the (nodes, edges) rows read.
+        """
+        from .graph_export import iter_edge_file
+
+        nodes = edges = 0
+        if node_file:
+            batch: List[Tuple] = []
+            for record in NetworkFileTalker(json_out_file=None, reference_edge_file=None).iter_records(node_file):
+                key = _key(record.get("id"))
+                if key is None:
+                    continue
+                batch.append((key,) + tuple(record.get(c) for c in ATTRIBUTE_COLUMNS))
+                if len(batch) >= batch_size:
+                    nodes += self._insert("INSERT OR REPLACE INTO works VALUES (?, ?, ?, ?, ?, ?)", batch)
+                    batch = []
+            nodes += self._insert("INSERT OR REPLACE INTO works VALUES (?, ?, ?, ?, ?, ?)", batch)
+        if edge_file:
+            # rebuild the reverse index once after the bulk insert rather than per row
+            with self._lock:
+                self._conn.execute("DROP INDEX IF EXISTS edges_by_target")
+            pairs: List[Tuple[int, int]] = []
+            for source, target in iter_edge_file(edge_file):
+                s, t = _key(source), _key(target)
+                if s is None or t is None:
+                    continue
+                pairs.append((s, t))
+                if len(pairs) >= batch_size:
+                    pairs.sort()
+                    edges += self._insert("INSERT OR IGNORE INTO edges VALUES (?, ?)", pairs)
+                    pairs = []
+            pairs.sort()
+            edges += self._insert("INSERT OR IGNORE INTO edges VALUES (?, ?)", pairs)
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("ANALYZE")
+            self._conn.commit()
+        return nodes, edges
+
+    def _insert(self, sql: str, rows: List[Tuple]) -> int:
+        if rows:
+            with self._lock:
+                self._conn.executemany(sql, rows)
+                self._conn.commit()
+        return len(rows)
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM works")[0][0]
+
+    def __contains__(self, work_id: str) -> bool:
+        key = _key(work_id)
+        return key is not None and bool(self._query("SELECT 1 FROM works WHERE key = ?", (key,)))
+
+    def num_edges(self) -> int:
+        return self._query("SELECT COUNT(*) FROM edges")[0][0]
+
+    def attributes(self, work_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored attributes of a harvested work (with its "id"), or None.
+        """
+        key = _key(work_id)
+        if key is None:
+            return None
+        rows = self._query(f"SELECT {', '.join(ATTRIBUTE_COLUMNS)} FROM works WHERE key = ?", (key,))
+        if not rows:
+            return None
+        return dict(zip(("id",) + ATTRIBUTE_COLUMNS, (work_id_from_key(key),) + rows[0]))
+
+    def get_work(self, work_id: str) -> Optional[Work]:
+        """
+        The harvested work as a Work (references from the edge table), or None if it was not harvested.
+        """
+        attrs = self.attributes(work_id)
+        if attrs is None:
+            return None
+        return Work(references=self.references(work_id), **attrs)
+
+    def references(self, work_id: str) -> List[str]:
+        key = _key(work_id)
+        return [work_id_from_key(t) for (t,) in self._query("SELECT target FROM edges WHERE source = ?", (key,))]
+
+    def cited_by(self, work_id: str) -> List[str]:
+        key = _key(work_id)
+        return [work_id_from_key(s) for (s,) in self._query("SELECT source FROM edges WHERE target = ?", (key,))]
+
+    def references_many(self, work_ids: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        {work_id: referenced works} for many works in a few queries; unknown works map to [].
+        """
+        return self._adjacency_many(work_ids, "SELECT source, target FROM edges WHERE source IN ({marks})")
+
+    def cited_by_many(self, work_ids: Iterable[str]) -> Dict[str, List[str]]:
+        return self._adjacency_many(work_ids, "SELECT target, source FROM edges WHERE target IN ({marks})")
+
+    def _adjacency_many(self, work_ids: Iterable[str], sql: str) -> Dict[str, List[str]]:
+        requested = {work_id: _key(work_id) for work_id in work_ids}
+        found: Dict[int, List[str]] = {}
+        keys = sorted({k for k in requested.values() if k is not None})
+        for node, neighbor in self._query_chunked(sql, keys):
+            found.setdefault(node, []).append(work_id_from_key(neighbor))
+        return {work_id: found.get(key, []) for work_id, key in requested.items()}
+
+    def degree(self, work_id: str) -> Dict[str, int]:
+        key = _key(work_id)
+        out_degree = self._query("SELECT COUNT(*) FROM edges WHERE source = ?", (key,))[0][0]
+        in_degree = self._query("SELECT COUNT(*) FROM edges WHERE target = ?", (key,))[0][0]
+        return {"in": in_degree, "out": out_degree}
+
+    def expand(self, work_ids: Iterable[str], k: int = 1, direction: str = "both", max_nodes: Optional[int] = None) -> Dict[str, int]:
+        """
+        Breadth-first k-hop neighborhood of work_ids along references, cited_by or
+        both. Returns {work_id: hop distance}, seeds at 0, stopping early once
+        max_nodes works are reached. Each hop is a few batched queries.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}")
+        queries = []
+        if direction in ("references", "both"):
+            queries.append("SELECT target FROM edges WHERE source IN ({marks})")
+        if direction in ("cited_by", "both"):
+            queries.append("SELECT source FROM edges WHERE target IN ({marks})")
+        distance: Dict[int, int] = {}
+        for key in (_key(w) for w in work_ids):
+            if key is not None:
+                distance.setdefault(key, 0)
+        frontier = sorted(distance)
+        for hop in range(1, k + 1):
+            if not frontier or (max_nodes and len(distance) >= max_nodes):
+                break
+            found = set()
+            for sql in queries:
+                found.update(n for (n,) in self._query_chunked(sql, frontier))
+            frontier = []
+            for n in sorted(found):
+                if n not in distance:
+                    if max_nodes and len(distance) >= max_nodes:
+                        break
+                    distance[n] = hop
+                    frontier.append(n)
+        return {work_id_from_key(n): d for n, d in distance.items()}
+
+    def top_cited(self, n: int = 10, by: str = "local", min_year: Optional[int] = None, max_year: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        The n most cited works as (work_id, count): by="local" counts citations within
+        the index (any cited work), by="openalex" ranks harvested works by their
+        cited_by_count. Year bounds restrict to harvested works.
+        """
+        where, params = [], []
+        if min_year is not None:
+            where.append("w.publication_year >= ?")
+            params.append(min_year)
+        if max_year is not None:
+            where.append("w.publication_year <= ?")
+            params.append(max_year)
+        condition = f"WHERE {' AND '.join(where)}" if where else ""
+        if by == "local":
+            join = "JOIN works w ON w.key = e.target" if where else ""
+            sql = f"SELECT e.target, COUNT(*) AS c FROM edges e {join} {condition} GROUP BY e.target ORDER BY c DESC, e.target LIMIT ?"
+        elif by == "openalex":
+            condition = f"{condition} {'AND' if where else 'WHERE'} w.cited_by_count IS NOT NULL"
+            sql = f"SELECT w.key, w.cited_by_count FROM works w {condition} ORDER BY w.cited_by_count DESC, w.key LIMIT ?"
+        else:
+            raise ValueError("by must be 'local' or 'openalex'")
+        return [(work_id_from_key(key), count) for key, count in self._query(sql, params + [n])]
+
+
+class _IndexRequestHandler(BaseHTTPRequestHandler):
+    index: CitationIndex
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+        try:
+            status, body = 200, self._route(parts, query)
+        except (KeyError, ValueError) as e:
+            status, body = 400, {"error": str(e)}
+        if body is None:
+            status, body = 404, {"error": "not found"}
+        payload = codec.dumps_bytes(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _route(self, parts: List[str], query: Dict[str, str]) -> Any:
+        index = self.index
+        if len(parts) == 2 and parts[0] == "works":
+            attrs = index.attributes(parts[1])
+            if attrs is not None:
+                attrs["references"] = index.references(parts[1])
+            return attrs
+        if len(parts) == 3 and parts[0] == "works":
+            action = {"references": index.references, "cited_by": index.cited_by, "degree": index.degree}.get(parts[2])
+            return action(parts[1]) if action else None
+        if parts == ["expand"]:
+            ids = [i for i in query["ids"].split(",") if i]
+            max_nodes = int(query["max_nodes"]) if "max_nodes" in query else None
+            return index.expand(ids, k=int(query.get("k", 1)), direction=query.get("direction", "both"), max_nodes=max_nodes)
+        if parts == ["top_cited"]:
+            years = {name: int(query[name]) for name in ("min_year", "max_year") if name in query}
+            return index.top_cited(int(query.get("n", 10)), by=query.get("by", "local"), **years)
+        return None
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def make_server(index: CitationIndex, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """
+    HTTP server answering queries from index (port 0 picks a free port); call serve_forever() on it.
+    """
+    handler = type("IndexRequestHandler", (_IndexRequestHandler,), {"index": index})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(path: str = "citation_index.sqlite", host: str = "127.0.0.1", port: int = 8765) -> None:
+    """
+    Serve the index at path on http://host:port/ until interrupted.
+    """
+    with CitationIndex(path) as index:
+        server = make_server(index, host, port)
+        print(f"Serving {path} ({len(index)} works) on http://{host}:{server.server_address[1]}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
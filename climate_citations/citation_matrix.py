@@ -0,0 +1,196 @@
+"""
+Sparse-matrix citation graph backend built on SciPy (optional dependency).
+
+A CitationMatrix holds a CSR adjacency A with A[i, j] = 1 when node i references
+node j, plus the node-index mapping. Degree counts, PageRank, co-citation (A^T A)
+and bibliographic coupling (A A^T) are computed with vectorized sparse operations.
+"""
+import csv
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+
+from .csr import CSRAdjacency
+from .edge_store import EdgeStoreReader
+from .work_ids import full_id
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:  # optional dependency
+    np = None
+    sp = None
+
+
+def _require_scipy() -> None:
+    if sp is None:
+        raise ImportError("CitationMatrix requires numpy and scipy: pip install numpy scipy")
+
+
+class CitationMatrix:
+    def __init__(self, adjacency: Any, node_ids: Sequence[str]):
+        _require_scipy()
+        adjacency = sp.csr_matrix(adjacency, dtype=np.int64)
+        adjacency.sum_duplicates()
+        adjacency.data[:] = 1
+        self.adjacency = adjacency
+        self.node_ids = list(node_ids)
+        self._index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_index_arrays(cls, sources: Any, targets: Any, node_ids: Sequence[str]) -> "CitationMatrix":
+        _require_scipy()
+        n = len(node_ids)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        data = np.ones(len(sources), dtype=np.int64)
+        return cls(sp.coo_matrix((data, (sources, targets)), shape=(n, n)), node_ids)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]], node_ids: Iterable[str] = ()) -> "CitationMatrix":
+        """
+        Build from (citing, cited) ID pairs; node_ids lists extra (e.g. isolated) nodes first.
+        """
+        index: Dict[str, int] = {}
+        for node_id in node_ids:
+            index.setdefault(node_id, len(index))
+        sources: List[int] = []
+        targets: List[int] = []
+        for s, t in edges:
+            sources.append(index.setdefault(s, len(index)))
+            targets.append(index.setdefault(t, len(index)))
+        return cls.from_index_arrays(sources, targets, list(index))
+
+    @classmethod
+    def from_edge_file(cls, path: str) -> "CitationMatrix":
+        """
+        Build from a reference_edges.csv written by NetworkFileTalker, streaming its rows.
+        """
+        with open(path, "r", newline="", encoding="utf-8") as fh:
+            return cls.from_edges((row[0], row[1]) for row in csv.reader(fh) if len(row) >= 2)
+
+    @classmethod
+    def from_edge_store(cls, directory: str) -> "CitationMatrix":
+        """
+        Build from an edge_store.BinaryEdgeSink directory, reading the int64 edge arrays directly.
+        """
+        with EdgeStoreReader(directory) as reader:
+            pairs = np.frombuffer(reader.pairs, dtype=np.int64).reshape(-1, 2)
+            node_ids = [full_id(reader.ids.key(i)) for i in range(reader.num_nodes)]
+            matrix = cls.from_index_arrays(pairs[:, 0], pairs[:, 1], node_ids)
+            del pairs
+        return matrix
+
+    @classmethod
+    def from_csr(cls, csr: CSRAdjacency) -> "CitationMatrix":
+        _require_scipy()
+        n = csr.num_nodes
+        data = np.ones(csr.num_edges, dtype=np.int64)
+        indptr = np.frombuffer(csr.indptr, dtype=np.int64)
+        indices = np.frombuffer(csr.indices, dtype=np.int64)
+        return cls(sp.csr_matrix((data, indices, indptr), shape=(n, n)), csr.node_ids)
+
+    @classmethod
+    def from_builder(cls, builder: Any, topic_id: str, **kwargs: Any) -> "CitationMatrix":
+        """
+        Build a topic's network with TopicCitationNetworkBuilder, bypassing NetworkX.
+        """
+        return cls.from_csr(builder.build_network_for_topic(topic_id, as_csr=True, **kwargs))
+
+    @classmethod
+    def from_networkx(cls, G: nx.DiGraph) -> "CitationMatrix":
+        return cls.from_edges(G.edges(), G.nodes())
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        Convert to a NetworkX DiGraph; only sensible for small graphs.
+        """
+        G = nx.DiGraph()
+        G.add_nodes_from(self.node_ids)
+        coo = self.adjacency.tocoo()
+        ids = self.node_ids
+        G.add_edges_from((ids[i], ids[j]) for i, j in zip(coo.row.tolist(), coo.col.tolist()))
+        return G
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.adjacency.nnz)
+
+    def index_of(self, node_id: str) -> int:
+        if self._index is None:
+            self._index = {n: i for i, n in enumerate(self.node_ids)}
+        return self._index[node_id]
+
+    def in_degree(self) -> Any:
+        """
+        Times each node is cited within the graph.
+        """
+        return np.bincount(self.adjacency.indices, minlength=self.num_nodes)
+
+    def out_degree(self) -> Any:
+        """
+        References each node makes within the graph.
+        """
+        return np.diff(self.adjacency.indptr)
+
+    def top_k_cited(self, k: int = 10) -> List[Tuple[str, int]]:
+        counts = self.in_degree()
+        k = min(k, len(counts))
+        if k <= 0:
+            return []
+        top = np.argpartition(-counts, k - 1)[:k]
+        top = top[np.lexsort((top, -counts[top]))]
+        return [(self.node_ids[i], int(counts[i])) for i in top]
+
+    def pagerank(self, alpha: float = 0.85, tol: float = 1.0e-10, max_iter: int = 100) -> Dict[str, float]:
+        """
+        PageRank by power iteration, with citations passing rank to the cited works.
+        Nodes without references spread their rank uniformly, as in networkx.pagerank.
+        """
+        n = self.num_nodes
+        if n == 0:
+            return {}
+        out = self.out_degree().astype(float)
+        dangling = out == 0
+        inv_out = np.divide(1.0, out, out=np.zeros(n), where=~dangling)
+        transition = self.adjacency.T.tocsr().astype(float)
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            previous = rank
+            rank = alpha * (transition @ (previous * inv_out) + previous[dangling].sum() / n) + (1 - alpha) / n
+            if np.abs(rank - previous).sum() < n * tol:
+                break
+        return dict(zip(self.node_ids, rank.tolist()))
+
+    def cocitation(self) -> Any:
+        """
+        Sparse matrix C with C[i, j] = number of works citing both i and j (diagonal zeroed).
+        """
+        return self._zero_diagonal(self.adjacency.T @ self.adjacency)
+
+    def coupling(self) -> Any:
+        """
+        Sparse matrix B with B[i, j] = number of references shared by i and j (diagonal zeroed).
+        """
+        return self._zero_diagonal(self.adjacency @ self.adjacency.T)
+
+    def cocitation_count(self, a: str, b: str) -> int:
+        col_a = self.adjacency[:, self.index_of(a)]
+        col_b = self.adjacency[:, self.index_of(b)]
+        return int(col_a.multiply(col_b).sum())
+
+    def coupling_count(self, a: str, b: str) -> int:
+        row_a = self.adjacency[self.index_of(a)]
+        row_b = self.adjacency[self.index_of(b)]
+        return int(row_a.multiply(row_b).sum())
+
+    @staticmethod
+    def _zero_diagonal(m: Any) -> Any:
+        m = m.tocsr()
+        m.setdiag(0)
+        m.eliminate_zeros()
+        return m
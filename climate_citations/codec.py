@@ -0,0 +1,167 @@
+"""
+Pluggable JSON codec used by the HTTP clients, the response cache, NetworkFileTalker
+and TopicCitationNetworkBuilder.save_graph.
+
+orjson or msgspec is used for decoding when installed (optional dependencies), the
+standard library otherwise. Encoding always uses the standard library's default
+format ({"id": "W1", "title": null}, NaN, 1e+16), so NDJSON files stay byte-compatible
+with files written by earlier versions whichever backend is installed. Pass
+encode=True to set_backend() to also encode with the fast backend; its output is
+compact and formats floats differently (1e16, NaN as null), so only opt in for files
+no one compares byte for byte. The decoding backend can also be chosen with the
+CLIMATE_CITATIONS_JSON environment variable.
+"""
+import json
+import os
+from dataclasses import MISSING, fields, is_dataclass
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+BACKENDS = ("orjson", "msgspec", "json")
+ENV_VAR = "CLIMATE_CITATIONS_JSON"
+
+_STDLIB_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_STDLIB_PRETTY_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+_FIELD_NAMES: Dict[type, Tuple[frozenset, frozenset]] = {}
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+Text = Union[str, bytes, bytearray, memoryview]
+# exceptions raised by loads() on invalid input, for every backend
+DECODE_ERRORS: tuple = (ValueError,) + ((msgspec.DecodeError,) if msgspec is not None else ())
+
+
+def available_backends() -> List[str]:
+    return [name for name, module in (("orjson", orjson), ("msgspec", msgspec), ("json", json)) if module is not None]
+
+
+def set_backend(name: str, encode: bool = False) -> None:
+    """
+    Switch the decoding backend (and the encoding one too if encode); raises ImportError
+    if it is not installed.
+    """
+    global backend, encoder, loads, dumps, dumps_bytes, dumps_pretty
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name} (expected one of {', '.join(BACKENDS)})")
+    if name not in available_backends():
+        raise ImportError(f"JSON backend {name} is not installed: pip install {name}")
+    backend = name
+    encoder = name if encode else "json"
+    loads = _FUNCTIONS[name][0]
+    dumps, dumps_bytes, dumps_pretty = _FUNCTIONS[encoder][1:]
+
+
+def _stdlib_loads(data: Text) -> Any:
+    if not isinstance(data, str):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return _STDLIB_ENCODER.encode(obj)
+
+
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    return _STDLIB_ENCODER.encode(obj).encode("utf-8")
+
+
+def _stdlib_dumps_pretty(obj: Any) -> str:
+    return _STDLIB_PRETTY_ENCODER.encode(obj)
+
+
+def _orjson_loads(data: Text) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # NaN / Infinity, as written by the standard library encoder
+        return _stdlib_loads(data)
+
+
+def _msgspec_loads(data: Text) -> Any:
+    try:
+        return msgspec.json.decode(data)
+    except msgspec.DecodeError:
+        return _stdlib_loads(data)
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+
+
+def _orjson_dumps_bytes(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+
+def _orjson_dumps_pretty(obj: Any) -> str:
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2).decode("utf-8")
+
+
+def _msgspec_dumps(obj: Any) -> str:
+    return msgspec.json.encode(obj).decode("utf-8")
+
+
+def _msgspec_dumps_pretty(obj: Any) -> str:
+    return msgspec.json.format(msgspec.json.encode(obj), indent=2).decode("utf-8")
+
+
+_FUNCTIONS: Dict[str, tuple] = {
+    "json": (_stdlib_loads, _stdlib_dumps, _stdlib_dumps_bytes, _stdlib_dumps_pretty),
+}
+if orjson is not None:
+    _FUNCTIONS["orjson"] = (_orjson_loads, _orjson_dumps, _orjson_dumps_bytes, _orjson_dumps_pretty)
+if msgspec is not None:
+    _FUNCTIONS["msgspec"] = (_msgspec_loads, _msgspec_dumps, msgspec.json.encode, _msgspec_dumps_pretty)
+
+
+def from_mapping(type_: type, obj: Dict[str, Any]) -> Any:
+    """
+    Build the dataclass type_ from the keys of obj that are fields of type_.
+    A record that cannot be one (not an object, or missing a required field such as
+    a node line without "id") is returned unchanged.
+    """
+    cached = _FIELD_NAMES.get(type_)
+    if cached is None:
+        type_fields = fields(type_)
+        cached = _FIELD_NAMES[type_] = (
+            frozenset(f.name for f in type_fields),
+            frozenset(f.name for f in type_fields if f.default is MISSING and f.default_factory is MISSING),
+        )
+    names, required = cached
+    if not isinstance(obj, dict) or not required.issubset(obj.keys()):
+        return obj
+    return type_(**{k: v for k, v in obj.items() if k in names})
+
+
+def decoder_for(type_: type) -> Callable[[Text], Any]:
+    """
+    Decoder of JSON documents into instances of the dataclass type_ (e.g. Work or Topic).
+    With msgspec the document is decoded straight into type_; otherwise it is parsed to a
+    dict and the dataclass built from the keys that are fields of type_. Documents that
+    cannot be a type_ either raise (msgspec) or come back as dicts (see from_mapping).
+    """
+    if not is_dataclass(type_):
+        raise TypeError(f"{type_!r} is not a dataclass")
+    if backend == "msgspec":
+        return msgspec.json.Decoder(type_).decode
+    parse = loads
+
+    def decode(data: Text) -> Any:
+        return from_mapping(type_, parse(data))
+    return decode
+
+
+backend = ""
+encoder = "json"
+loads: Callable[[Text], Any] = _stdlib_loads
+dumps: Callable[[Any], str] = _stdlib_dumps
+dumps_bytes: Callable[[Any], bytes] = _stdlib_dumps_bytes
+dumps_pretty: Callable[[Any], str] = _stdlib_dumps_pretty
+set_backend(os.environ.get(ENV_VAR) or available_backends()[0])
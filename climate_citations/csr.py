@@ -0,0 +1,84 @@
+"""
+Compressed sparse row (CSR) adjacency for citation graphs, using only the standard library.
+Row i lists the (sorted, deduplicated) indices of the works that node_ids[i] references.
+"""
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class CSRAdjacency:
+    node_ids: List[str]
+    indptr: array
+    indices: array
+    # attributes of the nodes that were harvested as works, keyed by node index
+    node_attrs: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    _index: Optional[Dict[str, int]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def index_of(self, node_id: str) -> int:
+        if self._index is None:
+            self._index = {n: i for i, n in enumerate(self.node_ids)}
+        return self._index[node_id]
+
+    def out_degree(self, node_id: str) -> int:
+        i = self.index_of(node_id)
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def successors(self, node_id: str) -> List[str]:
+        i = self.index_of(node_id)
+        return [self.node_ids[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def edges(self) -> Iterable[Tuple[str, str]]:
+        for i, node_id in enumerate(self.node_ids):
+            for j in self.indices[self.indptr[i]:self.indptr[i + 1]]:
+                yield node_id, self.node_ids[j]
+
+
+def build_csr(edges: Iterable[Tuple[str, str]], nodes: Iterable[Tuple[str, Dict[str, Any]]] = ()) -> CSRAdjacency:
+    """
+    Build a CSRAdjacency from (source, target) pairs and optional (node_id, attrs) pairs.
+    Node indices are assigned in order of first appearance, nodes first.
+    """
+    index: Dict[str, int] = {}
+    node_ids: List[str] = []
+
+    def intern(node_id: str) -> int:
+        i = index.get(node_id)
+        if i is None:
+            i = index[node_id] = len(node_ids)
+            node_ids.append(node_id)
+        return i
+
+    node_attrs = {intern(node_id): attrs for node_id, attrs in nodes}
+    src, dst = array("q"), array("q")
+    for s, t in edges:
+        src.append(intern(s))
+        dst.append(intern(t))
+
+    # counting sort of the edges by source row
+    n = len(node_ids)
+    starts = [0] * (n + 1)
+    for s in src:
+        starts[s + 1] += 1
+    for i in range(n):
+        starts[i + 1] += starts[i]
+    fill = starts[:-1]
+    by_row = array("q", bytes(8 * len(dst)))
+    for s, t in zip(src, dst):
+        by_row[fill[s]] = t
+        fill[s] += 1
+
+    indptr, indices = array("q", [0]), array("q")
+    for i in range(n):
+        indices.extend(sorted(set(by_row[starts[i]:starts[i + 1]])))
+        indptr.append(len(indices))
+    return CSRAdjacency(node_ids=node_ids, indptr=indptr, indices=indices, node_attrs=node_attrs, _index=index)
@@ -0,0 +1,209 @@
+"""
+Deduplicating node and edge sinks.
+
+NetworkFileTalker appends, so overlapping topics and re-runs repeat node lines and
+edges. SqliteIdIndex is a persistent set of the work IDs and edges already written,
+kept in a SQLite file (a B-tree primary key, so lookups stay cheap at millions of
+keys without holding them in Python sets), and DedupNetworkFileTalker consults it
+to write each work and each edge at most once.
+"""
+import csv
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from .network_file_talker import NetworkFileTalker, UpsertStats, _edge_rows, _node_line_id
+from .work_ids import OPENALEX_URL_PREFIX
+
+# SQLite's historical limit on bound parameters per statement is 999
+QUERY_CHUNK_SIZE = 500
+
+
+def _compact_key(work_id: str) -> str:
+    """
+    Index key of a work ID: the OpenAlex URL prefix is dropped, other IDs are kept verbatim.
+    """
+    work_id = str(work_id)
+    return work_id[len(OPENALEX_URL_PREFIX):] if work_id.startswith(OPENALEX_URL_PREFIX) else work_id
+
+
+def _edge_key(from_work: str, referenced_work: str) -> str:
+    return f"{_compact_key(from_work)} {_compact_key(referenced_work)}"
+
+
+def _tail_lines(path: Optional[str], offset: int) -> Iterator[str]:
+    """
+    Lines of path after byte offset (none if the file is missing or shorter).
+    """
+    if not path or not os.path.exists(path) or os.path.getsize(path) <= offset:
+        return
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        for line in fh:
+            yield line.decode("utf-8", errors="replace")
+
+
+@dataclass
+class DedupStats:
+    nodes_written: int = 0
+    nodes_skipped: int = 0
+    edges_written: int = 0
+    edges_skipped: int = 0
+
+
+class SqliteIdIndex:
+    """
+    Persistent set of string keys in one table of a SQLite file, safe to share between threads.
+    Several indexes (e.g. nodes and edges) can live in the same file under different tables.
+    """
+    def __init__(self, path: str = "dedup_index.sqlite", table: str = "ids"):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table!r}")
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute(f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)).fetchone() is not None
+
+    def _fresh(self, first: List[str]) -> List[str]:
+        # caller holds self._lock
+        existing = set()
+        for start in range(0, len(first), QUERY_CHUNK_SIZE):
+            chunk = first[start:start + QUERY_CHUNK_SIZE]
+            marks = ",".join("?" * len(chunk))
+            existing.update(row[0] for row in self._conn.execute(f"SELECT key FROM {self.table} WHERE key IN ({marks})", chunk))
+        return [k for k in first if k not in existing]
+
+    @staticmethod
+    def _first_flags(keys: List[str], fresh: List[str]) -> List[bool]:
+        pending = set(fresh)
+        result = []
+        for k in keys:
+            result.append(k in pending)
+            pending.discard(k)
+        return result
+
+    def new_keys(self, keys: Iterable[str]) -> List[bool]:
+        """
+        Like add_new, but only looks the keys up; register them with add() once they are written.
+        """
+        keys = list(keys)
+        with self._lock:
+            fresh = self._fresh(list(dict.fromkeys(keys)))
+        return self._first_flags(keys, fresh)
+
+    def add_new(self, keys: Iterable[str]) -> List[bool]:
+        """
+        Add keys to the index in one transaction. Returns, for each key in order, whether it
+        was new (a key repeated within the batch is new only at its first occurrence).
+        """
+        keys = list(keys)
+        with self._lock:
+            fresh = self._fresh(list(dict.fromkeys(keys)))
+            if fresh:
+                self._conn.executemany(f"INSERT OR IGNORE INTO {self.table} (key) VALUES (?)", ((k,) for k in fresh))
+                self._conn.commit()
+        return self._first_flags(keys, fresh)
+
+    def add(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._conn.executemany(f"INSERT OR IGNORE INTO {self.table} (key) VALUES (?)", ((k,) for k in keys))
+            self._conn.commit()
+
+    def discard(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", ((k,) for k in keys))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class DedupNetworkFileTalker(NetworkFileTalker):
+    """
+    NetworkFileTalker that skips works (by id) and edges already written to its files,
+    across calls and across runs, using SqliteIdIndex tables in index_file.
+    Records without an id are written unchanged. The edge_sink path is not deduplicated.
+    upsert_work_nodes_edges is passed through and only registers the upserted works and
+    edges; edges it removes stay in the index.
+    """
+    def __init__(self, *args: Any, index_file: str = "dedup_index.sqlite", **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.node_index = SqliteIdIndex(index_file, "nodes")
+        self.edge_index = SqliteIdIndex(index_file, "edges")
+        self.dedup_stats = DedupStats()
+        self._write_lock = threading.RLock()
+
+    @staticmethod
+    def _record_id(obj: Any) -> Optional[str]:
+        return obj.get("id") if isinstance(obj, dict) else getattr(obj, "id", None)
+
+    def write_list(self, object_list: List[Any], filename: Optional[str] = None) -> None:
+        # keys are registered only after the append succeeded, so a failed or
+        # truncated write never leaves a work marked as written
+        with self._write_lock:
+            ids = [self._record_id(o) for o in object_list]
+            new = iter(self.node_index.new_keys(_compact_key(i) for i in ids if i is not None))
+            kept = [(o, i) for o, i in zip(object_list, ids) if i is None or next(new)]
+            if kept:
+                super().write_list([o for o, _ in kept], filename)
+                self.node_index.add(_compact_key(i) for _, i in kept if i is not None)
+            self.dedup_stats.nodes_written += len(kept)
+            self.dedup_stats.nodes_skipped += len(object_list) - len(kept)
+
+    def _write_edge_rows(self, rows: Iterable[Tuple[str, str]], filename: Optional[str] = None) -> None:
+        rows = rows if isinstance(rows, list) else list(rows)
+        with self._write_lock:
+            new = self.edge_index.new_keys(_edge_key(a, b) for a, b in rows)
+            kept = [row for row, is_new in zip(rows, new) if is_new]
+            if kept:
+                super()._write_edge_rows(kept, filename)
+                self.edge_index.add(_edge_key(a, b) for a, b in kept)
+            self.dedup_stats.edges_written += len(kept)
+            self.dedup_stats.edges_skipped += len(rows) - len(kept)
+
+    def truncate_files(self, node_offset: int, edge_offset: int, work_node_file: Optional[str] = None, reference_edge_file: Optional[str] = None) -> None:
+        """
+        Also remove the works and edges on the cut lines from the index (before cutting,
+        so a crash in between can only duplicate lines, never lose them), so that a
+        resumed harvest writes them again.
+        """
+        with self._write_lock:
+            node_keys = [_compact_key(i) for i in map(_node_line_id, _tail_lines(work_node_file or self.json_out_file, node_offset)) if i]
+            edge_keys = [_edge_key(row[0], row[1]) for row in csv.reader(_tail_lines(reference_edge_file or self.reference_edge_file, edge_offset)) if len(row) >= 2]
+            self.node_index.discard(node_keys)
+            self.edge_index.discard(edge_keys)
+            super().truncate_files(node_offset, edge_offset, work_node_file, reference_edge_file)
+
+    def upsert_work_nodes_edges(self, pages: Iterable[List[Any]], work_node_file: Optional[str] = None, reference_edge_file: Optional[str] = None) -> UpsertStats:
+        node_keys: List[str] = []
+        edge_keys: List[str] = []
+
+        def registered(pages: Iterable[List[Any]]) -> Iterable[List[Any]]:
+            for page in pages:
+                node_keys.extend(_compact_key(w.id) for w in page)
+                edge_keys.extend(_edge_key(a, b) for a, b in _edge_rows(page))
+                yield page
+        stats = super().upsert_work_nodes_edges(registered(pages), work_node_file, reference_edge_file)
+        # registered once the upsert has been applied to the files
+        self.node_index.add(node_keys)
+        self.edge_index.add(edge_keys)
+        return stats
+
+    def close(self) -> None:
+        self.node_index.close()
+        self.edge_index.close()
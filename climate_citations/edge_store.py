@@ -0,0 +1,205 @@
+"""
+Compact binary edge store: an alternative edge sink to the CSV written by
+NetworkFileTalker.write_reference_edges.
+
+Work IDs are interned into a persistent dictionary (one short ID such as "W123"
+per line of node_ids.txt; the line number is the ID's int64 index), and every
+edge is appended to edges.bin as a packed little-endian (from, to) int64 pair:
+16 bytes per edge instead of ~70 bytes of CSV text.
+"""
+import csv
+import mmap
+import os
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .work_ids import full_id, short_id
+
+NODE_IDS_FILE = "node_ids.txt"
+EDGES_FILE = "edges.bin"
+EDGE_RECORD_BYTES = 16
+
+
+class WorkIdDictionary:
+    """
+    Persistent, append-only string -> int64 dictionary of work IDs.
+    A torn last line (a crash mid-append) is not an ID: it is ignored, and with
+    repair=True (for writers) cut off the file so later IDs keep their indexes.
+    """
+    def __init__(self, path: str, repair: bool = False):
+        self.path = path
+        self._index: Dict[str, int] = {}
+        self._keys: List[str] = []
+        if os.path.exists(path):
+            end = 0
+            with open(path, "rb") as fh:
+                for line in fh:
+                    if not line.endswith(b"\n"):
+                        break
+                    key = line[:-1].decode("utf-8")
+                    self._index[key] = len(self._keys)
+                    self._keys.append(key)
+                    end += len(line)
+            if repair and os.path.getsize(path) > end:
+                with open(path, "r+b") as fh:
+                    fh.truncate(end)
+        self._pending: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def intern(self, work_id: str) -> int:
+        """
+        Return the index of work_id, assigning the next free index to a new ID.
+        """
+        key = short_id(work_id)
+        idx = self._index.get(key)
+        if idx is None:
+            idx = len(self._keys)
+            self._index[key] = idx
+            self._keys.append(key)
+            self._pending.append(key)
+        return idx
+
+    def lookup(self, work_id: str) -> Optional[int]:
+        return self._index.get(short_id(work_id))
+
+    def key(self, idx: int) -> str:
+        """
+        Short ID ("W123") stored at idx.
+        """
+        return self._keys[idx]
+
+    def flush(self) -> None:
+        if self._pending:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write("\n".join(self._pending) + "\n")
+            self._pending = []
+
+
+def _to_little_endian(values: array) -> array:
+    if sys.byteorder == "big":
+        values = array("q", values)
+        values.byteswap()
+    return values
+
+
+class BinaryEdgeSink:
+    """
+    Appends edges to <directory>/edges.bin and interns IDs into <directory>/node_ids.txt.
+    Has the same write_reference_edges signature as NetworkFileTalker, and
+    write_work_edges to go straight from Work objects to int pairs.
+    """
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ids = WorkIdDictionary(os.path.join(directory, NODE_IDS_FILE), repair=True)
+        self.edge_path = os.path.join(directory, EDGES_FILE)
+        # a torn trailing record would misalign every edge appended after it
+        if os.path.exists(self.edge_path):
+            size = os.path.getsize(self.edge_path)
+            if size % EDGE_RECORD_BYTES:
+                with open(self.edge_path, "r+b") as fh:
+                    fh.truncate(size - size % EDGE_RECORD_BYTES)
+
+    def write_reference_edges(self, reference_edges: Iterable[Any], filename: Optional[str] = None) -> None:
+        pairs = array("q")
+        for e in reference_edges:
+            pairs.append(self.ids.intern(e.from_work))
+            pairs.append(self.ids.intern(e.referenced_work))
+        self._append(pairs)
+
+    def write_work_edges(self, works: Iterable[Any]) -> None:
+        """
+        Append one edge per reference of each Work-like object, without building ReferenceEdge objects.
+        """
+        pairs = array("q")
+        intern = self.ids.intern
+        for w in works:
+            src = intern(w.id)
+            for r in (w.references or []):
+                pairs.append(src)
+                pairs.append(intern(r))
+        self._append(pairs)
+
+    def _append(self, pairs: array) -> None:
+        if not pairs:
+            return
+        # IDs first, so every stored edge refers to a persisted ID
+        self.ids.flush()
+        with open(self.edge_path, "ab") as fh:
+            fh.write(_to_little_endian(pairs).tobytes())
+
+
+class EdgeStoreReader:
+    """
+    Zero-copy reader for a BinaryEdgeSink directory. The edge file is memory-mapped and
+    exposed as int64 views: `pairs` (flat from, to, from, to, ...), `sources` and `targets`.
+    Call close() (or use as a context manager) to release the mapping.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.ids = WorkIdDictionary(os.path.join(directory, NODE_IDS_FILE))
+        edge_path = os.path.join(directory, EDGES_FILE)
+        size = os.path.getsize(edge_path) if os.path.exists(edge_path) else 0
+        size -= size % EDGE_RECORD_BYTES  # ignore a torn trailing record
+        self._mmap: Optional[mmap.mmap] = None
+        self._base: Optional[memoryview] = None
+        if size == 0:
+            self.pairs = memoryview(array("q"))
+        elif sys.byteorder == "big":
+            values = array("q")
+            with open(edge_path, "rb") as fh:
+                values.frombytes(fh.read(size))
+            values.byteswap()
+            self.pairs = memoryview(values)
+        else:
+            with open(edge_path, "rb") as fh:
+                self._mmap = mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ)
+            self._base = memoryview(self._mmap)
+            self.pairs = self._base.cast("q")
+        self.sources = self.pairs[0::2]
+        self.targets = self.pairs[1::2]
+
+    def __enter__(self) -> "EdgeStoreReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.pairs) // 2
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.ids)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str]]:
+        """
+        Yield edges as full OpenAlex URL pairs, as written to reference_edges.csv.
+        """
+        key = self.ids.key
+        for src, dst in zip(self.sources, self.targets):
+            yield full_id(key(src)), full_id(key(dst))
+
+    def export_csv(self, path: str) -> int:
+        """
+        Write the edges in NetworkFileTalker's CSV format (from_work,referenced_work).
+        Returns the number of edges written.
+        """
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerows(self.iter_edges())
+        return self.num_edges
+
+    def close(self) -> None:
+        self.sources.release()
+        self.targets.release()
+        self.pairs.release()
+        if self._base is not None:
+            self._base.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
@@ -0,0 +1,58 @@
+"""
+Batched resolution of OpenAlex works by ID.
+Instead of one GET per work, IDs are resolved through
+/works?filter=openalex_id:W1|W2|... with an optional select= projection.
+"""
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .work_ids import short_id
+
+# OpenAlex accepts up to 100 values in one OR filter
+DEFAULT_BATCH_SIZE = 50
+MAX_BATCH_SIZE = 100
+
+GetFn = Callable[..., Dict[str, Any]]
+
+
+def chunked(items: Sequence[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
+
+
+class WorkEnricher:
+    """
+    Resolve work IDs to raw OpenAlex work records, batch_size IDs per request.
+    `get` is any callable with the signature of OpenAlexClient._get: get(path, params) -> dict.
+    """
+    def __init__(self, get: GetFn, batch_size: int = DEFAULT_BATCH_SIZE, select: Optional[Sequence[str]] = None, pause: float = 0.0):
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}, got {batch_size}")
+        self.get = get
+        self.batch_size = batch_size
+        self.select = list(select) if select else None
+        self.pause = pause
+        self.requests_made = 0
+
+    def resolve(self, ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return {requested id: raw work record} for the distinct IDs in `ids`.
+        IDs may be full URLs or short keys; IDs OpenAlex does not return are left out.
+        """
+        wanted: Dict[str, str] = {}
+        for i in ids:
+            wanted.setdefault(short_id(i), i)
+        found: Dict[str, Dict[str, Any]] = {}
+        for batch in chunked(list(wanted), self.batch_size):
+            params: Dict[str, Any] = {"filter": "openalex_id:" + "|".join(batch), "per-page": len(batch)}
+            if self.select:
+                params["select"] = ",".join(self.select)
+            data = self.get("/works", params)
+            self.requests_made += 1
+            for record in data.get("results", []):
+                key = short_id(record.get("id", ""))
+                if key in wanted:
+                    found[wanted[key]] = record
+            if self.pause:
+                time.sleep(self.pause)
+        return found
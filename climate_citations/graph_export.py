@@ -0,0 +1,364 @@
+"""
+Streaming graph exporters that read the node NDJSON and edge files written by
+NetworkFileTalker (or an edge_store.BinaryEdgeSink directory) and write GEXF, GraphML,
+node-link JSON or a compact binary format incrementally, without building a DiGraph.
+
+Memory stays bounded whatever the graph size: records are streamed in chunks, and the
+set of node IDs already written (needed to declare cited-only nodes once) is kept in a
+temporary SqliteIdIndex on disk. Output can be gzip or zstd compressed (zstd requires
+the optional zstandard package).
+
+Node attributes are those of TopicCitationNetworkBuilder (title, year, doi); missing
+values are omitted. Edges are written as they appear in the edge file, so duplicate
+rows (see dedup_index.DedupNetworkFileTalker) are not collapsed as in a DiGraph.
+"""
+import csv
+import gzip
+import io
+import os
+import re
+import struct
+import sys
+import tempfile
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from . import codec
+from .dedup_index import SqliteIdIndex, _compact_key
+from .edge_store import EdgeStoreReader
+from .network_file_talker import EdgeColumns, NetworkFileTalker
+from .topic_citation_network import _node_attrs
+from .work_ids import work_key
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+EXPORT_FORMATS = ("gexf", "graphml", "json", "binary")
+COMPRESSIONS = ("gzip", "zstd")
+DEFAULT_CHUNK_SIZE = 10000
+
+# name, GEXF/GraphML type of the node attributes written by _node_attrs
+NODE_ATTRIBUTES = (("title", "string"), ("year", "long"), ("doi", "string"))
+
+_XML_SPECIAL = re.compile(r'[&<>"\n\r\t]')
+_XML_ATTR_ENTITIES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"})
+
+BINARY_MAGIC = b"CCGRAPH1"
+_CHUNK_HEADER = struct.Struct("<cI")
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise ImportError("zstd compression requires zstandard: pip install zstandard")
+
+
+@dataclass
+class ExportStats:
+    nodes: int = 0
+    cited_nodes: int = 0
+    edges: int = 0
+
+
+def _compression_for(path: str, compression: Optional[str]) -> Optional[str]:
+    if compression != "infer":
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        return compression
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return None
+
+
+def open_output(path: str, compression: Optional[str] = "infer") -> BinaryIO:
+    """
+    Open path for binary writing, compressed with gzip or zstd (inferred from a .gz / .zst suffix by default).
+    """
+    compression = _compression_for(path, compression)
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        _require_zstandard()
+        return zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+    return open(path, "wb", buffering=1 << 20)
+
+
+def open_input(path: str, compression: Optional[str] = "infer") -> BinaryIO:
+    compression = _compression_for(path, compression)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "zstd":
+        _require_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb", buffering=1 << 20)
+
+
+def quoteattr(value: str) -> str:
+    """
+    Double-quoted XML attribute value; like xml.sax.saxutils.quoteattr but cheap for the
+    common case of IDs with nothing to escape.
+    """
+    if _XML_SPECIAL.search(value) is None:
+        return f'"{value}"'
+    return f'"{value.translate(_XML_ATTR_ENTITIES)}"'
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_edge_file(edge_file: str) -> Iterator[Tuple[str, str]]:
+    """
+    (from_work, referenced_work) pairs of a reference edge CSV or a BinaryEdgeSink directory.
+    """
+    if os.path.isdir(edge_file):
+        with EdgeStoreReader(edge_file) as reader:
+            yield from reader.iter_edges()
+        return
+    with open(edge_file, "r", newline="", encoding="utf-8", buffering=1 << 20) as fh:
+        for row in csv.reader(fh):
+            if len(row) >= 2:
+                yield row[0], row[1]
+
+
+class _TextGraphWriter(ABC):
+    """
+    Produces the text of a graph format piece by piece: header, nodes, a separator
+    between the node and edge sections, edges and footer. Formats must implement
+    node and edge; the other pieces default to empty.
+    """
+    def header(self) -> str:
+        return ""
+
+    @abstractmethod
+    def node(self, node_id: str, attrs: Dict[str, Any]) -> str:
+        ...
+
+    def between(self) -> str:
+        return ""
+
+    @abstractmethod
+    def edge(self, source: str, target: str) -> str:
+        ...
+
+    def footer(self) -> str:
+        return ""
+
+
+class _GexfWriter(_TextGraphWriter):
+    def __init__(self) -> None:
+        self.edge_id = 0
+
+    def header(self) -> str:
+        attributes = "".join(f'      <attribute id="{i}" title="{name}" type="{kind}" />\n' for i, (name, kind) in enumerate(NODE_ATTRIBUTES))
+        return ("<?xml version='1.0' encoding='utf-8'?>\n"
+                '<gexf xmlns="http://www.gexf.net/1.2draft" version="1.2">\n'
+                '  <graph defaultedgetype="directed" mode="static" name="">\n'
+                '    <attributes mode="static" class="node">\n'
+                f"{attributes}"
+                "    </attributes>\n"
+                "    <nodes>\n")
+
+    def node(self, node_id: str, attrs: Dict[str, Any]) -> str:
+        qid = quoteattr(node_id)
+        values = "".join(f'          <attvalue for="{i}" value={quoteattr(str(attrs[name]))} />\n'
+                         for i, (name, _) in enumerate(NODE_ATTRIBUTES) if attrs.get(name) is not None)
+        if not values:
+            return f"      <node id={qid} label={qid} />\n"
+        return f"      <node id={qid} label={qid}>\n        <attvalues>\n{values}        </attvalues>\n      </node>\n"
+
+    def between(self) -> str:
+        return "    </nodes>\n    <edges>\n"
+
+    def edge(self, source: str, target: str) -> str:
+        self.edge_id += 1
+        return f'      <edge source={quoteattr(source)} target={quoteattr(target)} id="{self.edge_id - 1}" />\n'
+
+    def footer(self) -> str:
+        return "    </edges>\n  </graph>\n</gexf>\n"
+
+
+class _GraphMLWriter(_TextGraphWriter):
+    def header(self) -> str:
+        keys = "".join(f'  <key id="d{i}" for="node" attr.name="{name}" attr.type="{kind}" />\n' for i, (name, kind) in enumerate(NODE_ATTRIBUTES))
+        return ("<?xml version='1.0' encoding='utf-8'?>\n"
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                f"{keys}"
+                '  <graph edgedefault="directed">\n')
+
+    def node(self, node_id: str, attrs: Dict[str, Any]) -> str:
+        qid = quoteattr(node_id)
+        values = "".join(f'      <data key="d{i}">{escape(str(attrs[name]))}</data>\n'
+                         for i, (name, _) in enumerate(NODE_ATTRIBUTES) if attrs.get(name) is not None)
+        if not values:
+            return f"    <node id={qid} />\n"
+        return f"    <node id={qid}>\n{values}    </node>\n"
+
+    def edge(self, source: str, target: str) -> str:
+        return f"    <edge source={quoteattr(source)} target={quoteattr(target)} />\n"
+
+    def footer(self) -> str:
+        return "  </graph>\n</graphml>\n"
+
+
+class _NodeLinkJsonWriter(_TextGraphWriter):
+    """
+    Node-link JSON as written by networkx.node_link_data (edges under "edges"),
+    one node or edge object per line.
+    """
+    def __init__(self) -> None:
+        self.separator = "\n"
+
+    def header(self) -> str:
+        return '{"directed":true,"multigraph":false,"graph":{},"nodes":['
+
+    def node(self, node_id: str, attrs: Dict[str, Any]) -> str:
+        text = self.separator + codec.dumps({**{k: v for k, v in attrs.items() if v is not None}, "id": node_id})
+        self.separator = ",\n"
+        return text
+
+    def between(self) -> str:
+        self.separator = "\n"
+        return '\n],"edges":['
+
+    def edge(self, source: str, target: str) -> str:
+        text = self.separator + codec.dumps({"source": source, "target": target})
+        self.separator = ",\n"
+        return text
+
+    def footer(self) -> str:
+        return "\n]}\n"
+
+
+_TEXT_WRITERS = {"gexf": _GexfWriter, "graphml": _GraphMLWriter, "json": _NodeLinkJsonWriter}
+
+
+class _TextGraphOutput:
+    def __init__(self, raw: BinaryIO, writer: _TextGraphWriter):
+        self.out = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        self.writer = writer
+        self.out.write(writer.header())
+
+    def nodes(self, nodes: List[Tuple[str, Dict[str, Any]]]) -> None:
+        self.out.write("".join([self.writer.node(n, attrs) for n, attrs in nodes]))
+
+    def begin_edges(self) -> None:
+        self.out.write(self.writer.between())
+
+    def edges(self, edges: List[Tuple[str, str]]) -> None:
+        self.out.write("".join([self.writer.edge(s, t) for s, t in edges]))
+
+    def finish(self) -> None:
+        self.out.write(self.writer.footer())
+        self.out.flush()
+        # leave closing the underlying (possibly compressed) stream to the caller
+        self.out.detach()
+
+
+class _BinaryGraphWriter:
+    """
+    Compact binary graph: BINARY_MAGIC, then chunks of a 1-byte tag and a uint32 count,
+    followed by `count` int64 work keys (tag N) or `count` int64 (from, to) key pairs
+    (tag E), all little-endian. Work keys are the numbers of OpenAlex work IDs (W123 -> 123);
+    node attributes are not stored.
+    """
+    def __init__(self, out: BinaryIO):
+        self.out = out
+        out.write(BINARY_MAGIC)
+
+    def _write(self, tag: bytes, count: int, values: array) -> None:
+        if sys.byteorder == "big":
+            values.byteswap()
+        self.out.write(_CHUNK_HEADER.pack(tag, count))
+        self.out.write(values.tobytes())
+
+    def nodes(self, nodes: List[Tuple[str, Dict[str, Any]]]) -> None:
+        self._write(b"N", len(nodes), array("q", [work_key(n) for n, _ in nodes]))
+
+    def begin_edges(self) -> None:
+        pass
+
+    def edges(self, edges: List[Tuple[str, str]]) -> None:
+        self._write(b"E", len(edges), array("q", [work_key(w) for edge in edges for w in edge]))
+
+    def finish(self) -> None:
+        pass
+
+
+def read_binary_graph(path: str, compression: Optional[str] = "infer") -> Tuple[array, EdgeColumns]:
+    """
+    Load a graph written by export_graph(fmt="binary") as (node keys, EdgeColumns).
+    """
+    nodes, columns = array("q"), EdgeColumns()
+    with open_input(path, compression) as fh:
+        if fh.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a binary graph export")
+        while True:
+            header = fh.read(_CHUNK_HEADER.size)
+            if not header:
+                break
+            tag, count = _CHUNK_HEADER.unpack(header)
+            values = array("q")
+            values.frombytes(fh.read(8 * count * (2 if tag == b"E" else 1)))
+            if sys.byteorder == "big":
+                values.byteswap()
+            if tag == b"N":
+                nodes.extend(values)
+            else:
+                columns.sources.extend(values[0::2])
+                columns.targets.extend(values[1::2])
+    return nodes, columns
+
+
+def export_graph(node_file: str, edge_file: str, path: str, fmt: str = "gexf", compression: Optional[str] = "infer", include_cited_nodes: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE) -> ExportStats:
+    """
+    Stream the graph stored in node_file (NDJSON work records) and edge_file (reference edge
+    CSV or BinaryEdgeSink directory) to path in fmt: gexf, graphml, json or binary.
+    Each node is written once, at its first record. With include_cited_nodes, works that
+    only appear in edges are declared as attribute-less nodes (one extra pass over the
+    edges), as TopicCitationNetworkBuilder's graphs contain them too.
+    """
+    fmt = fmt.lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    stats = ExportStats()
+    talker = NetworkFileTalker(json_out_file=None, reference_edge_file=None)
+    with tempfile.TemporaryDirectory() as tmp, open_output(path, compression) as raw:
+        written = SqliteIdIndex(os.path.join(tmp, "written_nodes.sqlite"))
+        try:
+            output = _BinaryGraphWriter(raw) if fmt == "binary" else _TextGraphOutput(raw, _TEXT_WRITERS[fmt]())
+            for records in _chunks(talker.iter_records(node_file), chunk_size):
+                records = [r for r in records if isinstance(r, dict) and r.get("id")]
+                fresh = written.add_new(_compact_key(r["id"]) for r in records)
+                nodes = [(r["id"], _node_attrs(r)) for r, is_new in zip(records, fresh) if is_new]
+                output.nodes(nodes)
+                stats.nodes += len(nodes)
+
+            if include_cited_nodes:
+                for edges in _chunks(iter_edge_file(edge_file), chunk_size):
+                    ends = [w for edge in edges for w in edge]
+                    fresh = written.add_new(_compact_key(w) for w in ends)
+                    nodes = [(w, {}) for w, is_new in zip(ends, fresh) if is_new]
+                    output.nodes(nodes)
+                    stats.cited_nodes += len(nodes)
+
+            output.begin_edges()
+            for edges in _chunks(iter_edge_file(edge_file), chunk_size):
+                output.edges(edges)
+                stats.edges += len(edges)
+            output.finish()
+        finally:
+            written.close()
+    return stats
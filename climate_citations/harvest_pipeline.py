@@ -0,0 +1,218 @@
+"""
+Pipelined topic harvest: network fetch, parsing and disk writes run in separate
+threads connected by bounded queues, so the next page is requested while earlier
+ones are still being parsed and written.
+
+    fetcher thread(s) --pages--> parser thread --works--> writer thread --> talker
+
+Each fetcher cursor-pages one topic at a time (cursor paging is sequential within a
+topic, so extra fetchers only help with several topics). The single writer groups
+works into batches of batch_size for talker.write_work_nodes_edges and fsyncs the
+talker's files every fsync_interval seconds and at the end.
+
+Shutdown always runs in stage order: fetchers stop, the parser and writer drain what
+was already fetched, the last batch is written and synced. A Ctrl-C stops fetching
+and then drains the same way (a second Ctrl-C abandons the queued work).
+"""
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+from .instrumentation import METRICS
+from .openalex import CompactWork, OpenAlexClient
+from .work_ids import short_id
+
+# end-of-stream marker passed down the queues
+_DONE = object()
+
+
+@dataclass
+class PipelineStats:
+    pages: int = 0
+    records: int = 0
+    works_written: int = 0
+    batches: int = 0
+    fsyncs: int = 0
+    interrupted: bool = False
+
+
+class HarvestPipeline:
+    """
+    Harvest topics through client, writing with client.talker.
+
+    queue_depth bounds the pages (and parsed pages) waiting between stages, which
+    bounds memory to about 2 * queue_depth pages. batch_size is the number of works
+    per talker write; fsync_interval (seconds, None to never sync) limits how much
+    written data a crash can lose.
+    """
+    def __init__(self, client: OpenAlexClient, fetchers: int = 1, queue_depth: int = 8, batch_size: int = 5000, fsync_interval: Optional[float] = 5.0, per_page: int = 200, select: Optional[Sequence[str]] = None, compact: bool = False):
+        if fetchers < 1 or queue_depth < 1 or batch_size < 1:
+            raise ValueError("fetchers, queue_depth and batch_size must be at least 1")
+        self.client = client
+        self.fetchers = fetchers
+        self.queue_depth = queue_depth
+        self.batch_size = batch_size
+        self.fsync_interval = fsync_interval
+        self.per_page = per_page
+        self.select = select
+        self.compact = compact
+        self.stats = PipelineStats()
+        self._stop = threading.Event()
+        self._abort = threading.Event()
+        # set when the writer, the last stage, exits
+        self._finished = threading.Event()
+        self._errors: List[BaseException] = []
+
+    def _put(self, q: "queue.Queue", item: Any) -> bool:
+        """
+        Blocking put that gives up (returning False) once the pipeline is aborted.
+        """
+        while not self._abort.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: "queue.Queue") -> Any:
+        while not self._abort.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, exc: BaseException) -> None:
+        self._errors.append(exc)
+        self._abort.set()
+
+    def _fetch(self, topics: "queue.Queue", pages: "queue.Queue", max_items: Optional[int], filter_q: Optional[str]) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    topic = topics.get_nowait()
+                except queue.Empty:
+                    break
+                fetched = 0
+                for items, _ in self.client.iter_topic_pages(topic, per_page=self.per_page, filter_q=filter_q, select=self.select):
+                    if max_items:
+                        items = items[:max_items - fetched]
+                    fetched += len(items)
+                    if items and not self._put(pages, items):
+                        return
+                    if self._stop.is_set() or (max_items and fetched >= max_items):
+                        break
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            self._put(pages, _DONE)
+
+    def _parse(self, pages: "queue.Queue", works: "queue.Queue") -> None:
+        build = CompactWork.from_record if self.compact else self.client.build_work
+        running = self.fetchers
+        try:
+            while running:
+                items = self._get(pages)
+                if items is _DONE:
+                    running -= 1
+                    continue
+                start = time.perf_counter()
+                page = [build(i) for i in items]
+                if METRICS.enabled:
+                    METRICS.observe("build_work.page", time.perf_counter() - start)
+                    METRICS.incr("records", len(page))
+                self.stats.pages += 1
+                self.stats.records += len(page)
+                if not self._put(works, page):
+                    return
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            self._put(works, _DONE)
+
+    def _write(self, works: "queue.Queue") -> None:
+        batch: List[Any] = []
+        last_sync = time.monotonic()
+        try:
+            while True:
+                page = self._get(works)
+                if page is _DONE:
+                    break
+                batch.extend(page)
+                if len(batch) >= self.batch_size:
+                    self._flush(batch)
+                    batch = []
+                    if self.fsync_interval is not None and time.monotonic() - last_sync >= self.fsync_interval:
+                        self._fsync()
+                        last_sync = time.monotonic()
+            if self._abort.is_set():
+                return
+            self._flush(batch)
+            if self.fsync_interval is not None:
+                self._fsync()
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            self._finished.set()
+
+    def _flush(self, batch: List[Any]) -> None:
+        if batch:
+            self.client.talker.write_work_nodes_edges(batch)
+            self.stats.works_written += len(batch)
+            self.stats.batches += 1
+
+    def _fsync(self) -> None:
+        talker = self.client.talker
+        for path in (talker.json_out_file, talker.reference_edge_file):
+            if path and os.path.isfile(path):
+                with open(path, "rb") as fh:
+                    os.fsync(fh.fileno())
+        self.stats.fsyncs += 1
+
+    def run(self, topic_ids: Sequence[str], max_items_per_topic: Optional[int] = None, filter_q: Optional[str] = None) -> PipelineStats:
+        """
+        Harvest topic_ids and return the stats of this run. Re-raises KeyboardInterrupt
+        (after the orderly drain) and the first exception raised by a stage.
+        """
+        self.stats = PipelineStats()
+        self._stop.clear()
+        self._abort.clear()
+        self._finished.clear()
+        self._errors = []
+        topics: "queue.Queue" = queue.Queue()
+        for t in dict.fromkeys(short_id(t) for t in topic_ids):
+            topics.put(t)
+        pages: "queue.Queue" = queue.Queue(maxsize=self.queue_depth)
+        works: "queue.Queue" = queue.Queue(maxsize=self.queue_depth)
+        threads = [threading.Thread(target=self._fetch, args=(topics, pages, max_items_per_topic, filter_q), name=f"harvest-fetch-{n}", daemon=True) for n in range(self.fetchers)]
+        threads.append(threading.Thread(target=self._parse, args=(pages, works), name="harvest-parse", daemon=True))
+        threads.append(threading.Thread(target=self._write, args=(works,), name="harvest-write", daemon=True))
+        for t in threads:
+            t.start()
+
+        # wait on an Event rather than Thread.join, which a Ctrl-C can leave inconsistent
+        interrupted = False
+        while not self._finished.is_set():
+            try:
+                self._finished.wait(0.2)
+            except KeyboardInterrupt:
+                if interrupted:
+                    self._abort.set()
+                else:
+                    interrupted = True
+                    self.stats.interrupted = True
+                    self._stop.set()
+                    print("Interrupted: stopping fetchers and writing what was already fetched (Ctrl-C again to abandon it)")
+        for t in threads:
+            t.join()
+        print(f"Pipelined harvest: {self.stats}")
+        print(f"HTTP: {self.client.transport_stats}")
+        if interrupted:
+            raise KeyboardInterrupt
+        if self._errors:
+            raise self._errors[0]
+        return self.stats
@@ -0,0 +1,147 @@
+"""
+Persistent on-disk cache of OpenAlex JSON responses, stored in a SQLite file.
+Entries are keyed by the normalized URL and query parameters (mailto excluded),
+expire after a TTL, and the least recently used entries are evicted once the
+cached bodies exceed max_bytes.
+"""
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from . import codec
+
+# query parameters that identify the caller rather than the request
+IGNORED_PARAMS = {"mailto"}
+# cache hits whose access times are buffered before they are written in one transaction
+ACCESS_FLUSH_SIZE = 1000
+
+
+class CacheMissError(LookupError):
+    """
+    Raised in offline mode when a request is not in the cache.
+    """
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    stores: int = 0
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache, safe to share between threads.
+    ttl is in seconds (None: never expire); max_bytes bounds the total size of stored
+    bodies in bytes (UTF-8), tracked as a running total of this instance's writes.
+    Cache hits do not write: their access times (for LRU eviction) are buffered and
+    written with the next put, every ACCESS_FLUSH_SIZE hits, and on close.
+    """
+    def __init__(self, path: str = "openalex_cache.sqlite", ttl: Optional[float] = 7 * 24 * 3600, max_bytes: Optional[int] = 512 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, body TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._accessed: Dict[str, float] = {}
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Normalize url + params into a cache key: lower-case scheme and host, no trailing
+        slash, query parameters from both the URL and params merged and sorted, mailto dropped.
+        """
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query) if k not in IGNORED_PARAMS]
+        query += [(k, str(v)) for k, v in (params or {}).items() if k not in IGNORED_PARAMS]
+        path = parts.path.rstrip("/") or "/"
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ""))
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached JSON for the request, or None (and count a miss) if absent or expired.
+        """
+        key = self.make_key(url, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, created, size FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= row[2]
+                self._accessed.pop(key, None)
+                row = None
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+                self._flush_accessed()
+                self._conn.commit()
+            self.stats.hits += 1
+        return codec.loads(row[0])
+
+    def put(self, url: str, params: Optional[Dict[str, Any]], data: Dict[str, Any]) -> None:
+        """
+        Store the JSON response for the request, then evict LRU entries over max_bytes.
+        Also usable to seed the cache, e.g. from test fixtures.
+        """
+        key = self.make_key(url, params)
+        body = codec.dumps(data)
+        size = len(body.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, body, size, now, now),
+            )
+            self._accessed.pop(key, None)
+            self._total_bytes += size - (old[0] if old else 0)
+            self.stats.stores += 1
+            self._flush_accessed()
+            self._evict()
+            self._conn.commit()
+
+    def _flush_accessed(self) -> None:
+        # caller holds self._lock and commits
+        if self._accessed:
+            self._conn.executemany("UPDATE responses SET accessed = ? WHERE key = ?", ((t, k) for k, t in self._accessed.items()))
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        if self.max_bytes is None or self._total_bytes <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if self._total_bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.stats.evictions += len(victims)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
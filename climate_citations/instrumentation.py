@@ -0,0 +1,289 @@
+"""
+Opt-in instrumentation of a harvest: per-stage timing histograms and counters recorded
+by OpenAlexTopicClient._get, OpenAlexClient.build_works_and_network_for_page and the
+NetworkFileTalker write methods, exportable as a JSON summary or a Prometheus text file.
+
+Recording is off by default; call sites only test METRICS.enabled, so the disabled
+cost is one attribute lookup per request, page or write.
+
+    from climate_citations import instrumentation
+    instrumentation.enable()
+    ...harvest...
+    instrumentation.METRICS.write_json("harvest_metrics.json")
+
+Also provides profile_run (cProfile) and SamplingProfiler (stack sampling) for one run.
+"""
+import bisect
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# upper bounds in seconds of the histogram buckets (the last bucket is +Inf)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROMETHEUS_PREFIX = "climate_citations"
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Upper bound of the bucket holding the q-quantile (max for the +Inf bucket).
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 6),
+        }
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters and timing histograms, named by stage
+    (e.g. "http.request", "talker.write_list").
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters: Dict[str, float] = {}
+            self.histograms: Dict[str, Histogram] = {}
+            self.started = time.time()
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Counters, per-stage timings and per-second rates of the counters since the last reset.
+        """
+        with self._lock:
+            elapsed = time.time() - self.started
+            return {
+                "started": self.started,
+                "elapsed_seconds": round(elapsed, 3),
+                "counters": dict(self.counters),
+                "rates_per_second": {name: round(v / elapsed, 3) for name, v in self.counters.items()} if elapsed > 0 else {},
+                "timings": {name: h.to_dict() for name, h in self.histograms.items()},
+            }
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.summary(), fh, indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus text exposition format: counters as <name>_total, timings as
+        <name>_seconds histograms.
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = _metric_name(name) + "_total"
+                lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+            for name, hist in sorted(self.histograms.items()):
+                metric = _metric_name(name) + "_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, n in zip(hist.buckets, hist.counts):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {hist.count}')
+                lines += [f"{metric}_sum {hist.sum}", f"{metric}_count {hist.count}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Atomically replace path with the current metrics (for a node_exporter textfile collector).
+        """
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+
+def _metric_name(name: str) -> str:
+    return f"{PROMETHEUS_PREFIX}_" + "".join(c if c.isalnum() else "_" for c in name)
+
+
+# process-wide registry used by the instrumented call sites
+METRICS = Metrics()
+
+
+def enable(reset: bool = True) -> Metrics:
+    if reset:
+        METRICS.reset()
+    METRICS.enabled = True
+    return METRICS
+
+
+def disable() -> None:
+    METRICS.enabled = False
+
+
+def timed(stage: str) -> Callable:
+    """
+    Decorator recording each call's duration in METRICS under `stage`, when enabled.
+    """
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not METRICS.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                METRICS.observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+class PeriodicExporter:
+    """
+    Background thread writing METRICS (or `metrics`) to a Prometheus text file every
+    `interval` seconds, and once more on stop(). Usable as a context manager.
+    """
+    def __init__(self, path: str, interval: float = 15.0, metrics: Optional[Metrics] = None):
+        self.path = path
+        self.interval = interval
+        self.metrics = metrics or METRICS
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.metrics.write_prometheus(self.path)
+
+    def start(self) -> "PeriodicExporter":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.metrics.write_prometheus(self.path)
+
+    def __enter__(self) -> "PeriodicExporter":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def profile_run(fn: Callable, *args: Any, output: Optional[str] = None, sort: str = "cumulative", limit: int = 30, **kwargs: Any) -> Any:
+    """
+    Run fn(*args, **kwargs) under cProfile. The stats are dumped to `output` (for
+    snakeviz / pstats) if given, and the top `limit` entries printed. Returns fn's result.
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args, **kwargs)
+    finally:
+        if output:
+            profiler.dump_stats(output)
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats(sort).print_stats(limit)
+        print(text.getvalue())
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler: a background thread samples the stack of the
+    thread that started it every `interval` seconds. write_collapsed() produces the
+    "frame;frame;frame count" format read by flamegraph.pl and speedscope.
+    """
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._target = threading.get_ident()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in self.samples.most_common():
+                fh.write(f"{stack} {count}\n")
@@ -0,0 +1,109 @@
+"""
+Byte offsets of the records in a talker's node and edge files, kept in SQLite so that
+NetworkFileTalker.upsert_work_nodes_edges can find the old node line and edge rows of
+a work without reading the files.
+
+Each file is indexed as spans: runs of consecutive lines with the same key (the work
+ID of a node line, the from_work of an edge row). Lines appended since the last sync
+are indexed incrementally; a file that was replaced (new inode) is indexed again.
+"""
+import os
+import sqlite3
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+
+QUERY_CHUNK_SIZE = 500
+INSERT_BATCH_SIZE = 10000
+
+
+class LineIndex:
+    """
+    Spans of keyed lines for several files ("roles", e.g. "nodes" and "edges") in one SQLite file.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS files (role TEXT PRIMARY KEY, path TEXT, inode INTEGER, indexed INTEGER)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS spans (role TEXT, key TEXT, offset INTEGER, length INTEGER, lines INTEGER, PRIMARY KEY (role, key, offset)) WITHOUT ROWID")
+        self._conn.commit()
+
+    def _restart_at(self, role: str, path: str, inode: int, size: int) -> int:
+        """
+        Where indexing of path must continue, dropping spans that no longer match it.
+        Caller holds self._lock.
+        """
+        row = self._conn.execute("SELECT path, inode, indexed FROM files WHERE role = ?", (role,)).fetchone()
+        if row is None or row[0] != path or row[1] != inode:
+            self._conn.execute("DELETE FROM spans WHERE role = ?", (role,))
+            return 0
+        if size >= row[2]:
+            return row[2]
+        # the file was truncated: forget the cut spans and index again after the last intact one
+        self._conn.execute("DELETE FROM spans WHERE role = ? AND offset + length > ?", (role, size))
+        end = self._conn.execute("SELECT MAX(offset + length) FROM spans WHERE role = ?", (role,)).fetchone()[0]
+        return end or 0
+
+    def sync(self, role: str, path: str, line_key: Callable[[str], Optional[str]]) -> None:
+        """
+        Index the complete lines of path that are not indexed yet. A partial last line
+        is left for a later sync.
+        """
+        with self._lock:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                self._conn.execute("DELETE FROM spans WHERE role = ?", (role,))
+                self._conn.execute("DELETE FROM files WHERE role = ?", (role,))
+                self._conn.commit()
+                return
+            offset = self._restart_at(role, path, st.st_ino, st.st_size)
+            batch: List[Tuple[str, str, int, int, int]] = []
+            span_key, span_start, span_lines = None, offset, 0
+            with open(path, "rb") as fh:
+                fh.seek(offset)
+                for line in fh:
+                    if not line.endswith(b"\n"):
+                        break
+                    key = None if line.isspace() else line_key(line.decode("utf-8", errors="replace"))
+                    if key != span_key or key is None:
+                        if span_key is not None:
+                            batch.append((role, span_key, span_start, offset - span_start, span_lines))
+                        span_key, span_start, span_lines = key, offset, 0
+                    span_lines += 1
+                    offset += len(line)
+                    if len(batch) >= INSERT_BATCH_SIZE:
+                        self._conn.executemany("INSERT OR REPLACE INTO spans VALUES (?, ?, ?, ?, ?)", batch)
+                        batch = []
+            if span_key is not None:
+                batch.append((role, span_key, span_start, offset - span_start, span_lines))
+            self._conn.executemany("INSERT OR REPLACE INTO spans VALUES (?, ?, ?, ?, ?)", batch)
+            self._conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (role, path, st.st_ino, offset))
+            self._conn.commit()
+
+    def find(self, role: str, keys: Iterable[str]) -> List[Tuple[str, int, int, int]]:
+        """
+        (key, offset, length, lines) of every span with one of the given keys, in file order.
+        """
+        keys = list(dict.fromkeys(keys))
+        found: List[Tuple[str, int, int, int]] = []
+        with self._lock:
+            for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+                chunk = keys[start:start + QUERY_CHUNK_SIZE]
+                marks = ",".join("?" * len(chunk))
+                found.extend(self._conn.execute(f"SELECT key, offset, length, lines FROM spans WHERE role = ? AND key IN ({marks})", [role] + chunk))
+        return sorted(found, key=lambda row: row[1])
+
+    def remove(self, role: str, keys: Iterable[str], before: int) -> None:
+        """
+        Forget the spans of the given keys that start before offset `before`.
+        """
+        with self._lock:
+            self._conn.executemany("DELETE FROM spans WHERE role = ? AND key = ? AND offset < ?", ((role, k, before) for k in dict.fromkeys(keys)))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,23 @@
-from dataclasses import dataclass
+from array import array
+from collections import deque
+from functools import partial
+from itertools import chain, repeat
+from dataclasses import dataclass, field
 import json
+import os
+import re
 import csv
-from dataclasses import is_dataclass, asdict
-from typing import List, Any, Optional
+import shutil
+import logging
+from dataclasses import is_dataclass, fields
+from typing import List, Any, Callable, Dict, Iterable, Optional, Tuple, Iterator, Deque, TextIO
 from json import JSONDecoder, JSONDecodeError
 
+from . import codec
+from .instrumentation import timed
+from .line_index import LineIndex
+from .work_ids import work_id_from_key, work_key
+
 # New dataclass for an edge (from_work -> referenced_work)
 @dataclass
 class ReferenceEdge:
@@ -14,111 +27,477 @@ class ReferenceEdge:
 # Note: build_reference_edges and write_reference_edge(s) moved to network_file_talker.py
 
 
+@dataclass
+class EdgeColumns:
+    """
+    Columnar edge list: parallel int64 arrays of citing and cited work keys (W123 -> 123),
+    16 bytes per edge instead of one ReferenceEdge object with two URL strings.
+    Iterating yields (from_work, referenced_work) full-URL pairs.
+    """
+    sources: array = field(default_factory=lambda: array("q"))
+    targets: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for s, t in zip(self.sources, self.targets):
+            yield work_id_from_key(s), work_id_from_key(t)
+
+    def add_work(self, source_key: int, target_keys: Iterable[int]) -> None:
+        before = len(self.targets)
+        self.targets.extend(target_keys)
+        self.sources.extend(repeat(source_key, len(self.targets) - before))
+
+    def to_numpy(self) -> Tuple[Any, Any]:
+        """
+        Zero-copy NumPy int64 views of (sources, targets); requires numpy.
+        """
+        import numpy as np
+        return np.frombuffer(self.sources, dtype=np.int64), np.frombuffer(self.targets, dtype=np.int64)
+
+logger = logging.getLogger(__name__)
+
+WRITE_BUFFER_SIZE = 1 << 20
+_NEEDS_QUOTING = re.compile(r'[",\r\n]')
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+# records written by write_list start with their id field (files written before the
+# codec module have a space after the colon)
+_NODE_ID_RE = re.compile(r'\{"id": ?"([^"\\]*)"')
+
+
+@dataclass
+class UpsertStats:
+    inserted: int = 0
+    replaced: int = 0
+    edges_removed: int = 0
+    edges_written: int = 0
+
+
+def _record_payload(obj: Any) -> Any:
+    """
+    JSON-ready view of a record. Dataclass fields are read directly into a shallow
+    dict (asdict would deep-copy every references list).
+    """
+    if isinstance(obj, dict):
+        return obj
+    names = _FIELD_NAMES.get(type(obj))
+    if names is None:
+        # slotted record classes (e.g. openalex.CompactWork) list the fields to write
+        names = getattr(type(obj), "RECORD_FIELDS", None)
+        if names is not None:
+            _FIELD_NAMES[type(obj)] = names
+            return {name: getattr(obj, name) for name in names}
+        if not is_dataclass(obj):
+            # fallback: try object's __dict__, otherwise stringify
+            try:
+                return obj.__dict__
+            except AttributeError:
+                return str(obj)
+        names = _FIELD_NAMES[type(obj)] = tuple(f.name for f in fields(obj))
+    return {name: getattr(obj, name) for name in names}
+
+
+def _plain_csv(rows: List[Tuple[str, str]]) -> Optional[str]:
+    """
+    Format rows exactly as csv.writer would when no field needs quoting (the case for
+    OpenAlex IDs), which is several times faster. Returns None if csv.writer is needed.
+    """
+    try:
+        if _NEEDS_QUOTING.search("\x1f".join(chain.from_iterable(rows))):
+            return None
+    except TypeError:  # non-string fields
+        return None
+    return "".join([f"{a},{b}\r\n" for a, b in rows])
+
+
+def _node_line_id(line: str) -> Optional[str]:
+    """
+    Work ID of an NDJSON node line, read from the leading "id" field when possible.
+    """
+    m = _NODE_ID_RE.match(line)
+    if m:
+        return m.group(1)
+    try:
+        record = codec.loads(line)
+    except codec.DECODE_ERRORS:
+        return None
+    return record.get("id") if isinstance(record, dict) else None
+
+
+def _edge_line_source(line: str) -> Optional[str]:
+    """
+    from_work field of a reference edge CSV line.
+    """
+    if line.startswith('"'):
+        row = next(csv.reader([line]), None)
+        return row[0] if row else None
+    return line.split(",", 1)[0]
+
+
+def _edge_rows(works: Iterable[Any]) -> Iterator[Tuple[str, str]]:
+    """
+    (from_work, referenced_work) pairs for Work-like objects with 'references' or 'referenced_works'.
+    """
+    for w in works:
+        refs = getattr(w, "references", None)
+        if refs is None:
+            refs = getattr(w, "referenced_works", None)
+        if refs:
+            wid = w.id
+            for r in refs:
+                yield wid, r
+
+READ_BUFFER_SIZE = 1 << 20
+READ_CHUNK_SIZE = 1 << 16
+# a multi-line record larger than this is treated as malformed
+MAX_RECORD_CHARS = 64 * 1024 * 1024
+
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+_STRUCTURE_RE = re.compile(r'["{}\[\]]')
+
+
+# upsert_work_nodes_edges blanks superseded lines by overwriting all but their newlines
+_BLANK_LINE_BYTES = bytes(b if b == 0x0A else 0x20 for b in range(256))
+_LINE_KEYS: Dict[str, Callable[[str], Optional[str]]] = {"nodes": _node_line_id, "edges": _edge_line_source}
+
+
+def _upsert_journal_path(node_file: str) -> str:
+    return f"{node_file}.upsert.journal"
+
+
+def _line_index_path(node_file: str) -> str:
+    return f"{node_file}.lines.sqlite"
+
+
+def _fsync_file(path: str) -> None:
+    with open(path, "rb") as fh:
+        os.fsync(fh.fileno())
+
+
+def _write_journal(path: str, journal: Dict[str, Any]) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(journal, fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def _apply_upsert(journal: Dict[str, Any]) -> None:
+    """
+    Apply a journaled upsert; safe to repeat after a crash part-way. The staged records are
+    appended to both files before any old line is blanked, so an interrupted upsert can
+    leave duplicates but never loses a work.
+    """
+    for f in journal["files"]:
+        with open(f["path"], "ab"):
+            pass
+        with open(f["path"], "r+b") as out, open(f["staged"], "rb") as staged:
+            # drop whatever an interrupted attempt appended, then append again
+            if os.fstat(out.fileno()).st_size > f["size"]:
+                out.truncate(f["size"])
+            out.seek(0, os.SEEK_END)
+            shutil.copyfileobj(staged, out, WRITE_BUFFER_SIZE)
+            out.flush()
+            os.fsync(out.fileno())
+    for f in journal["files"]:
+        with open(f["path"], "r+b") as out:
+            for offset, length in f["spans"]:
+                out.seek(offset)
+                blank = out.read(length).translate(_BLANK_LINE_BYTES)
+                out.seek(offset)
+                out.write(blank)
+            out.flush()
+            os.fsync(out.fileno())
+    index = LineIndex(journal["index"])
+    try:
+        for f in journal["files"]:
+            index.remove(f["role"], f["keys"], before=f["size"])
+            index.sync(f["role"], f["path"], _LINE_KEYS[f["role"]])
+    finally:
+        index.close()
+
+
+@dataclass
+class ReadStats:
+    records: int = 0
+    skipped_lines: int = 0
+
+
+def _decodes(decode: Callable[[str], Any], line: str) -> bool:
+    try:
+        decode(line)
+    except codec.DECODE_ERRORS + (TypeError,):
+        return False
+    return True
+
+
+def _bracket_depth(line: str) -> int:
+    """
+    Net count of opening minus closing brackets in a line, ignoring those inside strings.
+    """
+    if '"' in line:
+        line = _STRING_RE.sub("", line)
+    return line.count("{") + line.count("[") - line.count("}") - line.count("]")
+
+
+class _JsonStream:
+    """
+    Buffered character stream over a text file for incremental JSON scanning.
+    """
+    def __init__(self, fh: TextIO):
+        self.fh = fh
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = JSONDecoder()
+
+    def fill(self) -> bool:
+        chunk = self.fh.read(READ_CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while self.pos >= len(self.buf):
+            if not self.fill():
+                return ""
+        return self.buf[self.pos]
+
+    def skip_ws(self) -> None:
+        while self.peek().isspace():
+            self.pos += 1
+
+    def decode_value(self) -> Any:
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+    def find_top_level_key(self, key: str) -> bool:
+        """
+        Advance to just after `"key":` in the top-level object. Returns False if the
+        document is not an object or has no such key.
+        """
+        self.skip_ws()
+        if self.peek() != "{":
+            return False
+        self.pos += 1
+        depth = 1
+        while True:
+            m = _STRUCTURE_RE.search(self.buf, self.pos)
+            if m is None:
+                self.pos = len(self.buf)
+                if not self.fill():
+                    return False
+                continue
+            self.pos = m.start()
+            c = m.group()
+            if c == '"':
+                s = _STRING_RE.match(self.buf, self.pos)
+                if s is None:
+                    if not self.fill():
+                        return False
+                    continue
+                self.pos = s.end()
+                if depth == 1:
+                    self.skip_ws()
+                    if self.peek() == ":" and json.loads(s.group()) == key:
+                        self.pos += 1
+                        return True
+                continue
+            depth += 1 if c in "{[" else -1
+            if depth == 0:
+                return False
+            self.pos += 1
+
+
 class NetworkFileTalker:
     """
         Simple file writer / reader for newline-delimited or concatenated JSON records.
+        Page-level progress is logged to the "climate_citations.network_file_talker"
+        logger at `log_level` (DEBUG by default); nothing is logged per record.
     """
-    def __init__(self, json_out_file: Optional[str] = "json_out_file.txt", reference_edge_file: Optional[str] = "reference_edges.csv"):
+    def __init__(self, json_out_file: Optional[str] = "json_out_file.txt", reference_edge_file: Optional[str] = "reference_edges.csv", edge_sink: Optional[Any] = None, log_level: int = logging.DEBUG):
+        """
+        edge_sink: optional alternative destination for the edges written by
+        write_work_nodes_edges, e.g. edge_store.BinaryEdgeSink; it must provide
+        write_work_edges(works). When set, reference_edge_file is not written.
+        """
         self.json_out_file = json_out_file
         self.reference_edge_file = reference_edge_file    
-        print(f"NetworkFileTalker initialized with json_out_file={self.json_out_file}, reference_edge_file={self.reference_edge_file}") 
+        self.edge_sink = edge_sink
+        self.log_level = log_level
+        logger.log(log_level, "NetworkFileTalker initialized", extra={"json_out_file": json_out_file, "reference_edge_file": reference_edge_file})
 
+    def encode_lines(self, object_list: List[Any]) -> str:
+        """
+        Serialize objects as NDJSON text, one object per line (with trailing newline),
+        using codec.dumps.
+        """
+        if not object_list:
+            return ""
+        dumps = codec.dumps
+        return "\n".join([dumps(_record_payload(obj)) for obj in object_list]) + "\n"
+
+    @timed("talker.write_list")
     def write_list(self, object_list: List[Any], filename: Optional[str] = None) -> None:
         """
         Write each object in object_list as one JSON object per line to filename.
         If filename is None, use self.json_out_file. Append if file exists.
+        The whole list is written with a single buffered write.
         """
         target = filename or self.json_out_file
-        print(f"write_list is Writing {len(object_list)} records to {target}")
-        with open(target, "a", encoding="utf-8") as fh:
-            for obj in object_list:
-                # convert dataclass instances to plain dicts
-                if is_dataclass(obj):
-                    payload = asdict(obj)
-                # already serializable dict
-                elif isinstance(obj, dict):
-                    payload = obj
-                else:
-                    # fallback: try object's __dict__, otherwise stringify
-                    try:
-                        payload = obj.__dict__
-                    except Exception:
-                        payload = str(obj)
-                fh.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        logger.log(self.log_level, "write_list: %d records to %s", len(object_list), target, extra={"records": len(object_list), "target": target})
+        with open(target, "a", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as fh:
+            fh.write(self.encode_lines(object_list))
 
-    def read_file(self, filename: str, key: Optional[str] = None) -> List[Any]:
+    def iter_records(self, filename: str, key: Optional[str] = None, as_type: Optional[type] = None) -> Iterator[Any]:
         """
-        Read a file that contains one or more JSON objects. If `key` is provided,
-        attempt to parse the whole file as JSON and return the value at top-level
-        `key` (if present). Otherwise, fall back to streaming/concatenated JSON parsing.
-
-        Returns a list of parsed objects (or empty list on missing file / no valid JSON).
+        Lazily yield the JSON objects in a file, using memory proportional to one record.
+        - Without `key`, the file is read line by line as NDJSON; objects that span several
+          lines or share a line are also handled. A record that fails to parse is skipped
+          up to the next newline, as read_file always did.
+        - With `key`, the top-level value under `key` (e.g. "results") is parsed incrementally
+          and, if it is an array, its elements are yielded one at a time. If the key is not
+          present the file is read as NDJSON instead.
+        - With `as_type` (a dataclass such as openalex.Work), records are decoded into
+          instances of it; with the msgspec backend, NDJSON lines are decoded straight
+          into the dataclass without building dicts. Records that lack a required field
+          of it (e.g. id-less lines written by write_list) are yielded as plain dicts.
+        Counts of records and skipped lines are kept in self.read_stats.
         """
+        self.read_stats = ReadStats()
         try:
-            with open(filename, "r", encoding="utf-8") as fh:
-                text = fh.read()
+            fh = open(filename, "r", encoding="utf-8", buffering=READ_BUFFER_SIZE)
         except FileNotFoundError:
-            return []
+            return
+        with fh:
+            if key:
+                stream = _JsonStream(fh)
+                if stream.find_top_level_key(key):
+                    records = self._iter_key_value(stream)
+                    yield from (map(partial(codec.from_mapping, as_type), records) if as_type else records)
+                    return
+                fh.seek(0)
+            yield from self._iter_lines(fh, as_type)
 
-        # If a top-level key is requested, try to parse entire document and extract it.
-        if key:
-            print(f"read_file: Attempting to read key '{key}' from {filename}")
+    def _iter_key_value(self, stream: "_JsonStream") -> Iterator[Any]:
+        stats = self.read_stats
+        stream.skip_ws()
+        if stream.peek() != "[":
             try:
-                whole = json.loads(text)
-                if isinstance(whole, dict) and key in whole:
-                    val = whole[key]
-                    print(f"read_file: Found key '{key}' with type {type(val)}")
-                    # If the value is JSON text (string), try to parse it
-                    if isinstance(val, str):
-                        print(f"read_file: key '{key}' value is string, attempting to parse as JSON text")
-                        try:
-                            parsed = json.loads(val)
-                            print(f"read_file: key '{key}' string parsed as JSON with type {type(parsed)}")
-                            if isinstance(parsed, list):
-                                print(f"read_file: key '{key}' returning list of {len(parsed)} items")
-                                return parsed
-                            print(f"read_file: key '{key}' returning single item list")
-                            return [parsed]
-                        except json.JSONDecodeError:
-                            print(f"read_file: key '{key}' value is not JSON text, returning as string")
-                            return [val]
-                    # If it's already a list/object, return it (wrap non-list in list)
-                    if isinstance(val, list):
-                        print(f"read_file2: key '{key}' returning list of {len(val)} items")
-                        return val
-                    print(f"read_file2: key '{key}' returning single item list")
-                    return [val]
-            except json.JSONDecodeError:
-                print(f"read_file: Failed to parse entire file as JSON, falling back to streaming parse")
-                # fall through to streaming parse if top-level parse fails
-                pass
-
-        # streaming/concatenated JSON parse (existing behavior)
-        print(f"read_file: Streaming parse of {filename}")
-        decoder = JSONDecoder()
-        objs: List[Any] = []
-        idx = 0
-        text_len = len(text)
-
+                val = stream.decode_value()
+            except JSONDecodeError:
+                stats.skipped_lines += 1
+                return
+            # If the value is JSON text (string), try to parse it
+            if isinstance(val, str):
+                try:
+                    val = json.loads(val)
+                except JSONDecodeError:
+                    pass
+            for item in (val if isinstance(val, list) else [val]):
+                stats.records += 1
+                yield item
+            return
+        stream.pos += 1
         while True:
-            # skip whitespace
-            while idx < text_len and text[idx].isspace():
-                idx += 1
-            if idx >= text_len:
-                break
+            stream.skip_ws()
+            c = stream.peek()
+            if c in ("]", ""):
+                return
+            if c == ",":
+                stream.pos += 1
+                continue
             try:
-                obj, end = decoder.raw_decode(text, idx)
-                objs.append(obj)
-                idx = end
+                item = stream.decode_value()
             except JSONDecodeError:
-                # If decoding fails at this position, skip to next newline and continue
-                next_nl = text.find("\n", idx)
-                if next_nl == -1:
+                # cannot resynchronise inside an array; stop at the malformed element
+                stats.skipped_lines += 1
+                return
+            stats.records += 1
+            yield item
+
+    def _iter_lines(self, fh: TextIO, as_type: Optional[type] = None) -> Iterator[Any]:
+        stats = self.read_stats
+        decoder = JSONDecoder()
+        decode_line = codec.decoder_for(as_type) if as_type else codec.loads
+        convert = partial(codec.from_mapping, as_type) if as_type else None
+        replay: Deque[str] = deque()
+        pending: List[str] = []
+        pending_len = 0
+        depth = 0
+        while True:
+            line = replay.popleft() if replay else fh.readline()
+            if line and pending and line[0] == "{" and pending[0][0] == "{" and _decodes(decode_line, line):
+                # a record complete on its own line while another is being collected: that
+                # one was truncated, so stop collecting and read this line again after it
+                replay.appendleft(line)
+            elif line:
+                if not pending:
+                    if line.isspace():
+                        continue
+                    # fast path: one complete record per line, decoded by the codec backend
+                    try:
+                        obj = decode_line(line)
+                    except codec.DECODE_ERRORS + (TypeError,):
+                        pass
+                    else:
+                        stats.records += 1
+                        yield obj
+                        continue
+                pending.append(line)
+                pending_len += len(line)
+                depth += _bracket_depth(line)
+                # keep collecting the lines of an object that spans several lines
+                if depth > 0 and pending_len < MAX_RECORD_CHARS:
+                    continue
+            elif not pending:
+                return
+
+            text = "".join(pending)
+            pending, pending_len, depth = [], 0, 0
+            idx, text_len = 0, len(text)
+            while True:
+                while idx < text_len and text[idx].isspace():
+                    idx += 1
+                if idx >= text_len:
                     break
-                idx = next_nl + 1
-                continue
-        print(f"read_file3: Parsed {len(objs)} JSON objects from {filename}")
-        return objs
+                try:
+                    obj, idx = decoder.raw_decode(text, idx)
+                except JSONDecodeError:
+                    # skip to the next newline and rescan the rest
+                    stats.skipped_lines += 1
+                    next_nl = text.find("\n", idx)
+                    if next_nl != -1:
+                        replay.extendleft(reversed(text[next_nl + 1:].splitlines(keepends=True)))
+                    break
+                stats.records += 1
+                yield convert(obj) if convert else obj
+
+    def read_file(self, filename: str, key: Optional[str] = None) -> List[Any]:
+        """
+        Read a file that contains one or more JSON objects. If `key` is provided,
+        return the elements of the value at top-level `key` (if present).
+        Otherwise, parse newline-delimited or concatenated JSON records.
+
+        Returns a list of parsed objects (or empty list on missing file / no valid JSON).
+        See iter_records for the streaming equivalent.
+        """
+        return list(self.iter_records(filename, key))
 
     def build_reference_edges(self, work: Any) -> List[ReferenceEdge]:
         """
@@ -135,22 +514,190 @@ class NetworkFileTalker:
             edges.append(ReferenceEdge(from_work=getattr(work, "id"), referenced_work=r))
         return edges
 
+    def build_edge_columns(self, works: Iterable[Any]) -> EdgeColumns:
+        """
+        Collect the reference edges of Work-like objects as EdgeColumns. Works with
+        int reference_keys (openalex.CompactWork) are copied without creating strings;
+        other works must have OpenAlex work IDs.
+        """
+        columns = EdgeColumns()
+        for w in works:
+            keys = getattr(w, "reference_keys", None)
+            if keys is not None:
+                columns.add_work(w.key, keys)
+                continue
+            refs = getattr(w, "references", None)
+            if refs is None:
+                refs = getattr(w, "referenced_works", None)
+            if refs:
+                columns.add_work(work_key(w.id), map(work_key, refs))
+        return columns
+
+    def write_edge_columns(self, columns: EdgeColumns, filename: Optional[str] = None) -> None:
+        """
+        Write EdgeColumns to the reference edge CSV, in the same format as write_reference_edges.
+        """
+        self._write_edge_rows(list(columns), filename)
+
     def write_reference_edges(self, reference_edges: List[ReferenceEdge], filename: Optional[str] = None) -> None:
         """
         Write ReferenceEdge list to CSV file (from_work, referenced_work).
         If filename is None, use self.reference_edge_file. Append if file exists.
         """
+        self._write_edge_rows(((e.from_work, e.referenced_work) for e in reference_edges), filename)
+
+    @timed("talker.write_edges")
+    def _write_edge_rows(self, rows: Iterable[Tuple[str, str]], filename: Optional[str] = None) -> None:
         target = filename or self.reference_edge_file
-        with open(target, "a", newline="", encoding="utf-8") as fh:
-            writer = csv.writer(fh)
-            for e in reference_edges:
-                writer.writerow([e.from_work, e.referenced_work])
+        rows = rows if isinstance(rows, list) else list(rows)
+        with open(target, "a", newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as fh:
+            text = _plain_csv(rows)
+            if text is None:
+                csv.writer(fh).writerows(rows)
+            else:
+                fh.write(text)
+
+    def upsert_work_nodes_edges(self, pages: Iterable[List[Any]], work_node_file: Optional[str] = None, reference_edge_file: Optional[str] = None) -> UpsertStats:
+        """
+        Insert or replace works in the node and edge files, instead of appending duplicates.
+        `pages` is an iterable of Work lists (e.g. fetched lazily from the network). They are
+        first staged to side files, holding only their IDs in memory, then appended to the
+        files; the old node line and all outgoing edge rows of a replaced work are blanked
+        in place (overwritten with spaces, which every reader skips). Their offsets come
+        from a LineIndex next to the node file, so the cost grows with the upserted works
+        and the lines appended since the previous upsert, not with the size of the files
+        (the first upsert over existing files indexes them once). compact_files removes
+        the blank lines.
+        The change is journaled: after a crash part-way, the files hold the new records
+        next to the old ones until the next upsert (or recover_upsert) completes it.
+        """
+        target_nodes = work_node_file or self.json_out_file
+        target_edges = reference_edge_file or self.reference_edge_file
+        self.recover_upsert(target_nodes, target_edges)
+        staged_nodes, staged_edges = f"{target_nodes}.staged", f"{target_edges}.staged"
+        journal_path = _upsert_journal_path(target_nodes)
+        stats = UpsertStats()
+        changed: set = set()
+        try:
+            for path in (staged_nodes, staged_edges):
+                open(path, "w").close()
+            for page in pages:
+                fresh = []
+                for w in page:
+                    if w.id not in changed:
+                        changed.add(w.id)
+                        fresh.append(w)
+                # staged directly through the base class: subclasses may filter write_list
+                NetworkFileTalker.write_list(self, fresh, staged_nodes)
+                NetworkFileTalker._write_edge_rows(self, list(_edge_rows(fresh)), staged_edges)
+            if not changed:
+                return stats
+
+            index = LineIndex(_line_index_path(target_nodes))
+            try:
+                index.sync("nodes", target_nodes, _node_line_id)
+                index.sync("edges", target_edges, _edge_line_source)
+                node_spans = index.find("nodes", changed)
+                edge_spans = index.find("edges", changed)
+            finally:
+                index.close()
+            stats.replaced = len({key for key, _, _, _ in node_spans})
+            stats.inserted = len(changed) - stats.replaced
+            stats.edges_removed = sum(lines for _, _, _, lines in edge_spans)
+            with open(staged_edges, "rb") as fh:
+                stats.edges_written = sum(1 for _ in fh)
+
+            journal = {"index": _line_index_path(target_nodes), "files": []}
+            for role, target, staged, spans in (("nodes", target_nodes, staged_nodes, node_spans), ("edges", target_edges, staged_edges, edge_spans)):
+                _fsync_file(staged)
+                journal["files"].append({
+                    "role": role, "path": target, "staged": staged,
+                    "size": os.path.getsize(target) if os.path.exists(target) else 0,
+                    "keys": sorted({key for key, _, _, _ in spans}),
+                    "spans": [[offset, length] for _, offset, length, _ in spans],
+                })
+            _write_journal(journal_path, journal)
+            _apply_upsert(journal)
+            os.remove(journal_path)
+            logger.log(self.log_level, "upsert_work_nodes_edges: %s", stats, extra={"target": target_nodes})
+            return stats
+        finally:
+            # a journaled upsert keeps its staged files until it has been applied
+            if not os.path.exists(journal_path):
+                for path in (staged_nodes, staged_edges):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def recover_upsert(self, work_node_file: Optional[str] = None, reference_edge_file: Optional[str] = None) -> bool:
+        """
+        Complete an upsert interrupted by a crash, if its journal is left next to the
+        node file. Returns whether there was one.
+        """
+        journal_path = _upsert_journal_path(work_node_file or self.json_out_file)
+        try:
+            with open(journal_path, "r", encoding="utf-8") as fh:
+                journal = json.load(fh)
+        except FileNotFoundError:
+            return False
+        _apply_upsert(journal)
+        os.remove(journal_path)
+        for f in journal["files"]:
+            if os.path.exists(f["staged"]):
+                os.remove(f["staged"])
+        return True
+
+    def compact_files(self, work_node_file: Optional[str] = None, reference_edge_file: Optional[str] = None) -> int:
+        """
+        Rewrite the node and edge files without the blank lines left by upserts, one
+        streaming pass over each. Returns the number of lines dropped. The line index
+        notices the new files and is rebuilt by the next upsert.
+        """
+        target_nodes = work_node_file or self.json_out_file
+        target_edges = reference_edge_file or self.reference_edge_file
+        self.recover_upsert(target_nodes, target_edges)
+        dropped = 0
+        for target in (target_nodes, target_edges):
+            if not os.path.exists(target):
+                continue
+            compacted = f"{target}.compact.tmp"
+            with open(target, "rb", buffering=READ_BUFFER_SIZE) as fh, open(compacted, "wb", buffering=WRITE_BUFFER_SIZE) as out:
+                for line in fh:
+                    if line.isspace():
+                        dropped += 1
+                    else:
+                        out.write(line)
+            os.replace(compacted, target)
+        return dropped
 
+    def file_offsets(self, work_node_file: Optional[str] = None, reference_edge_file: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Return the current sizes in bytes of the node and edge files (0 if missing).
+        """
+        sizes = []
+        for target in (work_node_file or self.json_out_file, reference_edge_file or self.reference_edge_file):
+            try:
+                sizes.append(os.path.getsize(target))
+            except FileNotFoundError:
+                sizes.append(0)
+        return sizes[0], sizes[1]
+
+    def truncate_files(self, node_offset: int, edge_offset: int, work_node_file: Optional[str] = None, reference_edge_file: Optional[str] = None) -> None:
+        """
+        Cut the node and edge files back to the given byte offsets, discarding any
+        partial trailing writes made after the last checkpoint.
+        """
+        for target, offset in ((work_node_file or self.json_out_file, node_offset), (reference_edge_file or self.reference_edge_file, edge_offset)):
+            if not os.path.exists(target):
+                continue
+            if os.path.getsize(target) > offset:
+                with open(target, "r+b") as fh:
+                    fh.truncate(offset)
+
+    @timed("talker.write_work_nodes_edges")
     def write_work_nodes_edges(self, page_work_list: List[Any], work_node_file: Optional[str] = None, reference_edge_file: Optional[str] = None) -> None:
         """
-        Write a list of Work-like objects as newline JSON node records and collect/write
-        their ReferenceEdge CSV entries.
-        - Converts dataclass Work objects to dicts.
+        Write a list of Work-like objects as newline JSON node records and write
+        one (from_work, referenced_work) CSV row per reference.
         - Uses provided filenames or falls back to instance defaults.
         """
         if not page_work_list:
@@ -158,34 +705,13 @@ class NetworkFileTalker:
 
         target_nodes = work_node_file or self.json_out_file
         target_edges = reference_edge_file or self.reference_edge_file
-        # print(f"Writing {len(page_work_list)} nodes to {target_nodes} and edges to {target_edges}")
-        # prepare node objects (convert dataclasses to dicts)
-        # node_objs: List[Any] = []
-        # for w in page_work_list:
-        #     if is_dataclass(w):
-        #         node_objs.append(asdict(w))
-        #     elif isinstance(w, dict):
-        #         node_objs.append(w)
-        #     else:
-        #         # best-effort: try to serialize attributes
-        #         try:
-        #             node_objs.append(w.__dict__)
-        #         except Exception:
-        #             node_objs.append(str(w))
-
-        # write nodes -- but convert to Work objects first 
-        print(f"write_work_nodes_edges: Writing {len(page_work_list)} nodes to {target_nodes}")
         self.write_list(page_work_list, target_nodes)
 
-        # collect and write edges
-        all_edges: List[ReferenceEdge] = []
-        for w in page_work_list:
-            edges = self.build_reference_edges(w)
-            print(f"build_reference_edges: Found {len(edges)} edges for work {getattr(w, 'id', 'unknown')}")
-            print(f"Edges: {edges[0]}")
-            if edges:
-                all_edges.extend(edges)
-
-        if all_edges:
-            print(f"write_work_nodes_edges: Writing {len(all_edges)} edges to {target_edges}")
-            self.write_reference_edges(all_edges, target_edges)
\ No newline at end of file
+        if self.edge_sink is not None:
+            self.edge_sink.write_work_edges(page_work_list)
+            return
+
+        rows = list(_edge_rows(page_work_list))
+        if rows:
+            logger.log(self.log_level, "write_work_nodes_edges: %d edges to %s", len(rows), target_edges, extra={"edges": len(rows), "target": target_edges})
+            self._write_edge_rows(rows, target_edges)
@@ -2,12 +2,21 @@
 Lightweight OpenAlex client focused on Topics and Works.
 Adjust filter keys if OpenAlex filter names change (e.g. 'topics.id' vs 'topic.id').
 """
-from dataclasses import dataclass
-from typing import List, Optional, Iterator, Dict, Any
+import math
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import List, Optional, Iterator, Dict, Any, Sequence, Tuple
 
 # prefer the concrete topic client in this package
 from .openalex_topic_client import OpenAlexTopicClient as _UnderlyingClient
 from .network_file_talker import NetworkFileTalker, ReferenceEdge 
+from .checkpoint import HarvestCheckpoint
+from .enrichment import WorkEnricher, DEFAULT_BATCH_SIZE
+from .instrumentation import METRICS
+from .work_ids import work_id_from_key, work_key
 
 @dataclass
 class Topic:
@@ -26,18 +35,105 @@ class Work:
     cited_by_count: Optional[int] = None
     best_oa_location__pdf_url: Optional[str] = None
 
+class CompactWork:
+    """
+    Memory-compact counterpart of Work for large in-memory harvests: a slotted object
+    holding the work ID as an int key (W123 -> 123) and the references as an array('q')
+    of keys (8 bytes each instead of a URL string). `id` and `references` are rebuilt
+    as full URL strings on access, so readers of Work attributes keep working, and
+    NetworkFileTalker writes the same node records as for Work.
+    Only OpenAlex work IDs can be stored.
+    """
+    __slots__ = ("key", "title", "reference_keys", "publication_year", "doi", "cited_by_count", "best_oa_location__pdf_url")
+    RECORD_FIELDS = tuple(f.name for f in fields(Work))
+
+    def __init__(self, key: int, title: Optional[str] = None, reference_keys: Optional[array] = None, publication_year: Optional[int] = None, doi: Optional[str] = None, cited_by_count: Optional[int] = None, best_oa_location__pdf_url: Optional[str] = None):
+        self.key = key
+        self.title = title
+        self.reference_keys = reference_keys if reference_keys is not None else array("q")
+        self.publication_year = publication_year
+        self.doi = doi
+        self.cited_by_count = cited_by_count
+        self.best_oa_location__pdf_url = best_oa_location__pdf_url
+
+    @property
+    def id(self) -> str:
+        return work_id_from_key(self.key)
+
+    @property
+    def references(self) -> List[str]:
+        return [work_id_from_key(k) for k in self.reference_keys]
+
+    @classmethod
+    def from_work(cls, work: Work) -> "CompactWork":
+        return cls(work_key(work.id), work.title, array("q", map(work_key, work.references or [])), work.publication_year,
+                   work.doi, work.cited_by_count, work.best_oa_location__pdf_url)
+
+    @classmethod
+    def from_record(cls, data: Dict[str, Any]) -> "CompactWork":
+        """
+        Build directly from raw OpenAlex work JSON, without an intermediate Work.
+        """
+        get = data.get
+        best_oa_location = get("best_oa_location")
+        return cls(work_key(get("id")), get("title"), array("q", map(work_key, get("referenced_works") or ())), get("publication_year"),
+                   get("doi"), get("cited_by_count"), best_oa_location.get("pdf_url") if best_oa_location else None)
+
+    def to_work(self) -> Work:
+        return Work(id=self.id, title=self.title, references=self.references, publication_year=self.publication_year,
+                    doi=self.doi, cited_by_count=self.cited_by_count, best_oa_location__pdf_url=self.best_oa_location__pdf_url)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CompactWork):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"CompactWork(id={self.id!r}, title={self.title!r}, references={len(self.reference_keys)})"
+
+
+# Work fields whose OpenAlex name differs; "a__b" fields are read from the nested object a
+WORK_FIELD_ALIASES = {"references": "referenced_works"}
+
+
+def work_select_fields(cls: type = Work) -> List[str]:
+    """
+    OpenAlex select= projection covering the fields of a Work-like dataclass.
+    """
+    selected: Dict[str, None] = {}
+    for f in fields(cls):
+        name = WORK_FIELD_ALIASES.get(f.name, f.name)
+        selected[name.split("__", 1)[0]] = None
+    return list(selected)
+
+
+# OpenAlex fields read by OpenAlexClient.build_work
+WORK_SELECT_FIELDS = work_select_fields()
+
+
+def select_param(select: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    Value of the select= query parameter: WORK_SELECT_FIELDS when select is None,
+    no projection (full work objects) when select is empty.
+    """
+    if select is None:
+        select = WORK_SELECT_FIELDS
+    return ",".join(select) if select else None
+
 
 class OpenAlexClient:
     talker: NetworkFileTalker 
     reference_edge_file: Optional[str] = "reference_edges.csv"
     work_node_file: Optional[str] = "work_nodes.json" 
 
-    def __init__(self, *args, talker: Optional[NetworkFileTalker] = None, reference_edge_file: Optional[str] = None, work_node_file: Optional[str] = None, **kwargs):
+    def __init__(self, *args, talker: Optional[NetworkFileTalker] = None, reference_edge_file: Optional[str] = None, work_node_file: Optional[str] = None, citation_index: Optional[Any] = None, **kwargs):
         """
         Create the underlying HTTP client and configure file output.
+        citation_index (a citation_index.CitationIndex) is consulted by get_work before the network.
         Any extra args/kwargs are forwarded to the underlying OpenAlexTopicClient.
         """
         self._client = _UnderlyingClient(*args, **kwargs)
+        self.citation_index = citation_index
         # use provided talker or a default NetworkFileTalker
         self.talker = talker or NetworkFileTalker()
         # allow overriding the defaults declared on the class
@@ -49,26 +145,44 @@ class OpenAlexClient:
     def _get(self, path: str, params: Optional[Dict[str, Any]] = None):
         return self._client._get(path, params=params)
 
+    @property
+    def cache_stats(self):
+        """
+        Hit, miss and eviction counters of the underlying client's response cache, if any.
+        """
+        return self._client.cache_stats
+
+    @property
+    def transport_stats(self):
+        """
+        Request, retry and connection reuse counters of the underlying client's transport.
+        """
+        return self._client.transport_stats
+
     def build_work(self, data: Dict[str, Any]) -> Work:
         """
         Build a Work dataclass from raw OpenAlex work JSON, including references
-        from the 'referenced_works' field.
+        from the 'referenced_works' field. Only the fields in WORK_SELECT_FIELDS are read.
         """
-        best_oa_location=data.get("best_oa_location", {})
-        if best_oa_location:
-            pdf_url = best_oa_location.get("pdf_url")
-        else:
-            pdf_url = None 
+        get = data.get
+        best_oa_location = get("best_oa_location")
         return Work(
-            id=data.get("id"),
-            title=data.get("title"),
-            references=data.get("referenced_works") or [],
-            publication_year=data.get("publication_year"),
-            doi=data.get("doi"),
-            cited_by_count=data.get("cited_by_count"),
-            best_oa_location__pdf_url=pdf_url
+            id=get("id"),
+            title=get("title"),
+            references=get("referenced_works") or [],
+            publication_year=get("publication_year"),
+            doi=get("doi"),
+            cited_by_count=get("cited_by_count"),
+            best_oa_location__pdf_url=best_oa_location.get("pdf_url") if best_oa_location else None
         )
 
+    @staticmethod
+    def _works_params(params: Dict[str, Any], select: Optional[Sequence[str]]) -> Dict[str, Any]:
+        value = select_param(select)
+        if value:
+            params["select"] = value
+        return params
+
     def get_topic(self, topic_id: str) -> Topic:
         path = f"/topics/{topic_id}" if not str(topic_id).startswith("/") and not str(topic_id).startswith("http") else topic_id
         data = self._get(path)
@@ -81,36 +195,53 @@ class OpenAlexClient:
             for r in data.get("results", []):
                 yield Topic(id=r.get("id"), display_name=r.get("display_name"), level=r.get("level"))
             
-    def build_works_and_network_for_page(self, items: List[Dict[str, Any]], build_network: bool, results_list: List[Work], collected: int, max_items: Optional[int]):
+    def build_works_and_network_for_page(self, items: List[Dict[str, Any]], build_network: bool, results_list: List[Work], collected: int, max_items: Optional[int], compact: bool = False):
         """
-        Helper to process a page of work items: build Work objects, append to results_list,
-        update collected count, and return (results_list, collected, done_flag).
+        Helper to process a page of work items: build Work objects (CompactWork if compact),
+        append to results_list, update collected count, and return (results_list, collected, done_flag).
         If max_items is reached, done_flag is True and the caller should stop.
         """
+        build = CompactWork.from_record if compact else self.build_work
         page_work_list: List[Work] = []
         max_reached = False
+        start = time.perf_counter()
         for i in items:
-            w = self.build_work(i)
+            w = build(i)
             results_list.append(w)
             page_work_list.append(w)
             collected += 1
             if max_items and collected >= max_items:
                 max_reached = True
                 break
+        if METRICS.enabled:
+            METRICS.observe("build_work.page", time.perf_counter() - start)
+            METRICS.incr("records", len(page_work_list))
 
         self.talker.write_work_nodes_edges(page_work_list)
         return  collected, max_reached
 
-    def get_works_for_topic(self, topic_id: str, per_page: int = 25, max_items: Optional[int] = None) -> List[Work]:
+    def get_works_for_topic(self, topic_id: str, per_page: int = 25, max_items: Optional[int] = None, workers: int = 1, select: Optional[Sequence[str]] = None, compact: bool = False) -> List[Work]:
+        """
+        Fetch the works for a topic, writing each page through the talker as it arrives.
+        Only the fields build_work reads are requested, unless select overrides the
+        projection (see select_param). With compact=True the returned works are
+        CompactWork objects, which take a fraction of the memory of Work.
+        With workers > 1, pages after the first are fetched concurrently (see
+        _get_works_for_topic_concurrent); pages are still processed in page order.
+        Page-number paging stops at 10,000 results; use get_works_for_topic_by_cursor
+        for deeper or resumable harvests.
+        """
+        if workers > 1:
+            return self._get_works_for_topic_concurrent(topic_id, per_page, max_items, workers, select, compact)
         results_list: List[Work] = []
         page = 1
         collected = 0
         while True:
-            params = {"per-page": per_page, "page": page}
+            params = self._works_params({"per-page": per_page, "page": page}, select)
             path = f"/topics/{topic_id}/works"
             data = self._get(path, params=params)
             items = data.get("results", [])
-            collected, done = self.build_works_and_network_for_page(items, False, results_list, collected, max_items)
+            collected, done = self.build_works_and_network_for_page(items, False, results_list, collected, max_items, compact)
             if done:
                 return results_list
             meta = data.get("meta", {})
@@ -120,11 +251,153 @@ class OpenAlexClient:
         print( f"Collected {len(results_list)} = {collected} works for topic {topic_id}")
         return results_list
 
-    def get_work(self, work_id: str) -> Work:
+    def _get_works_for_topic_concurrent(self, topic_id: str, per_page: int, max_items: Optional[int], workers: int, select: Optional[Sequence[str]] = None, compact: bool = False) -> List[Work]:
+        """
+        Read meta.count from the first page, then fetch the remaining pages with a pool of
+        `workers` threads. At most 2 * workers pages are in flight, and pages are handed to
+        build_works_and_network_for_page strictly in page order, so max_items truncation
+        and the output files match the sequential harvest. The request rate is bounded by
+        the underlying client's rate limiter (requests_per_second).
+        """
+        results_list: List[Work] = []
+        path = f"/topics/{topic_id}/works"
+        data = self._get(path, params=self._works_params({"per-page": per_page, "page": 1}, select))
+        items = data.get("results", [])
+        collected, done = self.build_works_and_network_for_page(items, False, results_list, 0, max_items, compact)
+        if done or len(items) < per_page:
+            return results_list
+
+        total = data.get("meta", {}).get("count") or 0
+        if max_items:
+            total = min(total, max_items)
+        pages = iter(range(2, math.ceil(total / per_page) + 1))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+
+            def submit_next() -> None:
+                page = next(pages, None)
+                if page is not None:
+                    in_flight.append(pool.submit(self._get, path, self._works_params({"per-page": per_page, "page": page}, select)))
+
+            for _ in range(2 * workers):
+                submit_next()
+            try:
+                while in_flight:
+                    data = in_flight.popleft().result()
+                    submit_next()
+                    items = data.get("results", [])
+                    collected, done = self.build_works_and_network_for_page(items, False, results_list, collected, max_items, compact)
+                    if done or len(items) < per_page:
+                        break
+            finally:
+                for fut in in_flight:
+                    fut.cancel()
+        print( f"Collected {len(results_list)} = {collected} works for topic {topic_id}")
+        return results_list
+
+    def iter_topic_pages(self, topic_id: str, per_page: int = 200, filter_q: Optional[str] = None, cursor: Optional[str] = "*", select: Optional[Sequence[str]] = None) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        Page through a topic's works with OpenAlex cursor paging, which has no 10,000-result cap.
+        Yields (items, next_cursor) per page; next_cursor is None after the last page.
+        """
+        path = f"/topics/{topic_id}/works"
+        while cursor:
+            params = self._works_params({"per-page": per_page, "cursor": cursor}, select)
+            if filter_q:
+                params["filter"] = filter_q
+            data = self._get(path, params=params)
+            items = data.get("results", [])
+            cursor = data.get("meta", {}).get("next_cursor") if items else None
+            yield items, cursor
+
+    def iter_works_for_topic(self, topic_id: str, per_page: int = 200, max_items: Optional[int] = None, filter_q: Optional[str] = None, select: Optional[Sequence[str]] = None, compact: bool = False, talker: Optional[NetworkFileTalker] = None) -> Iterator[Work]:
+        """
+        Lazily yield a topic's works (CompactWork if compact), page by page with cursor
+        paging. The next page is only requested once the consumer has taken every work
+        of the current one, so memory stays at one page whatever the topic size.
+        Nothing is written unless a talker is attached: then each page is written with
+        talker.write_work_nodes_edges before its works are yielded. Pass self.talker
+        to write where get_works_for_topic does.
+        """
+        build = CompactWork.from_record if compact else self.build_work
+        collected = 0
+        for items, _ in self.iter_topic_pages(topic_id, per_page=per_page, filter_q=filter_q, select=select):
+            if max_items:
+                items = items[:max_items - collected]
+            page = [build(i) for i in items]
+            collected += len(page)
+            if talker is not None:
+                talker.write_work_nodes_edges(page)
+            yield from page
+            if max_items and collected >= max_items:
+                return
+
+    def get_works_for_topic_by_cursor(self, topic_id: str, per_page: int = 200, max_items: Optional[int] = None, filter_q: Optional[str] = None, checkpoint_file: Optional[str] = None, select: Optional[Sequence[str]] = None, compact: bool = False) -> List[Work]:
+        """
+        Cursor-paged variant of get_works_for_topic. When checkpoint_file is given, a
+        HarvestCheckpoint is committed after every page has been written by the talker.
+        If the checkpoint already exists, the harvest resumes from its cursor after
+        truncating the talker's node and edge files back to the committed offsets.
+        Returns the works fetched by this call only (as CompactWork if compact).
+        Checkpoints cover the node and edge files only, so they cannot be combined with
+        a talker that writes its edges to an edge_sink.
+        """
+        if checkpoint_file and getattr(self.talker, "edge_sink", None) is not None:
+            raise ValueError("checkpoint_file cannot be used with a talker edge_sink: the sink is not rolled back on resume")
+        checkpoint = HarvestCheckpoint.load(checkpoint_file) if checkpoint_file else None
+        if checkpoint is not None:
+            if checkpoint.topic != topic_id or checkpoint.filter != filter_q:
+                raise ValueError(f"Checkpoint {checkpoint_file} is for topic {checkpoint.topic} filter {checkpoint.filter}, not {topic_id} filter {filter_q}")
+            self.talker.truncate_files(checkpoint.node_offset, checkpoint.edge_offset)
+            print(f"Resuming topic {topic_id} after {checkpoint.records_written} records")
+        else:
+            node_offset, edge_offset = self.talker.file_offsets()
+            checkpoint = HarvestCheckpoint(topic=topic_id, filter=filter_q, node_offset=node_offset, edge_offset=edge_offset)
+            # commit the starting offsets, so a crash within the first page is rolled back too
+            if checkpoint_file:
+                checkpoint.save(checkpoint_file)
+
+        results_list: List[Work] = []
+        collected = checkpoint.records_written
+        for items, next_cursor in self.iter_topic_pages(topic_id, per_page=per_page, filter_q=filter_q, cursor=checkpoint.cursor, select=select):
+            collected, done = self.build_works_and_network_for_page(items, False, results_list, collected, max_items, compact)
+            if checkpoint_file:
+                checkpoint.cursor = None if done else next_cursor
+                checkpoint.records_written = collected
+                checkpoint.node_offset, checkpoint.edge_offset = self.talker.file_offsets()
+                checkpoint.save(checkpoint_file)
+            if done:
+                break
+        print( f"Collected {len(results_list)} works for topic {topic_id}, {collected} in total")
+        return results_list
+
+    def get_work(self, work_id: str, select: Optional[Sequence[str]] = None) -> Work:
+        if self.citation_index is not None:
+            work = self.citation_index.get_work(work_id)
+            if work is not None:
+                return work
         path = f"/works/{work_id}" if not str(work_id).startswith("/") and not str(work_id).startswith("http") else work_id
-        data = self._get(path)
+        data = self._get(path, params=self._works_params({}, select) or None)
         return self.build_work(data)
 
+    def get_works_by_ids(self, work_ids: List[str], batch_size: int = DEFAULT_BATCH_SIZE, select: Optional[Sequence[str]] = None) -> Dict[str, Work]:
+        """
+        Resolve many works at once through openalex_id OR-filters, batch_size IDs per request,
+        fetching only the fields build_work needs. Returns {requested id: Work}.
+        """
+        enricher = WorkEnricher(self._get, batch_size=batch_size, select=WORK_SELECT_FIELDS if select is None else select)
+        return {wid: self.build_work(data) for wid, data in enricher.resolve(work_ids).items()}
+
+    def enrich_references(self, works: List[Work], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Work]:
+        """
+        Build Work records for the cited-only nodes of `works`: the distinct referenced
+        IDs that are not themselves in `works`.
+        """
+        known = {w.id for w in works}
+        unknown = [r for w in works for r in (w.references or []) if r not in known]
+        return self.get_works_by_ids(unknown, batch_size=batch_size)
+
     def write_work_nodes_edges(self, page_work_list: List[Work]) -> None:
         """
         Write the provided list of Work objects as node records and collect+write
@@ -1,6 +1,13 @@
 import time
 import requests
-from typing import Dict, Generator, List, Optional
+from typing import Any, Dict, Generator, Iterator, List, Optional, Sequence
+
+from . import codec
+from .http_cache import CacheMissError, CacheStats, ResponseCache
+from .instrumentation import METRICS
+from .rate_limiter import RateLimiter
+from .retry_policy import RetryPolicy
+from .transport import Transport, TransportStats
 
 class OpenAlexTopicClient:
     """
@@ -8,19 +15,81 @@ class OpenAlexTopicClient:
     """
     BASE = "https://api.openalex.org"
 
-    def __init__(self, mailto: Optional[str] = None, sleep_on_rate_limit: float = 10.0, session: Optional[requests.Session] = None):
+    def __init__(self, mailto: Optional[str] = None, sleep_on_rate_limit: float = 10.0, session: Optional[requests.Session] = None, requests_per_second: Optional[float] = None, rate_limiter: Optional[RateLimiter] = None, cache: Optional[ResponseCache] = None, offline: bool = False, pool_size: int = 10, http2: bool = False, retry_policy: Optional[RetryPolicy] = None, transport: Optional[Transport] = None):
+        """
+        Requests go through `transport` (by default a pooled Transport of pool_size
+        connections, over HTTP/2 if http2, around `session` if given). Without a
+        retry_policy, a 429 is retried once after sleep_on_rate_limit seconds (or the
+        server's Retry-After).
+        """
         self.mailto = mailto
-        self.session = session or requests.Session()
         self.sleep_on_rate_limit = sleep_on_rate_limit
+        if transport is None:
+            if retry_policy is None:
+                retry_policy = RetryPolicy(max_retries=1, backoff_base=sleep_on_rate_limit, backoff_max=max(sleep_on_rate_limit, 60.0), jitter=0.0, retry_statuses=(429,))
+            transport = Transport(pool_size=pool_size, http2=http2, retry_policy=retry_policy, session=session)
+        self.transport = transport
+        self.session = transport.session
+        # one limiter per client, shared by every thread issuing requests through it
+        if rate_limiter is None and requests_per_second:
+            rate_limiter = RateLimiter(requests_per_second)
+        self.rate_limiter = rate_limiter
+        # optional persistent response cache; offline mode serves only from it
+        if offline and cache is None:
+            raise ValueError("offline mode requires a cache")
+        self.cache = cache
+        self.offline = offline
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self.cache.stats if self.cache is not None else None
+
+    @property
+    def transport_stats(self) -> TransportStats:
+        return self.transport.stats
 
     def _get(self, path: str, params: Optional[Dict] = None) -> Dict:
         params = params or {}
         if self.mailto:
             params.setdefault("mailto", self.mailto)
         url = path if path.startswith("http") else f"{self.BASE}{path}"
-        resp = self.session.get(url, params=params, timeout=30)
-        if resp.status_code == 429:
-            time.sleep(self.sleep_on_rate_limit)
-            resp = self.session.get(url, params=params, timeout=30)
+        if self.cache is not None:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                return cached
+            if self.offline:
+                raise CacheMissError(f"Offline and not cached: {self.cache.make_key(url, params)}")
+        resp = self.transport.request(url, params, self.rate_limiter)
         resp.raise_for_status()
-        return resp.json()
+        if METRICS.enabled:
+            start = time.perf_counter()
+            data = codec.loads(resp.content)
+            METRICS.observe("json.decode", time.perf_counter() - start)
+        else:
+            data = codec.loads(resp.content)
+        if self.cache is not None:
+            self.cache.put(url, params, data)
+        return data
+
+    def iter_topic_works(self, topic_id: str, per_page: int = 200, max_results: Optional[int] = None, filter_q: Optional[str] = None, select: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        """
+        Yield raw work records for a topic using cursor paging, up to max_results.
+        Pages are requested lazily, as the consumer reaches their first record.
+        select limits the records to the given OpenAlex fields (default: full records).
+        """
+        cursor: Optional[str] = "*"
+        yielded = 0
+        while cursor:
+            params: Dict[str, Any] = {"per-page": per_page, "cursor": cursor}
+            if filter_q:
+                params["filter"] = filter_q
+            if select:
+                params["select"] = ",".join(select)
+            data = self._get(f"/topics/{topic_id}/works", params=params)
+            items = data.get("results", [])
+            for item in items:
+                yield item
+                yielded += 1
+                if max_results and yielded >= max_results:
+                    return
+            cursor = data.get("meta", {}).get("next_cursor") if items else None
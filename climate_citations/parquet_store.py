@@ -0,0 +1,209 @@
+"""
+Columnar Parquet output: an alternative to the NDJSON node file and CSV edge file
+written by NetworkFileTalker, for analytics loads that should not re-parse text.
+
+Nodes are stored with typed columns (node_schema()) and edges as int64 (source, target)
+pairs; work IDs are stored as int keys (W123 -> 123, see work_ids.work_key), so no
+URL strings are repeated. Every write_work_nodes_edges call becomes one row group,
+whose min/max statistics let read_nodes / read_subgraph skip row groups that cannot
+match a publication_year or cited_by_count predicate. Pruning is most effective when
+harvests are ordered by the filtered column (e.g. OpenAlex sort=publication_year).
+
+Requires pyarrow (pip install pyarrow).
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pc = None
+    pq = None
+
+from .network_file_talker import EdgeColumns, NetworkFileTalker
+from .work_ids import work_key
+
+NODE_FILE = "work_nodes.parquet"
+EDGE_FILE = "reference_edges.parquet"
+NODE_COLUMNS = ("id", "title", "publication_year", "doi", "cited_by_count", "best_oa_location__pdf_url")
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+
+
+def node_schema() -> "pa.Schema":
+    _require_pyarrow()
+    return pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("publication_year", pa.int32()),
+        ("doi", pa.string()),
+        ("cited_by_count", pa.int64()),
+        ("best_oa_location__pdf_url", pa.string()),
+    ])
+
+
+def edge_schema() -> "pa.Schema":
+    _require_pyarrow()
+    return pa.schema([("source", pa.int64()), ("target", pa.int64())])
+
+
+def _int64_array(values: Any) -> "pa.Array":
+    # zero-copy view of an array('q')
+    return pa.Array.from_buffers(pa.int64(), len(values), [None, pa.py_buffer(values)])
+
+
+def node_table(works: Sequence[Any]) -> "pa.Table":
+    """
+    Arrow table (node_schema()) of Work-like objects.
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in NODE_COLUMNS}
+    ids = columns["id"]
+    for w in works:
+        key = getattr(w, "key", None)
+        ids.append(key if key is not None else work_key(w.id))
+        for name in NODE_COLUMNS[1:]:
+            columns[name].append(getattr(w, name, None))
+    return pa.table(columns, schema=node_schema())
+
+
+def edge_table(columns: EdgeColumns) -> "pa.Table":
+    return pa.Table.from_arrays([_int64_array(columns.sources), _int64_array(columns.targets)], schema=edge_schema())
+
+
+class ParquetNetworkSink:
+    """
+    Writes pages of works to a node and an edge Parquet file, one row group per
+    write_work_nodes_edges call. It has the talker interface used by harvests
+    (OpenAlexClient(talker=...), HarvestPipeline), but not the file-offset checkpoint
+    methods: a Parquet file is only readable once close() has written its footer.
+    Usable as a context manager.
+    """
+    def __init__(self, node_file: str = NODE_FILE, edge_file: str = EDGE_FILE, compression: str = "zstd"):
+        _require_pyarrow()
+        self.json_out_file = node_file
+        self.reference_edge_file = edge_file
+        self.compression = compression
+        self._writers: Dict[str, "pq.ParquetWriter"] = {}
+        self._talker = NetworkFileTalker(json_out_file=None, reference_edge_file=None)
+
+    def _writer(self, path: str, schema: "pa.Schema") -> "pq.ParquetWriter":
+        writer = self._writers.get(path)
+        if writer is None:
+            # dictionary-encode the repetitive string columns only
+            writer = pq.ParquetWriter(path, schema, compression=self.compression, use_dictionary=["doi", "best_oa_location__pdf_url"] if "doi" in schema.names else False)
+            self._writers[path] = writer
+        return writer
+
+    def write_work_nodes_edges(self, page_work_list: List[Any], work_node_file: Optional[str] = None, reference_edge_file: Optional[str] = None) -> None:
+        if not page_work_list:
+            return
+        self._writer(work_node_file or self.json_out_file, node_schema()).write_table(node_table(page_work_list))
+        columns = self._talker.build_edge_columns(page_work_list)
+        if len(columns):
+            self._writer(reference_edge_file or self.reference_edge_file, edge_schema()).write_table(edge_table(columns))
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def __enter__(self) -> "ParquetNetworkSink":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def convert_talker_files(node_file: str, edge_file: str, out_node_file: str = NODE_FILE, out_edge_file: str = EDGE_FILE, batch_size: int = 50000, compression: str = "zstd") -> Tuple[int, int]:
+    """
+    Convert a NetworkFileTalker NDJSON node file and its edge CSV (or BinaryEdgeSink
+    directory) to Parquet, batch_size rows per row group. Returns (nodes, edges) written.
+    """
+    _require_pyarrow()
+    from .graph_export import iter_edge_file
+
+    talker = NetworkFileTalker(json_out_file=None, reference_edge_file=None)
+    nodes = edges = 0
+    with pq.ParquetWriter(out_node_file, node_schema(), compression=compression) as writer:
+        batch: List[Dict[str, Any]] = []
+        for record in talker.iter_records(node_file):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                writer.write_table(_record_table(batch))
+                nodes += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(_record_table(batch))
+            nodes += len(batch)
+    with pq.ParquetWriter(out_edge_file, edge_schema(), compression=compression) as writer:
+        columns = EdgeColumns()
+        for source, target in iter_edge_file(edge_file):
+            columns.sources.append(work_key(source))
+            columns.targets.append(work_key(target))
+            if len(columns) >= batch_size:
+                writer.write_table(edge_table(columns))
+                edges += len(columns)
+                columns = EdgeColumns()
+        if len(columns):
+            writer.write_table(edge_table(columns))
+            edges += len(columns)
+    return nodes, edges
+
+
+def _record_table(records: List[Dict[str, Any]]) -> "pa.Table":
+    columns = {name: [r.get(name) for r in records] for name in NODE_COLUMNS}
+    columns["id"] = [work_key(i) for i in columns["id"]]
+    return pa.table(columns, schema=node_schema())
+
+
+def node_filter(min_year: Optional[int] = None, max_year: Optional[int] = None, min_cited_by: Optional[int] = None, max_cited_by: Optional[int] = None) -> Optional["pc.Expression"]:
+    """
+    Filter expression for the given bounds (inclusive), or None for no bounds.
+    """
+    _require_pyarrow()
+    terms = []
+    if min_year is not None:
+        terms.append(pc.field("publication_year") >= min_year)
+    if max_year is not None:
+        terms.append(pc.field("publication_year") <= max_year)
+    if min_cited_by is not None:
+        terms.append(pc.field("cited_by_count") >= min_cited_by)
+    if max_cited_by is not None:
+        terms.append(pc.field("cited_by_count") <= max_cited_by)
+    expr = None
+    for term in terms:
+        expr = term if expr is None else expr & term
+    return expr
+
+
+def read_nodes(path: str = NODE_FILE, min_year: Optional[int] = None, max_year: Optional[int] = None, min_cited_by: Optional[int] = None, max_cited_by: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> "pa.Table":
+    """
+    Read the nodes matching the bounds; row groups whose statistics exclude them are not read.
+    """
+    return pq.read_table(path, columns=list(columns) if columns else None, filters=node_filter(min_year, max_year, min_cited_by, max_cited_by))
+
+
+def read_subgraph(node_path: str = NODE_FILE, edge_path: str = EDGE_FILE, min_year: Optional[int] = None, max_year: Optional[int] = None, min_cited_by: Optional[int] = None, max_cited_by: Optional[int] = None, internal_only: bool = False, node_columns: Optional[Sequence[str]] = None) -> Tuple["pa.Table", "pa.Table"]:
+    """
+    Nodes matching the bounds and the edges they cite (only edges between two
+    matching nodes if internal_only). Edge row groups are pruned by the range of
+    the selected node keys before the exact membership test.
+    """
+    columns = list(node_columns) if node_columns else None
+    if columns and "id" not in columns:
+        columns.insert(0, "id")
+    nodes = read_nodes(node_path, min_year, max_year, min_cited_by, max_cited_by, columns)
+    ids = nodes.column("id")
+    if len(ids) == 0:
+        return nodes, edge_schema().empty_table()
+    bounds = pc.min_max(ids)
+    low, high = bounds["min"].as_py(), bounds["max"].as_py()
+    expr = (pc.field("source") >= low) & (pc.field("source") <= high) & pc.field("source").isin(ids)
+    if internal_only:
+        expr = expr & pc.field("target").isin(ids)
+    return nodes, pq.read_table(edge_path, filters=expr)
@@ -0,0 +1,134 @@
+"""
+Multi-hop citation snowball crawl on top of OpenAlexClient.
+Starting from seed works, the crawler expands backward (referenced works) and/or
+forward (works whose `cites:` filter matches) hop by hop, in batched ID-filter
+requests, and streams every accepted work to a NetworkFileTalker as it goes.
+"""
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .enrichment import DEFAULT_BATCH_SIZE, chunked
+from .network_file_talker import NetworkFileTalker
+from .openalex import OpenAlexClient, Work, WORK_SELECT_FIELDS
+from .work_ids import short_id
+
+DIRECTIONS = ("backward", "forward", "both")
+PRIORITIES = ("cited_by_count", "depth")
+
+
+@dataclass(order=True)
+class _FrontierEntry:
+    priority: Tuple[int, ...]
+    seq: int
+    depth: int = field(compare=False)
+    work: Work = field(compare=False)
+
+
+@dataclass
+class CrawlStats:
+    nodes_written: int = 0
+    edges_written: int = 0
+    works_expanded: int = 0
+    max_depth: int = 0
+    stopped_by: Optional[str] = None
+
+
+class SnowballCrawler:
+    """
+    Crawl the citation neighborhood of seed works.
+    - max_hops: works at this depth are written but not expanded further.
+    - max_nodes / max_edges: budgets on written works and written reference edges.
+    - priority: "cited_by_count" expands the most cited frontier works first,
+      "depth" expands breadth-first.
+    Only the visited ID set and the frontier of not-yet-expanded works are kept in memory.
+    """
+    def __init__(self, client: OpenAlexClient, talker: Optional[NetworkFileTalker] = None, max_hops: int = 2, max_nodes: Optional[int] = 10000, max_edges: Optional[int] = None, direction: str = "backward", priority: str = "cited_by_count", batch_size: int = DEFAULT_BATCH_SIZE, per_page: int = 200):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {PRIORITIES}, got {priority!r}")
+        self.client = client
+        self.talker = talker or client.talker
+        self.max_hops = max_hops
+        self.max_nodes = max_nodes
+        self.max_edges = max_edges
+        self.direction = direction
+        self.priority = priority
+        self.batch_size = batch_size
+        self.per_page = per_page
+        self.visited: Set[str] = set()
+        self.stats = CrawlStats()
+        self._frontier: List[_FrontierEntry] = []
+        self._seq = itertools.count()
+
+    def crawl(self, seed_ids: List[str]) -> CrawlStats:
+        seeds = self.client.get_works_by_ids(seed_ids, batch_size=self.batch_size)
+        self._accept([seeds[s] for s in seed_ids if s in seeds], depth=0)
+        while self._frontier and self.stats.stopped_by is None:
+            batch = [heapq.heappop(self._frontier) for _ in range(min(self.batch_size, len(self._frontier)))]
+            self.stats.works_expanded += len(batch)
+            # expand each depth separately so new works get the right hop count
+            for depth in sorted({e.depth for e in batch}):
+                works = [e.work for e in batch if e.depth == depth]
+                if self.direction in ("backward", "both"):
+                    self._expand_backward(works, depth + 1)
+                if self.direction in ("forward", "both"):
+                    self._expand_forward(works, depth + 1)
+        self.stats.stopped_by = self.stats.stopped_by or "frontier exhausted"
+        return self.stats
+
+    def _expand_backward(self, works: List[Work], depth: int) -> None:
+        refs = list(dict.fromkeys(r for w in works for r in (w.references or []) if r not in self.visited))
+        for ids in chunked(refs, self.batch_size):
+            if self.stats.stopped_by:
+                return
+            found = self.client.get_works_by_ids(ids, batch_size=self.batch_size)
+            self._accept([found[i] for i in ids if i in found], depth)
+
+    def _expand_forward(self, works: List[Work], depth: int) -> None:
+        for batch in chunked(works, self.batch_size):
+            cites = "cites:" + "|".join(short_id(w.id) for w in batch)
+            for page in self._iter_works_pages(cites):
+                if self.stats.stopped_by:
+                    return
+                self._accept(page, depth)
+
+    def _iter_works_pages(self, filter_q: str) -> Iterator[List[Work]]:
+        cursor: Optional[str] = "*"
+        while cursor:
+            params: Dict[str, Any] = {"filter": filter_q, "select": ",".join(WORK_SELECT_FIELDS), "per-page": self.per_page, "cursor": cursor}
+            data = self.client._get("/works", params=params)
+            items = data.get("results", [])
+            yield [self.client.build_work(i) for i in items]
+            cursor = data.get("meta", {}).get("next_cursor") if items else None
+
+    def _accept(self, works: List[Work], depth: int) -> None:
+        """
+        Write the unvisited works (within budget) and queue them for expansion.
+        """
+        accepted: List[Work] = []
+        for w in works:
+            if w.id in self.visited:
+                continue
+            if self.max_nodes is not None and self.stats.nodes_written >= self.max_nodes:
+                self.stats.stopped_by = "max_nodes"
+                break
+            n_edges = len(w.references or [])
+            if self.max_edges is not None and self.stats.edges_written + n_edges > self.max_edges:
+                self.stats.stopped_by = "max_edges"
+                break
+            self.visited.add(w.id)
+            self.stats.nodes_written += 1
+            self.stats.edges_written += n_edges
+            self.stats.max_depth = max(self.stats.max_depth, depth)
+            accepted.append(w)
+            if depth < self.max_hops:
+                heapq.heappush(self._frontier, _FrontierEntry(self._priority(w, depth), next(self._seq), depth, w))
+        if accepted:
+            self.talker.write_work_nodes_edges(accepted)
+
+    def _priority(self, work: Work, depth: int) -> Tuple[int, ...]:
+        cited = -(work.cited_by_count or 0)
+        return (cited, depth) if self.priority == "cited_by_count" else (depth, cited)
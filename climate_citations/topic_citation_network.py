@@ -1,15 +1,73 @@
-from dataclasses import dataclass
-from typing import Optional, Set
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 import networkx as nx
+from . import codec
+from .csr import CSRAdjacency, build_csr
 from .openalex_topic_client import OpenAlexTopicClient
 
+
+# OpenAlex fields read by _node_attrs and _partial_network
+NETWORK_SELECT_FIELDS = ["id", "title", "publication_year", "doi", "referenced_works"]
+
+
+def _node_attrs(work: Dict[str, Any]) -> Dict[str, Any]:
+    return {"title": work.get("title"), "year": work.get("publication_year"), "doi": work.get("doi")}
+
+
+def _partial_network(records: Iterable[Dict[str, Any]]) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, str]]]:
+    """
+    Process-pool worker: (node_id, attrs) for each work and the deduplicated edges of a chunk of records.
+    """
+    nodes: List[Tuple[str, Dict[str, Any]]] = []
+    edges: Dict[Tuple[str, str], None] = {}
+    for work in records:
+        work_id = work.get("id")
+        if not work_id:
+            continue
+        nodes.append((work_id, _node_attrs(work)))
+        for cited_id in work.get("referenced_works") or []:
+            edges[(work_id, cited_id)] = None
+    return nodes, list(edges)
+
+
 @dataclass
 class TopicCitationNetworkBuilder:
     client: OpenAlexTopicClient
     max_works: Optional[int] = 1000
     per_page: int = 200
+    # select= projection of the works iteration; empty for full work records
+    select: Sequence[str] = field(default_factory=lambda: list(NETWORK_SELECT_FIELDS))
+
+    @staticmethod
+    def _year_filter(year_from: Optional[int], year_to: Optional[int]) -> Optional[str]:
+        filters = []
+        if year_from and year_to:
+            filters.append(f"publication_year:{year_from}-{year_to}")
+        elif year_from:
+            filters.append(f"publication_year:>{year_from-1}")
+        elif year_to:
+            filters.append(f"publication_year:<{year_to+1}")
+        return ",".join(filters) if filters else None
 
-    def build_network_for_topic(self, topic_id_or_name: str, topic_search: bool = False, year_from: Optional[int] = None, year_to: Optional[int] = None) -> nx.DiGraph:
+    @staticmethod
+    def _add_work(G: nx.DiGraph, work: Dict[str, Any]) -> None:
+        # add_edges_from adds missing cited nodes and ignores repeated edges itself
+        work_id = work.get("id")
+        if not work_id:
+            return
+        G.add_node(work_id, **_node_attrs(work))
+        G.add_edges_from((work_id, cited_id) for cited_id in work.get("referenced_works") or [])
+
+    def build_network_for_topic(self, topic_id_or_name: str, topic_search: bool = False, year_from: Optional[int] = None, year_to: Optional[int] = None, workers: int = 1, as_csr: bool = False) -> Union[nx.DiGraph, CSRAdjacency]:
+        """
+        Build the citation graph of a topic's works.
+        - workers > 1: split the downloaded work records across a process pool; each worker
+          returns deduplicated node attributes and edges, merged with bulk add_nodes_from /
+          add_edges_from calls.
+        - as_csr: skip NetworkX and return a CSRAdjacency.
+        """
         if topic_search:
             results = self.client.search_topics(topic_id_or_name, per_page=10)
             if not results:
@@ -18,35 +76,70 @@ class TopicCitationNetworkBuilder:
         else:
             topic_id = topic_id_or_name
 
-        filters = []
-        if year_from and year_to:
-            filters.append(f"publication_year:{year_from}-{year_to}")
-        elif year_from:
-            filters.append(f"publication_year:>{year_from-1}")
-        elif year_to:
-            filters.append(f"publication_year:<{year_to+1}")
-        filter_q = ",".join(filters) if filters else None
+        filter_q = self._year_filter(year_from, year_to)
+
+        works = self.client.iter_topic_works(topic_id, per_page=self.per_page, max_results=self.max_works, filter_q=filter_q, select=self.select)
+        if workers <= 1 and not as_csr:
+            G = nx.DiGraph()
+            for work in works:
+                self._add_work(G, work)
+            return G
+
+        if workers > 1:
+            records = list(works)
+            chunk_size = max(1, -(-len(records) // (workers * 4)))
+            chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(_partial_network, chunks))
+        else:
+            partials = [_partial_network(works)]
 
+        nodes = [n for p in partials for n in p[0]]
+        edges = [e for p in partials for e in p[1]]
+        if as_csr:
+            return build_csr(edges, nodes)
         G = nx.DiGraph()
-        seen_nodes: Set[str] = set()
-
-        for work in self.client.iter_topic_works(topic_id, per_page=self.per_page, max_results=self.max_works, filter_q=filter_q):
-            work_id = work.get("id")
-            if not work_id:
-                continue
-            if work_id not in seen_nodes:
-                G.add_node(work_id, title=work.get("title"), year=work.get("publication_year"), doi=work.get("doi"))
-                seen_nodes.add(work_id)
-
-            referenced = work.get("referenced_works") or []
-            for cited_id in referenced:
-                if cited_id not in seen_nodes:
-                    G.add_node(cited_id)
-                    seen_nodes.add(cited_id)
-                G.add_edge(work_id, cited_id)
+        G.add_nodes_from(nodes)
+        G.add_edges_from(edges)
+        return G
+
+    async def build_network_for_topic_async(self, topic_id_or_name: str, topic_search: bool = False, year_from: Optional[int] = None, year_to: Optional[int] = None) -> nx.DiGraph:
+        """
+        Same as build_network_for_topic, for a client with coroutine methods such as
+        AsyncOpenAlexTopicClient.
+        """
+        if topic_search:
+            results = await self.client.search_topics(topic_id_or_name, per_page=10)
+            if not results:
+                raise ValueError(f"No topics found for '{topic_id_or_name}'")
+            topic_id = results[0].get("id")
+        else:
+            topic_id = topic_id_or_name
+
+        filter_q = self._year_filter(year_from, year_to)
+
+        G = nx.DiGraph()
+        async for work in self.client.iter_topic_works(topic_id, per_page=self.per_page, max_results=self.max_works, filter_q=filter_q, select=self.select):
+            self._add_work(G, work)
 
         return G
 
+    async def build_networks_for_topics_async(self, topic_ids: List[str], year_from: Optional[int] = None, year_to: Optional[int] = None) -> Dict[str, nx.DiGraph]:
+        """
+        Harvest several topics concurrently through one async client (and its shared rate limiter).
+        """
+        graphs = await asyncio.gather(*(self.build_network_for_topic_async(t, year_from=year_from, year_to=year_to) for t in topic_ids))
+        return dict(zip(topic_ids, graphs))
+
+    @staticmethod
+    def save_graph_from_files(node_file: str, edge_file: str, path: str, fmt: str = "gexf", compression: Optional[str] = "infer") -> Any:
+        """
+        Export the graph held in NetworkFileTalker node and edge files without building a
+        DiGraph; see graph_export.export_graph. Returns its ExportStats.
+        """
+        from .graph_export import export_graph
+        return export_graph(node_file, edge_file, path, fmt=fmt, compression=compression)
+
     def save_graph(self, G: nx.DiGraph, path: str, fmt: str = "gexf") -> None:
         fmt = fmt.lower()
         if fmt == "gexf":
@@ -58,8 +151,7 @@ class TopicCitationNetworkBuilder:
         elif fmt == "json":
             from networkx.readwrite import json_graph
             data = json_graph.node_link_data(G)
-            import json as _json
             with open(path, "w", encoding="utf-8") as fh:
-                fh.write(_json.dumps(data, indent=2))
+                fh.write(codec.dumps_pretty(data))
         else:
-            raise ValueError(f"Unsupported format: {fmt}")
\ No newline at end of file
+            raise ValueError(f"Unsupported format: {fmt}")
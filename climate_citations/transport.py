@@ -0,0 +1,184 @@
+"""
+HTTP transport shared by OpenAlexTopicClient and openalex_citation_network.py: one
+keep-alive connection pool, compressed responses and a single RetryPolicy for every
+request, and counters of how many requests reused an open connection.
+
+The default backend is a requests.Session whose adapter pool holds pool_size
+connections per host (size it to the number of threads issuing requests; with
+pool_block, extra threads wait for a free connection instead of opening throwaway
+ones). http2=True switches to an httpx.Client with HTTP/2 (pip install "httpx[http2]").
+"""
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+from . import codec
+from .instrumentation import METRICS
+from .rate_limiter import RateLimiter
+from .retry_policy import RetryPolicy
+
+try:
+    import httpx
+except ImportError:  # optional dependency
+    httpx = None
+
+
+def _require_httpx() -> None:
+    if httpx is None:
+        raise ImportError("HTTP/2 transport requires httpx: pip install 'httpx[http2]'")
+
+
+def accept_encoding(compression: bool = True) -> str:
+    """
+    Accept-Encoding offering every content coding urllib3 can decode here
+    (gzip and deflate, plus br / zstd when brotli / zstandard are installed).
+    """
+    return make_headers(accept_encoding=True)["accept-encoding"] if compression else "identity"
+
+
+@dataclass
+class TransportStats:
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    bytes_received: int = 0
+    # connections opened by the pool; requests - new_connections reused one
+    new_connections: int = 0
+
+    def reuse_rate(self) -> float:
+        """
+        Fraction of requests sent over an already open connection.
+        """
+        if not self.requests:
+            return 0.0
+        return max(self.requests - self.new_connections, 0) / self.requests
+
+    def __str__(self) -> str:
+        return (f"{self.requests} requests ({self.retries} retries, {self.rate_limited} rate limited), "
+                f"{self.bytes_received / 1e6:.1f} MB received, {self.new_connections} connections opened, "
+                f"{self.reuse_rate():.0%} connection reuse")
+
+
+class Transport:
+    """
+    GET requests with connection pooling, compression and retries.
+    `session` may be any object with a requests-style get(url, params=, timeout=)
+    (the pool settings then do not apply).
+    """
+    def __init__(self, pool_size: int = 10, http2: bool = False, compression: bool = True, timeout: float = 30.0, retry_policy: Optional[RetryPolicy] = None, session: Optional[Any] = None, pool_block: bool = True):
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.http2 = http2
+        # one transport serves many threads; guards _stats and _streams
+        self._lock = threading.Lock()
+        self._stats = TransportStats()
+        self._streams: set = set()
+        headers = {"Accept-Encoding": accept_encoding(compression), "Connection": "keep-alive"}
+        if session is not None:
+            self.session = session
+        elif http2:
+            _require_httpx()
+            limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            self.session = httpx.Client(http2=True, limits=limits, timeout=timeout, headers=headers)
+        else:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=pool_block)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+            self.session.headers.update(headers)
+
+    @property
+    def stats(self) -> TransportStats:
+        """
+        A consistent snapshot of the counters.
+        """
+        with self._lock:
+            self._stats.new_connections = self._count_connections()
+            return replace(self._stats)
+
+    def _count_connections(self) -> int:
+        if self._streams:
+            return len(self._streams)
+        adapters = getattr(self.session, "adapters", None) or {}
+        opened = 0
+        for adapter in set(adapters.values()):
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in pools.keys():
+                opened += getattr(pools[key], "num_connections", 0)
+        return opened
+
+    def send(self, url: str, params: Optional[Dict] = None) -> Any:
+        """
+        One GET, without retries.
+        """
+        if self.http2:
+            resp = self.session.get(url, params=params)
+            # one network stream per connection (HTTP/2 multiplexes requests over it)
+            stream = resp.extensions.get("network_stream")
+            if stream is not None:
+                with self._lock:
+                    self._streams.add(id(stream))
+        else:
+            resp = self.session.get(url, params=params, timeout=self.timeout)
+        with self._lock:
+            self._stats.requests += 1
+            self._stats.bytes_received += len(resp.content)
+        return resp
+
+    def request(self, url: str, params: Optional[Dict] = None, rate_limiter: Optional[RateLimiter] = None) -> Any:
+        """
+        GET url, retrying the statuses of retry_policy after its backoff delay. Each
+        attempt first takes a token from rate_limiter; a 429 also penalizes it.
+        Returns the last response, which the caller should check with raise_for_status().
+        """
+        attempt = 0
+        while True:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            if METRICS.enabled:
+                start = time.perf_counter()
+                resp = self.send(url, params)
+                METRICS.observe("http.request", time.perf_counter() - start)
+                METRICS.incr("http.requests")
+                METRICS.incr("http.bytes_received", len(resp.content))
+            else:
+                resp = self.send(url, params)
+            if not self.retry_policy.should_retry(resp.status_code, attempt):
+                return resp
+            delay = self.retry_policy.delay(attempt, resp.headers.get("Retry-After"))
+            with self._lock:
+                if resp.status_code == 429:
+                    self._stats.rate_limited += 1
+                self._stats.retries += 1
+            if resp.status_code == 429 and rate_limiter is not None:
+                rate_limiter.penalize(delay)
+            if METRICS.enabled:
+                METRICS.incr("http.429" if resp.status_code == 429 else "http.5xx")
+                METRICS.incr("http.retries")
+                start = time.perf_counter()
+                time.sleep(delay)
+                METRICS.observe("http.backoff", time.perf_counter() - start)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def get_json(self, url: str, params: Optional[Dict] = None, rate_limiter: Optional[RateLimiter] = None) -> Any:
+        resp = self.request(url, params, rate_limiter)
+        resp.raise_for_status()
+        return codec.loads(resp.content)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
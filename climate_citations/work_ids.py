@@ -0,0 +1,38 @@
+"""
+Helpers for OpenAlex work identifiers, which appear both as full URLs
+("https://openalex.org/W123") and as short keys ("W123").
+"""
+
+OPENALEX_URL_PREFIX = "https://openalex.org/"
+
+
+def short_id(openalex_id: str) -> str:
+    """
+    Return the short key ("W123") for a full OpenAlex URL or a short key.
+    """
+    return str(openalex_id).rstrip("/").rsplit("/", 1)[-1]
+
+
+def full_id(openalex_id: str) -> str:
+    """
+    Return the full OpenAlex URL for a short key or a full URL.
+    """
+    return f"{OPENALEX_URL_PREFIX}{short_id(openalex_id)}"
+
+
+def work_key(openalex_id: str) -> int:
+    """
+    Return the integer key of a work ID ("W123" or its URL -> 123).
+    Raises ValueError for IDs that are not OpenAlex work IDs.
+    """
+    key = short_id(openalex_id)
+    if key[:1] != "W" or not key[1:].isdigit():
+        raise ValueError(f"Not an OpenAlex work ID: {openalex_id!r}")
+    return int(key[1:])
+
+
+def work_id_from_key(key: int) -> str:
+    """
+    Return the full OpenAlex URL of a work key (123 -> "https://openalex.org/W123").
+    """
+    return f"{OPENALEX_URL_PREFIX}W{key}"
@@ -15,20 +15,23 @@ import argparse
 import csv
 import sys
 import time
-import requests
-from urllib.parse import urlencode
+
+from climate_citations.enrichment import WorkEnricher
+from climate_citations.retry_policy import RetryPolicy
+from climate_citations.transport import Transport
 
 OPENALEX_BASE = "https://api.openalex.org"
 WORKS_ENDPOINT = f"{OPENALEX_BASE}/works"
 CONCEPTS_ENDPOINT = f"{OPENALEX_BASE}/concepts"
 
-def lookup_concept_id(term, mailto=None):
+# every request of a run shares one keep-alive connection pool and retry policy
+TRANSPORT = Transport(pool_size=2, timeout=60, retry_policy=RetryPolicy())
+
+def lookup_concept_id(term, mailto=None, transport=None):
     params = {"search": term}
     if mailto:
         params["mailto"] = mailto
-    r = requests.get(CONCEPTS_ENDPOINT, params=params, timeout=40)
-    r.raise_for_status()
-    js = r.json()
+    js = (transport or TRANSPORT).get_json(CONCEPTS_ENDPOINT, params=params)
     results = js.get("results", [])
     if not results:
         raise ValueError(f"No concept results for: {term}")
@@ -36,32 +39,50 @@ def lookup_concept_id(term, mailto=None):
     best = results[0]
     return best["id"].split("/")[-1], best["display_name"]
 
-def fetch_works_for_concept(concept_id, n=200, mailto=None, per_page=200):
+# fields read by to_node_row; used as the select= projection when enriching references
+NODE_ROW_FIELDS = ["id", "display_name", "doi", "publication_year", "primary_location", "cited_by_count"]
+# seed works also need their references for the edges
+SEED_WORK_FIELDS = NODE_ROW_FIELDS + ["referenced_works"]
+
+def fetch_works_for_concept(concept_id, n=200, mailto=None, per_page=200, select=None, transport=None):
+    # cursor paging: page=N stops at 10,000 results and OpenAlex sends no next_page link
     params = {
         "filter": f"concepts.id:{concept_id}",
         "per_page": min(per_page, 200),
         "sort": "cited_by_count:desc",
+        "cursor": "*",
     }
+    # select=None: SEED_WORK_FIELDS; an empty select fetches full work objects
+    select = SEED_WORK_FIELDS if select is None else select
+    if select:
+        params["select"] = ",".join(select)
     if mailto:
         params["mailto"] = mailto
+    transport = transport or TRANSPORT
     works = []
-    url = WORKS_ENDPOINT + "?" + urlencode(params)
-    while len(works) < n and url:
-        r = requests.get(url, timeout=60)
-        r.raise_for_status()
-        js = r.json()
-        works.extend(js.get("results", []))
-        url = js.get("meta", {}).get("next_page")
+    while len(works) < n and params["cursor"]:
+        js = transport.get_json(WORKS_ENDPOINT, params=params)
+        results = js.get("results", [])
+        works.extend(results)
+        params["cursor"] = js.get("meta", {}).get("next_cursor") if results else None
         time.sleep(0.5)  # polite
     return works[:n]
 
+def openalex_get(path, params=None, mailto=None, transport=None):
+    params = dict(params or {})
+    if mailto:
+        params["mailto"] = mailto
+    return (transport or TRANSPORT).get_json(OPENALEX_BASE + path, params=params)
+
 def to_node_row(w):
+    # host_venue was replaced by primary_location.source in the OpenAlex schema
+    venue = w.get("host_venue") or (w.get("primary_location") or {}).get("source") or {}
     return [
         w.get("id",""),
         w.get("display_name",""),
         (w.get("doi","") or ""),
         (w.get("publication_year","") or ""),
-        (w.get("host_venue",{}).get("display_name","") or ""),
+        (venue.get("display_name","") or ""),
         # (w.get("authorships",[{}])[0].get("institutions",[{}])[0].get("display_name","") or ""),
         (w.get("cited_by_count",0) or 0)
     ]
@@ -74,19 +95,27 @@ def main():
     ap.add_argument("--mailto", default=None, help="Your email for OpenAlex polite usage")
     ap.add_argument("--expand-refs", action="store_true",
                     help="Also fetch metadata for referenced works to enrich nodes")
+    ap.add_argument("--batch-size", type=int, default=50,
+                    help="Referenced works resolved per request with --expand-refs (max 100)")
+    ap.add_argument("--select", default=None,
+                    help="Comma-separated OpenAlex fields to fetch for seed works ('' for full records)")
+    ap.add_argument("--http2", action="store_true",
+                    help="Use HTTP/2 (requires httpx[http2])")
     ap.add_argument("--out-nodes", default="nodes.csv")
     ap.add_argument("--out-edges", default="edges.csv")
     args = ap.parse_args()
+    transport = Transport(pool_size=2, timeout=60, http2=True) if args.http2 else TRANSPORT
 
     try:
-        concept_id, concept_name = lookup_concept_id(args.concept, args.mailto)
+        concept_id, concept_name = lookup_concept_id(args.concept, args.mailto, transport)
     except Exception as e:
         print(f"Failed to find concept '{args.concept}': {e}", file=sys.stderr)
         sys.exit(1)
 
     print(f"Using concept: {concept_name} (ID: {concept_id})")
 
-    works = fetch_works_for_concept(concept_id, n=args.n, mailto=args.mailto)
+    select = None if args.select is None else [f for f in args.select.split(",") if f]
+    works = fetch_works_for_concept(concept_id, n=args.n, mailto=args.mailto, select=select, transport=transport)
     print(f"Fetched {len(works)} works")
 
     # Build node and edge sets
@@ -98,17 +127,16 @@ def main():
         node_map[wid] = w
         for tgt in (w.get("referenced_works") or []):
             edges.append([wid, tgt])
-            if args.expand_refs and tgt not in node_map:
-                # Attempt to fetch minimal metadata for referenced work
-                params = {}
-                if args.mailto:
-                    params["mailto"] = args.mailto
-                rw = requests.get(tgt, params=params, timeout=30)
-                if rw.status_code == 200:
-                    node_map[tgt] = rw.json()
-                else:
-                    node_map.setdefault(tgt, {"id": tgt, "display_name": "", "doi": "", "publication_year": ""})
-                time.sleep(0.25)
+
+    if args.expand_refs:
+        # Resolve the distinct unknown referenced works in batches rather than one GET each
+        unknown = list(dict.fromkeys(t for _, t in edges if t not in node_map))
+        enricher = WorkEnricher(lambda path, params=None: openalex_get(path, params, args.mailto, transport),
+                                batch_size=args.batch_size, select=NODE_ROW_FIELDS, pause=0.25)
+        found = enricher.resolve(unknown)
+        for tgt in unknown:
+            node_map[tgt] = found.get(tgt) or {"id": tgt, "display_name": "", "doi": "", "publication_year": ""}
+        print(f"Resolved {len(found)} of {len(unknown)} referenced works in {enricher.requests_made} requests")
 
     # Write CSVs
     with open(args.out_nodes, "w", newline="", encoding="utf-8") as f:
@@ -124,6 +152,7 @@ def main():
             ecsv.writerow([s, t])
 
     print(f"Wrote {args.out_nodes} and {args.out_edges}")
+    print(f"HTTP: {transport.stats}")
 
 if __name__ == "__main__":
     main()
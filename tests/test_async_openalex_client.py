@@ -0,0 +1,94 @@
+import asyncio
+import json
+import unittest
+
+from climate_citations.async_openalex_client import AsyncOpenAlexTopicClient
+from climate_citations.retry_policy import RetryPolicy, parse_retry_after
+from climate_citations.topic_citation_network import TopicCitationNetworkBuilder
+
+
+class FakeResponse:
+    def __init__(self, status, payload=None, headers=None):
+        self.status = status
+        self.payload = payload
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    async def json(self):
+        return self.payload
+
+    async def read(self):
+        return json.dumps(self.payload).encode("utf-8")
+
+
+class FakeSession:
+    """
+    Stands in for aiohttp.ClientSession: serves queued responses and records requests.
+    """
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, params=None):
+        self.requests.append((url, params))
+        return self.responses.pop(0)
+
+
+class TestAsyncOpenAlexTopicClient(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_retries=3, backoff_base=0.001, jitter=0.0)
+        print(f"Running test: {self._testMethodName}")
+
+    def test_retries_429_honoring_retry_after(self):
+        session = FakeSession([
+            FakeResponse(429, headers={"Retry-After": "0"}),
+            FakeResponse(503),
+            FakeResponse(200, {"id": "https://openalex.org/T10017"}),
+        ])
+        client = AsyncOpenAlexTopicClient(mailto="someone@example.org", session=session, requests_per_second=1000, retry_policy=self.policy)
+        topic = asyncio.run(client.get_topic("T10017"))
+        self.assertEqual(topic["id"], "https://openalex.org/T10017")
+        self.assertEqual(len(session.requests), 3)
+        self.assertEqual(session.requests[0][1]["mailto"], "someone@example.org")
+
+    def test_gives_up_after_max_retries(self):
+        session = FakeSession([FakeResponse(429, headers={"Retry-After": "0"}) for _ in range(4)])
+        client = AsyncOpenAlexTopicClient(session=session, requests_per_second=1000, retry_policy=self.policy)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(client.get_work("W1"))
+        self.assertEqual(len(session.requests), 4)
+
+    def test_builder_uses_async_client(self):
+        session = FakeSession([
+            FakeResponse(200, {"meta": {"next_cursor": "c1"}, "results": [
+                {"id": "https://openalex.org/W1", "title": "one", "referenced_works": ["https://openalex.org/W2"]}]}),
+            FakeResponse(200, {"meta": {"next_cursor": "c2"}, "results": [
+                {"id": "https://openalex.org/W3", "title": "three", "referenced_works": ["https://openalex.org/W1"]}]}),
+            FakeResponse(200, {"meta": {"next_cursor": None}, "results": []}),
+        ])
+        client = AsyncOpenAlexTopicClient(session=session, requests_per_second=1000, retry_policy=self.policy)
+        builder = TopicCitationNetworkBuilder(client=client, max_works=10)
+        G = asyncio.run(builder.build_network_for_topic_async("T10017"))
+        self.assertEqual(G.number_of_nodes(), 3)
+        self.assertEqual(G.number_of_edges(), 2)
+        self.assertEqual(G.nodes["https://openalex.org/W3"]["title"], "three")
+        self.assertEqual(session.requests[1][1]["cursor"], "c1")
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import csv
+import os
+import tempfile
+import unittest
+from pytest import MonkeyPatch
+
+from climate_citations.batch_harvester import BatchHarvester
+from climate_citations.dedup_index import SqliteIdIndex
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient
+
+# topic -> work keys; T2 overlaps T1 on W3 and W4
+TOPICS = {"T1": [1, 2, 3, 4, 5], "T2": [3, 4, 6, 7], "T3": [8]}
+
+
+def work(i):
+    return {"id": f"https://openalex.org/W{i}", "title": f"work {i}", "referenced_works": ["https://openalex.org/W1"]}
+
+
+class TestBatchHarvester(unittest.TestCase):
+
+    def setUp(self):
+        self.mp = MonkeyPatch()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.nodes = os.path.join(self.tmp.name, "work_nodes.json")
+        self.membership = os.path.join(self.tmp.name, "work_topics.csv")
+        talker = NetworkFileTalker(json_out_file=self.nodes, reference_edge_file=os.path.join(self.tmp.name, "edges.csv"))
+        self.client = OpenAlexClient(talker=talker)
+        self.requests = []
+
+        def fake_get(client, path, params=None):
+            self.requests.append((path, params))
+            if path == "/topics":
+                return {"results": [{"id": f"https://openalex.org/{t}"} for t in TOPICS]}
+            keys = TOPICS[path.split("/")[2]]
+            start = 0 if params["cursor"] == "*" else int(params["cursor"])
+            end = start + params["per-page"]
+            next_cursor = str(end) if end < len(keys) else None
+            return {"meta": {"count": len(keys), "next_cursor": next_cursor}, "results": [work(k) for k in keys[start:end]]}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.mp.undo()
+        self.tmp.cleanup()
+
+    def harvester(self, **kwargs):
+        return BatchHarvester(self.client, workers=2, per_page=2, membership_file=self.membership, progress=lambda p: None, **kwargs)
+
+    def test_overlapping_topics_are_written_once(self):
+        harvester = self.harvester()
+        stats = harvester.harvest(["T1", "T2", "https://openalex.org/T3"])
+        self.assertEqual((stats.records_fetched, stats.works_written, stats.duplicates_skipped), (10, 8, 2))
+        ids = sorted(int(r["id"].rsplit("W", 1)[-1]) for r in self.client.talker.read_file(self.nodes))
+        self.assertEqual(ids, list(range(1, 9)))
+        with open(self.membership, "r", newline="", encoding="utf-8") as fh:
+            rows = {(w.rsplit("/", 1)[-1], t) for w, t in csv.reader(fh)}
+        self.assertIn(("W3", "T1"), rows)
+        self.assertIn(("W3", "T2"), rows)
+        self.assertEqual(len(rows), 10)
+        self.assertTrue(all(p.done and p.fetched == len(TOPICS[t]) for t, p in harvester.topics.items()))
+        self.assertIn("select", self.requests[0][1])
+
+    def test_search_query_and_persistent_index(self):
+        index = SqliteIdIndex(os.path.join(self.tmp.name, "index.sqlite"), "works")
+        first = self.harvester(index=index).harvest(query="climate", max_items_per_topic=3)
+        self.assertEqual(first.topics, 3)
+        self.assertEqual(first.records_fetched, 7)
+        # a new run sharing the index writes nothing it has seen before
+        second = self.harvester(index=index).harvest(["T1"])
+        self.assertEqual((second.works_written, second.duplicates_skipped), (1, 4))
+        index.close()
+
+    def test_failed_write_is_harvested_again(self):
+        index = SqliteIdIndex(os.path.join(self.tmp.name, "index.sqlite"), "works")
+        talker = self.client.talker
+        original = talker.write_work_nodes_edges
+
+        def failing_write(works):
+            raise OSError("disk full")
+        self.mp.setattr(talker, "write_work_nodes_edges", failing_write)
+        with self.assertRaises(OSError):
+            self.harvester(index=index).harvest(["T1"])
+        self.assertEqual(len(index), 0)
+
+        self.mp.setattr(talker, "write_work_nodes_edges", original)
+        stats = self.harvester(index=index).harvest(["T1"])
+        self.assertEqual((stats.works_written, stats.duplicates_skipped), (5, 0))
+        ids = sorted(int(r["id"].rsplit("W", 1)[-1]) for r in talker.read_file(self.nodes))
+        self.assertEqual(ids, [1, 2, 3, 4, 5])
+        index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from urllib.request import urlopen
+from pytest import MonkeyPatch
+
+from climate_citations.citation_index import CitationIndex, make_server
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient, Work
+
+W = "https://openalex.org/W"
+# W1 -> W2, W3; W2 -> W3; W4 -> W3, W5; W5 is cited but was not harvested
+WORKS = [
+    Work(id=f"{W}1", title="one", references=[f"{W}2", f"{W}3"], publication_year=2001, cited_by_count=5),
+    Work(id=f"{W}2", title="two", references=[f"{W}3"], publication_year=2002, cited_by_count=50),
+    Work(id=f"{W}3", title="three", references=[], publication_year=2003, cited_by_count=500),
+    Work(id=f"{W}4", title="four", references=[f"{W}3", f"{W}5"], publication_year=2004),
+]
+
+
+class TestCitationIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        talker = NetworkFileTalker(json_out_file=os.path.join(self.tmp.name, "nodes.json"), reference_edge_file=os.path.join(self.tmp.name, "edges.csv"))
+        talker.write_work_nodes_edges(WORKS)
+        self.index = CitationIndex(os.path.join(self.tmp.name, "index.sqlite"))
+        self.loaded = self.index.load(talker.json_out_file, talker.reference_edge_file)
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def test_adjacency_queries(self):
+        self.assertEqual(self.loaded, (4, 5))
+        self.assertEqual((len(self.index), self.index.num_edges()), (4, 5))
+        self.assertEqual(self.index.references("W1"), [f"{W}2", f"{W}3"])
+        self.assertEqual(self.index.cited_by(f"{W}3"), [f"{W}1", f"{W}2", f"{W}4"])
+        self.assertEqual(self.index.degree("W3"), {"in": 3, "out": 0})
+        self.assertEqual(self.index.references_many(["W1", "W3", "X9"]), {"W1": [f"{W}2", f"{W}3"], "W3": [], "X9": []})
+        self.assertEqual(self.index.get_work("W1"), WORKS[0])
+        self.assertIsNone(self.index.get_work("W5"))
+        self.assertIn("W4", self.index)
+        # loading again adds nothing new
+        self.index.load(edge_file=os.path.join(self.tmp.name, "edges.csv"))
+        self.assertEqual(self.index.num_edges(), 5)
+
+    def test_expand_and_top_cited(self):
+        self.assertEqual(self.index.expand(["W2"], k=1, direction="references"), {f"{W}2": 0, f"{W}3": 1})
+        self.assertEqual(self.index.expand(["W2"], k=2), {f"{W}2": 0, f"{W}1": 1, f"{W}3": 1, f"{W}4": 2})
+        self.assertEqual(len(self.index.expand(["W2"], k=3, max_nodes=2)), 2)
+        self.assertEqual(self.index.top_cited(2), [(f"{W}3", 3), (f"{W}2", 1)])
+        self.assertEqual(self.index.top_cited(1, by="openalex", max_year=2002), [(f"{W}2", 50)])
+        with self.assertRaises(ValueError):
+            self.index.expand(["W1"], direction="sideways")
+
+    def test_http_endpoint(self):
+        server = make_server(self.index, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with urlopen(f"{base}/works/W4") as resp:
+                self.assertEqual(json.loads(resp.read())["references"], [f"{W}3", f"{W}5"])
+            with urlopen(f"{base}/works/W3/cited_by") as resp:
+                self.assertEqual(len(json.loads(resp.read())), 3)
+            with urlopen(f"{base}/expand?ids=W1&k=1&direction=references") as resp:
+                self.assertEqual(json.loads(resp.read()), {f"{W}1": 0, f"{W}2": 1, f"{W}3": 1})
+            with urlopen(f"{base}/top_cited?n=1") as resp:
+                self.assertEqual(json.loads(resp.read()), [[f"{W}3", 3]])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_get_work_consults_the_index(self):
+        mp = MonkeyPatch()
+        requested = []
+        mp.setattr(OpenAlexClient, "_get", lambda client, path, params=None: requested.append(path) or {"id": f"{W}5"})
+        try:
+            client = OpenAlexClient(citation_index=self.index)
+            self.assertEqual(client.get_work("W2").title, "two")
+            self.assertEqual(client.get_work("W5").id, f"{W}5")
+            self.assertEqual(requested, ["/works/W5"])
+        finally:
+            mp.undo()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+
+from climate_citations import citation_matrix
+from climate_citations.citation_matrix import CitationMatrix
+from climate_citations.edge_store import BinaryEdgeSink
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import Work
+
+# W1 and W2 both cite W3 and W4; W5 cites W3
+EDGES = [("W1", "W3"), ("W1", "W4"), ("W2", "W3"), ("W2", "W4"), ("W5", "W3"), ("W1", "W3")]
+
+
+@unittest.skipIf(citation_matrix.sp is None, "numpy and scipy are not installed")
+class TestCitationMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.m = CitationMatrix.from_edges(EDGES)
+        print(f"Running test: {self._testMethodName}")
+
+    def test_degrees_and_top_cited(self):
+        self.assertEqual(self.m.num_edges, 5)  # duplicate edge collapsed
+        self.assertEqual(int(self.m.in_degree()[self.m.index_of("W3")]), 3)
+        self.assertEqual(int(self.m.out_degree()[self.m.index_of("W1")]), 2)
+        self.assertEqual(self.m.top_k_cited(2), [("W3", 3), ("W4", 2)])
+
+    def test_cocitation_and_coupling(self):
+        self.assertEqual(self.m.cocitation_count("W3", "W4"), 2)
+        self.assertEqual(self.m.cocitation()[self.m.index_of("W3"), self.m.index_of("W4")], 2)
+        self.assertEqual(self.m.coupling_count("W1", "W2"), 2)
+        self.assertEqual(self.m.coupling()[self.m.index_of("W1"), self.m.index_of("W5")], 1)
+        self.assertEqual(self.m.coupling()[self.m.index_of("W1"), self.m.index_of("W1")], 0)
+
+    def test_pagerank_matches_networkx(self):
+        G = self.m.to_networkx()
+        expected = nx.pagerank(G)
+        for node, value in self.m.pagerank().items():
+            self.assertAlmostEqual(value, expected[node], places=6)
+        self.assertEqual(set(CitationMatrix.from_networkx(G).to_networkx().edges), set(G.edges))
+
+    def test_from_edge_files(self):
+        works = [Work(id=f"https://openalex.org/{s}", references=[]) for s in ("W1", "W2", "W5")]
+        for w in works:
+            w.references = [f"https://openalex.org/{t}" for s, t in dict.fromkeys(EDGES) if w.id.endswith(s)]
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "edges.csv")
+            NetworkFileTalker(json_out_file=os.path.join(tmp, "n.json"), reference_edge_file=csv_path).write_work_nodes_edges(works)
+            store = os.path.join(tmp, "store")
+            BinaryEdgeSink(store).write_work_edges(works)
+            for m in (CitationMatrix.from_edge_file(csv_path), CitationMatrix.from_edge_store(store)):
+                self.assertEqual(m.num_edges, 5)
+                self.assertEqual(m.top_k_cited(1), [("https://openalex.org/W3", 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
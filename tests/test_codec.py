@@ -0,0 +1,91 @@
+import math
+import os
+import tempfile
+import unittest
+
+from climate_citations import codec
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient, Work
+
+FLOATS = {"id": "W2", "score": 1e16, "ratio": 0.1, "missing": float("nan")}
+
+
+class TestCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.backend, self.encoder = codec.backend, codec.encoder
+        sample_path = os.path.join(os.path.dirname(__file__), "sample_works_list.json")
+        client = OpenAlexClient()
+        self.works = [client.build_work(r) for r in client.talker.read_file(sample_path, key="results")]
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        codec.set_backend(self.backend, encode=self.encoder != "json")
+        self.tmp.cleanup()
+
+    def write_with(self, backend):
+        codec.set_backend(backend)
+        path = os.path.join(self.tmp.name, f"{backend}.json")
+        if os.path.exists(path):
+            os.remove(path)
+        NetworkFileTalker(json_out_file=path).write_list(self.works + [{"id": "W1", "title": "Ünïcode – \"quoted\"\n", "year": {2013: None}}, FLOATS])
+        with open(path, "rb") as fh:
+            return fh.read()
+
+    def test_backends_write_identical_ndjson(self):
+        expected = self.write_with("json")
+        # the standard library's default format, as written before the codec existed
+        self.assertTrue(expected.startswith(b'{"id": "https://openalex.org/W4249751050", "title": '))
+        self.assertTrue(expected.endswith(b'{"id": "W2", "score": 1e+16, "ratio": 0.1, "missing": NaN}\n'))
+        for backend in codec.available_backends():
+            self.assertEqual(self.write_with(backend), expected, backend)
+
+    def test_backends_read_floats_and_nan(self):
+        line = codec.dumps(FLOATS)
+        for backend in codec.available_backends():
+            codec.set_backend(backend)
+            record = codec.loads(line)
+            self.assertEqual((record["score"], record["ratio"]), (1e16, 0.1), backend)
+            self.assertTrue(math.isnan(record["missing"]), backend)
+
+    @unittest.skipIf(codec.orjson is None, "orjson is not installed")
+    def test_fast_encoding_is_opt_in(self):
+        codec.set_backend("orjson", encode=True)
+        self.assertEqual(codec.dumps({"id": "W1", "n": 1e16}), '{"id":"W1","n":1e16}')
+        codec.set_backend("orjson")
+        self.assertEqual(codec.dumps({"id": "W1", "n": 1e16}), '{"id": "W1", "n": 1e+16}')
+
+    def test_backends_pretty_print_identically(self):
+        data = {"nodes": [{"id": "W1", "title": "é", "attrs": {}}], "links": [], "directed": True}
+        codec.set_backend("json")
+        expected = codec.dumps_pretty(data)
+        for backend in codec.available_backends():
+            codec.set_backend(backend)
+            self.assertEqual(codec.dumps_pretty(data), expected, backend)
+
+    def test_iter_records_decodes_into_dataclass(self):
+        path = os.path.join(self.tmp.name, "nodes.json")
+        talker = NetworkFileTalker(json_out_file=path)
+        talker.write_list(self.works)
+        for backend in codec.available_backends():
+            codec.set_backend(backend)
+            self.assertEqual(list(talker.iter_records(path, as_type=Work)), self.works, backend)
+
+    def test_iter_records_yields_idless_records_as_dicts(self):
+        path = os.path.join(self.tmp.name, "nodes.json")
+        talker = NetworkFileTalker(json_out_file=path)
+        talker.write_list([self.works[0], {"title": "no id"}, self.works[1]])
+        for backend in codec.available_backends():
+            codec.set_backend(backend)
+            records = list(talker.iter_records(path, as_type=Work))
+            self.assertEqual(records, [self.works[0], {"title": "no id"}, self.works[1]], backend)
+            self.assertEqual(talker.read_stats.skipped_lines, 0, backend)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            codec.set_backend("yaml")
+
+
+if __name__ == "__main__":
+    unittest.main()
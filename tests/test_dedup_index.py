@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+from climate_citations.dedup_index import DedupNetworkFileTalker, SqliteIdIndex
+from climate_citations.openalex import OpenAlexClient
+
+
+class TestDedupIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        sample_path = os.path.join(os.path.dirname(__file__), "sample_works_list.json")
+        client = OpenAlexClient()
+        self.works = [client.build_work(r) for r in client.talker.read_file(sample_path, key="results")]
+        self.index_file = os.path.join(self.tmp.name, "index.sqlite")
+        self.nodes = os.path.join(self.tmp.name, "nodes.json")
+        self.edges = os.path.join(self.tmp.name, "edges.csv")
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_talker(self):
+        return DedupNetworkFileTalker(json_out_file=self.nodes, reference_edge_file=self.edges, index_file=self.index_file)
+
+    def count_lines(self, path):
+        # lines blanked by upserts do not count
+        with open(path, "rb") as fh:
+            return sum(1 for line in fh if not line.isspace())
+
+    def test_add_new_reports_first_occurrences(self):
+        index = SqliteIdIndex(self.index_file)
+        self.assertEqual(index.add_new(["W1", "W2", "W1"]), [True, True, False])
+        self.assertEqual(index.add_new(["W2", "W3"]), [False, True])
+        self.assertEqual(len(index), 3)
+        self.assertIn("W3", index)
+        index.close()
+
+    def test_repeated_pages_are_skipped_across_runs(self):
+        talker = self.make_talker()
+        talker.write_work_nodes_edges(self.works)
+        talker.write_work_nodes_edges(self.works[:2])
+        self.assertEqual(self.count_lines(self.nodes), 5)
+        self.assertEqual(self.count_lines(self.edges), 249)
+        self.assertEqual(talker.dedup_stats.nodes_skipped, 2)
+        talker.close()
+
+        talker = self.make_talker()
+        talker.write_work_nodes_edges(self.works)
+        self.assertEqual(self.count_lines(self.nodes), 5)
+        self.assertEqual(self.count_lines(self.edges), 249)
+        self.assertEqual(talker.dedup_stats.nodes_skipped, 5)
+        self.assertEqual(talker.dedup_stats.edges_skipped, 249)
+        self.assertEqual(talker.dedup_stats.edges_written, 0)
+        talker.close()
+
+    def test_truncated_writes_are_written_again(self):
+        talker = self.make_talker()
+        talker.write_work_nodes_edges(self.works[:2])
+        offsets = talker.file_offsets()
+        talker.write_work_nodes_edges(self.works[2:])
+        # a checkpoint resume cuts the files back and repeats the lost pages
+        talker.truncate_files(*offsets)
+        talker.write_work_nodes_edges(self.works)
+        self.assertEqual(self.count_lines(self.nodes), 5)
+        self.assertEqual(self.count_lines(self.edges), 249)
+        self.assertEqual(len(talker.node_index), 5)
+        talker.close()
+
+    def test_failed_write_does_not_register_keys(self):
+        talker = DedupNetworkFileTalker(json_out_file=os.path.join(self.tmp.name, "missing", "nodes.json"), reference_edge_file=self.edges, index_file=self.index_file)
+        with self.assertRaises(OSError):
+            talker.write_list(self.works)
+        self.assertEqual(len(talker.node_index), 0)
+        talker.close()
+
+    def test_upsert_is_not_filtered(self):
+        talker = self.make_talker()
+        talker.write_work_nodes_edges(self.works)
+        stats = talker.upsert_work_nodes_edges([self.works])
+        self.assertEqual(stats.replaced, 5)
+        self.assertEqual(self.count_lines(self.nodes), 5)
+        self.assertEqual(self.count_lines(self.edges), 249)
+        talker.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
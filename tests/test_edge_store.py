@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from climate_citations.edge_store import BinaryEdgeSink, EdgeStoreReader
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient
+
+
+class TestEdgeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        sample_path = os.path.join(os.path.dirname(__file__), "sample_works_list.json")
+        client = OpenAlexClient()
+        self.works = [client.build_work(r) for r in client.talker.read_file(sample_path, key="results")]
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_binary_sink_round_trips_to_csv(self):
+        store_dir = os.path.join(self.tmp.name, "edges")
+        csv_path = os.path.join(self.tmp.name, "reference_edges.csv")
+        talker = NetworkFileTalker(json_out_file=os.path.join(self.tmp.name, "nodes.json"),
+                                   edge_sink=BinaryEdgeSink(store_dir))
+        talker.write_work_nodes_edges(self.works)
+        self.assertEqual(os.path.getsize(os.path.join(store_dir, "edges.bin")), 249 * 16)
+
+        with EdgeStoreReader(store_dir) as reader:
+            self.assertEqual(reader.num_edges, 249)
+            self.assertEqual(reader.ids.key(reader.sources[0]), "W4249751050")
+            exported = os.path.join(self.tmp.name, "exported.csv")
+            reader.export_csv(exported)
+
+        NetworkFileTalker(reference_edge_file=csv_path).write_reference_edges(
+            [e for w in self.works for e in NetworkFileTalker().build_reference_edges(w)])
+        with open(exported, "rb") as a, open(csv_path, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_ids_persist_across_sinks(self):
+        store_dir = os.path.join(self.tmp.name, "edges")
+        BinaryEdgeSink(store_dir).write_work_edges(self.works[:1])
+        sink = BinaryEdgeSink(store_dir)
+        n_ids = len(sink.ids)
+        sink.write_work_edges(self.works[:1])
+        self.assertEqual(len(sink.ids), n_ids)
+        with EdgeStoreReader(store_dir) as reader:
+            half = reader.num_edges // 2
+            self.assertEqual(list(reader.pairs[:2 * half]), list(reader.pairs[2 * half:]))
+
+    def test_torn_writes_are_cut_on_open(self):
+        store_dir = os.path.join(self.tmp.name, "edges")
+        BinaryEdgeSink(store_dir).write_work_edges(self.works[:1])
+        with EdgeStoreReader(store_dir) as reader:
+            n_ids, n_edges = reader.num_nodes, reader.num_edges
+        # a crash mid-append leaves half an ID and half an edge record behind
+        with open(os.path.join(store_dir, "node_ids.txt"), "a", encoding="utf-8") as fh:
+            fh.write("W99")
+        with open(os.path.join(store_dir, "edges.bin"), "ab") as fh:
+            fh.write(b"\x01" * 5)
+        with EdgeStoreReader(store_dir) as reader:
+            self.assertEqual((reader.num_nodes, reader.num_edges), (n_ids, n_edges))
+
+        sink = BinaryEdgeSink(store_dir)
+        sink.write_work_edges(self.works[1:2])
+        with EdgeStoreReader(store_dir) as reader:
+            self.assertEqual(reader.num_edges, n_edges + len(self.works[1].references))
+            self.assertEqual(list(reader.iter_edges())[n_edges:], [(e.from_work, e.referenced_work) for e in NetworkFileTalker().build_reference_edges(self.works[1])])
+
+
+if __name__ == "__main__":
+    unittest.main()
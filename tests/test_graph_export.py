@@ -0,0 +1,75 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+from networkx.readwrite import json_graph
+
+from climate_citations import codec
+from climate_citations.graph_export import _TextGraphWriter, export_graph, read_binary_graph
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient
+from climate_citations.topic_citation_network import TopicCitationNetworkBuilder
+
+
+class TestGraphExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        sample_path = os.path.join(os.path.dirname(__file__), "sample_works_list.json")
+        client = OpenAlexClient()
+        self.records = client.talker.read_file(sample_path, key="results")
+        self.nodes = os.path.join(self.tmp.name, "nodes.json")
+        self.edges = os.path.join(self.tmp.name, "edges.csv")
+        talker = NetworkFileTalker(json_out_file=self.nodes, reference_edge_file=self.edges)
+        works = [client.build_work(r) for r in self.records]
+        talker.write_work_nodes_edges(works)
+        # a work harvested twice is exported once
+        talker.write_list(works[:1])
+        self.expected = nx.DiGraph()
+        for r in self.records:
+            TopicCitationNetworkBuilder._add_work(self.expected, r)
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertSameGraph(self, G):
+        self.assertEqual(set(G.nodes), set(self.expected.nodes))
+        self.assertEqual(set(G.edges), set(self.expected.edges))
+        first = G.nodes["https://openalex.org/W4249751050"]
+        self.assertEqual(int(first["year"]), 2013)
+        self.assertEqual(first["title"], self.expected.nodes["https://openalex.org/W4249751050"]["title"])
+
+    def test_gexf_and_graphml(self):
+        for fmt, read in (("gexf", nx.read_gexf), ("graphml", nx.read_graphml)):
+            path = os.path.join(self.tmp.name, f"graph.{fmt}")
+            stats = TopicCitationNetworkBuilder.save_graph_from_files(self.nodes, self.edges, path, fmt=fmt)
+            self.assertEqual((stats.nodes, stats.nodes + stats.cited_nodes, stats.edges), (5, self.expected.number_of_nodes(), 249))
+            self.assertSameGraph(read(path))
+
+    def test_gzipped_node_link_json(self):
+        path = os.path.join(self.tmp.name, "graph.json.gz")
+        export_graph(self.nodes, self.edges, path, fmt="json")
+        with gzip.open(path, "rb") as fh:
+            G = json_graph.node_link_graph(codec.loads(fh.read()), edges="edges")
+        self.assertSameGraph(G)
+
+    def test_binary_round_trip(self):
+        path = os.path.join(self.tmp.name, "graph.bin")
+        export_graph(self.nodes, self.edges, path, fmt="binary")
+        nodes, columns = read_binary_graph(path)
+        self.assertEqual(len(nodes), self.expected.number_of_nodes())
+        self.assertEqual(set(columns), set(self.expected.edges))
+
+    def test_incomplete_writer_fails_when_created(self):
+        class NodesOnly(_TextGraphWriter):
+            def node(self, node_id, attrs):
+                return node_id
+        with self.assertRaises(TypeError):
+            NodesOnly()
+
+
+if __name__ == "__main__":
+    unittest.main()
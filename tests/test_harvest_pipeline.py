@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from pytest import MonkeyPatch
+
+from climate_citations.harvest_pipeline import HarvestPipeline
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient
+
+TOPICS = {"T1": list(range(1, 24)), "T2": list(range(100, 110))}
+
+
+def work(i):
+    return {"id": f"https://openalex.org/W{i}", "title": f"work {i}", "referenced_works": ["https://openalex.org/W1"]}
+
+
+class TestHarvestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.mp = MonkeyPatch()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.nodes = os.path.join(self.tmp.name, "work_nodes.json")
+        self.edges = os.path.join(self.tmp.name, "edges.csv")
+        self.client = OpenAlexClient(talker=NetworkFileTalker(json_out_file=self.nodes, reference_edge_file=self.edges))
+        self.calls = 0
+        self.on_get = None
+
+        def fake_get(client, path, params=None):
+            self.calls += 1
+            if self.on_get:
+                self.on_get()
+            keys = TOPICS[path.split("/")[2]]
+            start = 0 if params["cursor"] == "*" else int(params["cursor"])
+            end = start + params["per-page"]
+            next_cursor = str(end) if end < len(keys) else None
+            return {"meta": {"count": len(keys), "next_cursor": next_cursor}, "results": [work(k) for k in keys[start:end]]}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.mp.undo()
+        self.tmp.cleanup()
+
+    def written_ids(self):
+        return sorted(int(r["id"].rsplit("W", 1)[-1]) for r in self.client.talker.read_file(self.nodes))
+
+    def test_topics_are_written_in_batches(self):
+        pipeline = HarvestPipeline(self.client, fetchers=2, queue_depth=2, batch_size=10, per_page=4)
+        stats = pipeline.run(["T1", "https://openalex.org/T2"], max_items_per_topic=20)
+        self.assertEqual(self.written_ids(), list(range(1, 21)) + list(range(100, 110)))
+        self.assertEqual((stats.records, stats.works_written, stats.batches), (30, 30, 3))
+        self.assertEqual(stats.fsyncs, 1)
+        with open(self.edges, "r", encoding="utf-8") as fh:
+            self.assertEqual(len(fh.read().splitlines()), 30)
+
+    def test_stop_drains_fetched_pages(self):
+        pipeline = HarvestPipeline(self.client, batch_size=1000, per_page=4)
+
+        def stop_after_two_pages():
+            if self.calls == 2:
+                pipeline._stop.set()
+        self.on_get = stop_after_two_pages
+        stats = pipeline.run(["T1"])
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.written_ids(), list(range(1, 9)))
+        self.assertEqual(stats.works_written, 8)
+
+    def test_stage_error_is_raised_without_hanging(self):
+        def fail(works, *args, **kwargs):
+            raise OSError("disk full")
+        self.mp.setattr(self.client.talker, "write_work_nodes_edges", fail)
+        pipeline = HarvestPipeline(self.client, queue_depth=1, batch_size=1, per_page=1)
+        with self.assertRaises(OSError):
+            pipeline.run(["T1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
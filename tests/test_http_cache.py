@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from climate_citations.http_cache import CacheMissError, ResponseCache
+from climate_citations.openalex import OpenAlexClient, Topic
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite")
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_ignores_mailto_and_param_order(self):
+        a = ResponseCache.make_key("https://API.openalex.org/works/", {"page": 2, "per-page": 5, "mailto": "a@b.org"})
+        b = ResponseCache.make_key("https://api.openalex.org/works?per-page=5", {"page": "2"})
+        self.assertEqual(a, b)
+
+    def test_hit_miss_and_ttl(self):
+        cache = ResponseCache(self.path, ttl=0.05)
+        self.assertIsNone(cache.get("https://api.openalex.org/topics/T1"))
+        cache.put("https://api.openalex.org/topics/T1", None, {"id": "T1"})
+        self.assertEqual(cache.get("https://api.openalex.org/topics/T1"), {"id": "T1"})
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("https://api.openalex.org/topics/T1"))
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 2))
+        cache.close()
+
+    def test_lru_eviction(self):
+        body = {"x": "y" * 100}
+        cache = ResponseCache(self.path, max_bytes=350)
+        for i in range(3):
+            cache.put(f"https://api.openalex.org/works/W{i}", None, body)
+            time.sleep(0.01)
+        cache.get("https://api.openalex.org/works/W0")  # W1 is now least recently used
+        cache.put("https://api.openalex.org/works/W3", None, body)
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertIsNone(cache.get("https://api.openalex.org/works/W1"))
+        self.assertIsNotNone(cache.get("https://api.openalex.org/works/W0"))
+        cache.close()
+
+    def test_size_is_in_bytes_and_hits_do_not_write(self):
+        cache = ResponseCache(self.path, max_bytes=None)
+        cache.put("https://api.openalex.org/works/W1", None, {"x": "é" * 100})
+        cache.put("https://api.openalex.org/works/W1", None, {"x": "ü" * 50})
+        self.assertEqual(cache._total_bytes, len('{"x": ""}') + 100)
+        changes = cache._conn.total_changes
+        self.assertIsNotNone(cache.get("https://api.openalex.org/works/W1"))
+        self.assertEqual(cache._conn.total_changes, changes)
+        cache.close()
+        # the running total is picked up again, and the buffered access time was kept
+        reopened = ResponseCache(self.path)
+        self.assertEqual(reopened._total_bytes, len('{"x": ""}') + 100)
+        accessed, created = reopened._conn.execute("SELECT accessed, created FROM responses").fetchone()
+        self.assertGreater(accessed, created)
+        reopened.close()
+
+    def test_offline_client_serves_fixture_from_cache(self):
+        with open(os.path.join(os.path.dirname(__file__), "sample_topic.json"), "r", encoding="utf-8") as fh:
+            sample = json.load(fh)
+        cache = ResponseCache(self.path)
+        cache.put("https://api.openalex.org/topics/T10017", None, sample)
+        client = OpenAlexClient(mailto="someone@example.org", cache=cache, offline=True)
+        topic = client.get_topic("T10017")
+        self.assertIsInstance(topic, Topic)
+        self.assertEqual(topic.display_name, "Geology and Paleoclimatology Research")
+        with self.assertRaises(CacheMissError):
+            client.get_topic("T99999")
+        self.assertEqual((client.cache_stats.hits, client.cache_stats.misses), (1, 1))
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+from pytest import MonkeyPatch
+
+from climate_citations.incremental_refresh import IncrementalRefresher
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient
+
+
+def work(key, refs):
+    return {"id": f"https://openalex.org/{key}", "title": key, "referenced_works": [f"https://openalex.org/{r}" for r in refs]}
+
+
+class TestIncrementalRefresher(unittest.TestCase):
+
+    def setUp(self):
+        self.mp = MonkeyPatch()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.nodes = os.path.join(self.tmp.name, "work_nodes.json")
+        self.edges = os.path.join(self.tmp.name, "reference_edges.csv")
+        self.state_file = os.path.join(self.tmp.name, "refresh_state.json")
+        talker = NetworkFileTalker(json_out_file=self.nodes, reference_edge_file=self.edges)
+        self.client = OpenAlexClient(talker=talker)
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.mp.undo()
+        self.tmp.cleanup()
+
+    def serve(self, results):
+        self.filters = []
+        def fake_get(client, path, params=None):
+            self.filters.append(params.get("filter"))
+            return {"meta": {"next_cursor": None}, "results": results}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+
+    def test_refresh_upserts_changed_works(self):
+        self.serve([work("W1", ["W3"]), work("W2", ["W3", "W4"])])
+        first = IncrementalRefresher(self.client, state_file=self.state_file).refresh_topic("T10017")
+        self.assertIsNone(self.filters[0])
+        self.assertEqual((first.stats.inserted, first.stats.replaced), (2, 0))
+
+        # next night: W1 changed its references, W5 is new
+        self.serve([work("W1", ["W4"]), work("W5", ["W1"])])
+        second = IncrementalRefresher(self.client, state_file=self.state_file).refresh_topic("T10017")
+        self.assertEqual(self.filters[0], f"from_updated_date:{first.high_water_mark}")
+        self.assertEqual((second.stats.inserted, second.stats.replaced, second.stats.edges_removed), (1, 1, 1))
+
+        ids = [r["id"].rsplit("/", 1)[-1] for r in self.client.talker.read_file(self.nodes)]
+        self.assertEqual(ids, ["W2", "W1", "W5"])
+        # the replaced lines are blanked in place until the files are compacted
+        with open(self.edges, "r", encoding="utf-8") as fh:
+            edges = [line.strip().replace("https://openalex.org/", "") for line in fh if not line.isspace()]
+        self.assertEqual(edges, ["W2,W3", "W2,W4", "W1,W4", "W5,W1"])
+        self.assertEqual(self.client.talker.compact_files(), 2)
+        with open(self.edges, "r", encoding="utf-8") as fh:
+            self.assertEqual(len(fh.readlines()), 4)
+        with open(self.state_file, "r", encoding="utf-8") as fh:
+            self.assertEqual(json.load(fh)["T10017"]["works_changed"], 2)
+
+    def test_refresh_without_changes_leaves_files(self):
+        self.serve([work("W1", ["W3"])])
+        refresher = IncrementalRefresher(self.client, state_file=self.state_file)
+        refresher.refresh_topic("T10017")
+        self.serve([])
+        result = refresher.refresh_topic("T10017")
+        self.assertEqual(result.stats.inserted + result.stats.replaced, 0)
+        self.assertEqual(len(self.client.talker.read_file(self.nodes)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
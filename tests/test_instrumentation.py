@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+
+from climate_citations import instrumentation
+from climate_citations.instrumentation import METRICS, Histogram, SamplingProfiler
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient
+from climate_citations.openalex_topic_client import OpenAlexTopicClient
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSession:
+    """
+    Answers the first request with a 429, then with one page of two works.
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        if self.calls == 1:
+            return FakeResponse(429)
+        page = {"meta": {"count": 2}, "results": [{"id": "https://openalex.org/W1", "referenced_works": ["https://openalex.org/W2"]}, {"id": "https://openalex.org/W2"}]}
+        return FakeResponse(200, json.dumps(page).encode())
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        talker = NetworkFileTalker(json_out_file=os.path.join(self.tmp.name, "nodes.json"), reference_edge_file=os.path.join(self.tmp.name, "edges.csv"))
+        self.client = OpenAlexClient(talker=talker)
+        self.client._client = OpenAlexTopicClient(session=FakeSession(), sleep_on_rate_limit=0)
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        instrumentation.disable()
+        METRICS.reset()
+        self.tmp.cleanup()
+
+    def test_disabled_records_nothing(self):
+        METRICS.reset()
+        self.client.get_works_for_topic("T1", per_page=2, max_items=2)
+        self.assertEqual((METRICS.counters, METRICS.histograms), ({}, {}))
+
+    def test_harvest_stages_are_recorded(self):
+        instrumentation.enable()
+        works = self.client.get_works_for_topic("T1", per_page=2, max_items=2)
+        self.assertEqual(len(works), 2)
+        summary = METRICS.summary()
+        counters = summary["counters"]
+        self.assertEqual((counters["http.requests"], counters["http.429"], counters["http.retries"], counters["records"]), (2, 1, 1, 2))
+        self.assertGreater(counters["http.bytes_received"], 0)
+        for stage in ("http.request", "http.backoff", "json.decode", "build_work.page", "talker.write_list", "talker.write_edges", "talker.write_work_nodes_edges"):
+            self.assertIn(stage, summary["timings"])
+        self.assertEqual(summary["timings"]["http.request"]["count"], 2)
+        self.assertIn("records", summary["rates_per_second"])
+
+        path = os.path.join(self.tmp.name, "metrics.prom")
+        METRICS.write_prometheus(path)
+        with open(path, "r", encoding="utf-8") as fh:
+            text = fh.read()
+        self.assertIn("climate_citations_http_429_total 1", text)
+        self.assertIn('climate_citations_http_request_seconds_bucket{le="+Inf"} 2', text)
+        METRICS.write_json(os.path.join(self.tmp.name, "metrics.json"))
+
+    def test_histogram_quantiles(self):
+        hist = Histogram((0.1, 1.0))
+        for v in (0.05, 0.05, 0.5, 7.0):
+            hist.observe(v)
+        self.assertEqual(hist.counts, [2, 1, 1])
+        self.assertEqual((hist.quantile(0.5), hist.quantile(0.75), hist.quantile(1.0)), (0.1, 1.0, 7.0))
+
+    def test_sampling_profiler(self):
+        with SamplingProfiler(interval=0.001) as profiler:
+            sum(i * i for i in range(300000))
+        path = os.path.join(self.tmp.name, "stacks.txt")
+        profiler.write_collapsed(path)
+        self.assertTrue(profiler.samples)
+
+
+if __name__ == "__main__":
+    unittest.main()
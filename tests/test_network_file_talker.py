@@ -1,10 +1,14 @@
 import os
 import csv
 import json
+import tempfile
+import tracemalloc
 import unittest
+from pytest import MonkeyPatch
 
+from climate_citations import network_file_talker
 from climate_citations.network_file_talker import NetworkFileTalker
-from climate_citations.openalex import OpenAlexClient, Work
+from climate_citations.openalex import CompactWork, OpenAlexClient, Work
 # from climate_citations.network_file_talker import NetworkFileTalker, ReferenceEdge
 
 
@@ -155,7 +159,154 @@ class TestNetworkFileTalker(unittest.TestCase):
             self.assertEqual(rows[0], "https://openalex.org/W4249751050,https://openalex.org/W1529443799")
             self.assertEqual(rows[-1], "https://openalex.org/W2272473773,https://openalex.org/W641774538")
 
-
+    def test_iter_records_streams_key_array(self):
+        tests_dir = os.path.dirname(__file__)
+        sample_path = os.path.join(tests_dir, "sample_works_list.json")
+        nf = NetworkFileTalker()
+
+        records = nf.iter_records(sample_path, key="results")
+        first = next(records)
+        self.assertEqual(first.get("id"), "https://openalex.org/W4249751050")
+        self.assertEqual(1 + sum(1 for _ in records), 5)
+        self.assertEqual(nf.read_stats.records, 5)
+        self.assertEqual(nf.read_stats.skipped_lines, 0)
+
+    def test_write_work_nodes_edges_matches_csv_module(self):
+        works = [
+            Work(id="https://openalex.org/W1", title="one", references=["https://openalex.org/W2", "https://openalex.org/W3"]),
+            Work(id="https://openalex.org/W4", title="no references", references=[]),
+            Work(id='odd,"id"', references=["https://openalex.org/W1"]),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            nodes, edges = os.path.join(tmp, "nodes.json"), os.path.join(tmp, "edges.csv")
+            nf = NetworkFileTalker(json_out_file=nodes, reference_edge_file=edges)
+            nf.write_work_nodes_edges(works[:2])
+            nf.write_work_nodes_edges(works[2:])
+
+            expected = os.path.join(tmp, "expected.csv")
+            with open(expected, "w", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh)
+                for w in works:
+                    for r in w.references:
+                        writer.writerow([w.id, r])
+            with open(edges, "rb") as a, open(expected, "rb") as b:
+                self.assertEqual(a.read(), b.read())
+
+            output_list = nf.read_file(nodes)
+            self.assertEqual(len(output_list), 3)
+            self.assertEqual(output_list[0]["references"], works[0].references)
+            self.assertEqual(output_list[1]["title"], "no references")
+
+    def test_compact_works_write_the_same_files(self):
+        sample_path = os.path.join(os.path.dirname(__file__), "sample_works_list.json")
+        records = NetworkFileTalker().read_file(sample_path, key="results")
+        works = [OpenAlexClient().build_work(r) for r in records]
+        compact = [CompactWork.from_record(r) for r in records]
+        self.assertEqual(compact[0].id, works[0].id)
+        self.assertEqual(compact[0].references, works[0].references)
+        self.assertEqual(compact[0].to_work(), works[0])
+        with tempfile.TemporaryDirectory() as tmp:
+            outputs = []
+            for name, batch in (("work", works), ("compact", compact)):
+                nodes, edges = os.path.join(tmp, f"{name}.json"), os.path.join(tmp, f"{name}.csv")
+                NetworkFileTalker(json_out_file=nodes, reference_edge_file=edges).write_work_nodes_edges(batch)
+                with open(nodes, "rb") as a, open(edges, "rb") as b:
+                    outputs.append((a.read(), b.read()))
+            self.assertEqual(outputs[0], outputs[1])
+
+        nf = NetworkFileTalker()
+        columns = nf.build_edge_columns(compact)
+        self.assertEqual(columns, nf.build_edge_columns(works))
+        self.assertEqual(len(columns), 249)
+        self.assertEqual(list(columns), [(e.from_work, e.referenced_work) for w in works for e in nf.build_reference_edges(w)])
+
+    def test_read_file_skips_malformed_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "records.json")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write('{"id": "W1"}\nnot json\n{"id":\n "W2"}{"id": "W3"}\n{"id": "W4", \n')
+            nf = NetworkFileTalker()
+            records = nf.read_file(path)
+            self.assertEqual([r["id"] for r in records], ["W1", "W2", "W3"])
+            self.assertEqual(nf.read_stats.skipped_lines, 2)
+            self.assertEqual(nf.read_file(os.path.join(tmp, "missing.json")), [])
+
+    def test_truncated_record_does_not_swallow_the_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "records.json")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write('{"id": "W0", "title": "cut off\n')
+                for i in range(1, 100001):
+                    fh.write(json.dumps({"id": f"W{i}", "title": "x" * 80}) + "\n")
+            nf = NetworkFileTalker()
+            tracemalloc.start()
+            count = sum(1 for _ in nf.iter_records(path))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertEqual((count, nf.read_stats.skipped_lines), (100000, 1))
+            # a few MB of read buffer, not the ~10 MB file
+            self.assertLess(peak, 4 * 1024 * 1024)
+
+    def test_upsert_reads_only_the_change(self):
+        def work(i, ref):
+            return Work(id=f"https://openalex.org/W{i}", title=f"work {i}", references=[f"https://openalex.org/W{ref}"])
+        mp = MonkeyPatch()
+        with tempfile.TemporaryDirectory() as tmp:
+            nodes, edges = os.path.join(tmp, "nodes.json"), os.path.join(tmp, "edges.csv")
+            nf = NetworkFileTalker(json_out_file=nodes, reference_edge_file=edges)
+            nf.write_work_nodes_edges([work(i, 0) for i in range(1000)])
+            inode = os.stat(nodes).st_ino
+            stats = nf.upsert_work_nodes_edges([[work(5, 7), work(1000, 5)]])
+            self.assertEqual((stats.inserted, stats.replaced, stats.edges_removed, stats.edges_written), (1, 1, 1, 2))
+            self.assertEqual(os.stat(nodes).st_ino, inode)
+
+            # later upserts only index the lines appended since the previous one
+            nf.write_work_nodes_edges([work(i, 0) for i in range(1001, 1004)])
+            indexed = []
+            original = network_file_talker._node_line_id
+            mp.setattr(network_file_talker, "_node_line_id", lambda line: indexed.append(line) or original(line))
+            stats = nf.upsert_work_nodes_edges([[work(1002, 9)]])
+            mp.undo()
+            self.assertEqual(len(indexed), 3)
+            self.assertEqual((stats.inserted, stats.replaced, stats.edges_removed), (0, 1, 1))
+
+            records = nf.read_file(nodes)
+            self.assertEqual(len(records), 1004)
+            self.assertEqual(len({r["id"] for r in records}), 1004)
+            self.assertEqual([r["references"] for r in records if r["id"].endswith("/W5")], [["https://openalex.org/W7"]])
+            with open(edges, "r", newline="", encoding="utf-8") as fh:
+                rows = [row for row in csv.reader(fh) if len(row) >= 2]
+            self.assertEqual(len(rows), 1004)
+            self.assertIn(["https://openalex.org/W1002", "https://openalex.org/W9"], rows)
+            self.assertEqual(nf.compact_files(), 2 + 2)
+            self.assertEqual(nf.read_file(nodes), records)
+
+    def test_interrupted_upsert_is_completed(self):
+        mp = MonkeyPatch()
+        with tempfile.TemporaryDirectory() as tmp:
+            nodes, edges = os.path.join(tmp, "nodes.json"), os.path.join(tmp, "edges.csv")
+            nf = NetworkFileTalker(json_out_file=nodes, reference_edge_file=edges)
+            nf.write_work_nodes_edges([Work(id="W1", references=["W2"]), Work(id="W3", references=["W2"])])
+            apply = network_file_talker._apply_upsert
+
+            def crash(journal):
+                apply(journal)
+                raise OSError("simulated crash")
+            mp.setattr(network_file_talker, "_apply_upsert", crash)
+            with self.assertRaises(OSError):
+                nf.upsert_work_nodes_edges([[Work(id="W1", references=["W4"])]])
+            mp.undo()
+            self.assertTrue(os.path.exists(f"{nodes}.upsert.journal"))
+
+            # replaying the journal is safe even though the crash came after the changes
+            self.assertTrue(NetworkFileTalker(json_out_file=nodes, reference_edge_file=edges).recover_upsert())
+            self.assertFalse(os.path.exists(f"{nodes}.upsert.journal"))
+            self.assertFalse(os.path.exists(f"{nodes}.staged"))
+            self.assertEqual([(r["id"], r["references"]) for r in nf.read_file(nodes)], [("W3", ["W2"]), ("W1", ["W4"])])
+            with open(edges, "r", encoding="utf-8") as fh:
+                self.assertEqual([line.strip() for line in fh if not line.isspace()], ["W3,W2", "W1,W4"])
+            stats = nf.upsert_work_nodes_edges([[Work(id="W1", references=["W5"])]])
+            self.assertEqual((stats.replaced, stats.edges_removed), (1, 1))
 
 
 if __name__ == "__main__":
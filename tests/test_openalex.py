@@ -1,11 +1,12 @@
 import os
 import csv
 import json
+import tempfile
 import unittest
 from typing import List 
 from pytest import MonkeyPatch
 
-from climate_citations.openalex import OpenAlexClient, Topic, Work
+from climate_citations.openalex import OpenAlexClient, Topic, Work, WORK_SELECT_FIELDS
 # updated imports to use the moved functions
 from climate_citations.network_file_talker import NetworkFileTalker, ReferenceEdge 
 
@@ -16,6 +17,10 @@ class TestOpenAlexClient(unittest.TestCase):
         self.mp = MonkeyPatch()
         print(f"Running test: {self._testMethodName}")
 
+    def tearDown(self):
+        # not every test undoes its monkeypatch of OpenAlexClient._get
+        self.mp.undo()
+
 
     def test_get_topic(self):
         self._get_returns_file_contents("sample_topic.json")
@@ -48,6 +53,109 @@ class TestOpenAlexClient(unittest.TestCase):
         self.assertEqual(first_work.publication_year, 2013)
      
 
+    def test_get_works_for_topic_concurrent(self):
+        # 23 synthetic works served 5 per page; pages may complete out of order
+        def fake_get(self, path, params=None):
+            page = params["page"]
+            start = (page - 1) * 5
+            ids = range(start, min(start + 5, 23))
+            return {"meta": {"count": 23}, "results": [{"id": f"https://openalex.org/W{i}", "referenced_works": ["https://openalex.org/W1"]} for i in ids]}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+        with tempfile.TemporaryDirectory() as tmp:
+            talker = NetworkFileTalker(json_out_file=os.path.join(tmp, "nodes.json"), reference_edge_file=os.path.join(tmp, "edges.csv"))
+            client = OpenAlexClient(talker=talker)
+            works = client.get_works_for_topic("T10017", per_page=5, workers=4)
+            self.assertEqual([w.id for w in works], [f"https://openalex.org/W{i}" for i in range(23)])
+            works = client.get_works_for_topic("T10017", per_page=5, max_items=12, workers=4)
+            self.assertEqual(len(works), 12)
+            self.assertEqual(works[-1].id, "https://openalex.org/W11")
+        self.mp.undo()
+
+    def test_get_works_for_topic_by_cursor_resumes(self):
+        # three cursor pages of 4 works; the first run crashes fetching the last page
+        pages = {"*": ("c1", range(0, 4)), "c1": ("c2", range(4, 8)), "c2": (None, range(8, 12))}
+        fail_on = {"cursor": "c2"}
+        def fake_get(self, path, params=None):
+            if params["cursor"] == fail_on["cursor"]:
+                raise ConnectionError("simulated crash")
+            next_cursor, ids = pages[params["cursor"]]
+            results = [{"id": f"https://openalex.org/W{i}", "referenced_works": ["https://openalex.org/W1"]} for i in ids]
+            return {"meta": {"next_cursor": next_cursor}, "results": results}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+        with tempfile.TemporaryDirectory() as tmp:
+            nodes, edges, ckpt = (os.path.join(tmp, n) for n in ("nodes.json", "edges.csv", "ckpt.json"))
+            client = OpenAlexClient(talker=NetworkFileTalker(json_out_file=nodes, reference_edge_file=edges))
+            with self.assertRaises(ConnectionError):
+                client.get_works_for_topic_by_cursor("T10017", per_page=4, checkpoint_file=ckpt)
+            # simulate a partial trailing write from the interrupted page
+            with open(nodes, "a", encoding="utf-8") as fh:
+                fh.write('{"id": "https://openalex.org/W8", "ti')
+
+            fail_on["cursor"] = None
+            works = client.get_works_for_topic_by_cursor("T10017", per_page=4, checkpoint_file=ckpt)
+            self.assertEqual([w.id for w in works], [f"https://openalex.org/W{i}" for i in range(8, 12)])
+
+            ids = [r["id"] for r in client.talker.read_file(nodes)]
+            self.assertEqual(ids, [f"https://openalex.org/W{i}" for i in range(12)])
+            with open(edges, "r", encoding="utf-8") as fh:
+                self.assertEqual(len(fh.readlines()), 12)
+            with open(ckpt, "r", encoding="utf-8") as fh:
+                state = json.load(fh)
+            self.assertIsNone(state["cursor"])
+            self.assertEqual(state["records_written"], 12)
+        self.mp.undo()
+
+    def test_get_works_for_topic_by_cursor_resumes_first_page(self):
+        def fake_get(self, path, params=None):
+            results = [{"id": f"https://openalex.org/W{i}", "referenced_works": ["https://openalex.org/W1"]} for i in range(4)]
+            return {"meta": {"next_cursor": None}, "results": results}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+        with tempfile.TemporaryDirectory() as tmp:
+            nodes, edges, ckpt = (os.path.join(tmp, n) for n in ("nodes.json", "edges.csv", "ckpt.json"))
+            talker = NetworkFileTalker(json_out_file=nodes, reference_edge_file=edges)
+            client = OpenAlexClient(talker=talker)
+            # the first run crashes after writing the first page's nodes but before its edges
+            def crash(works, *args):
+                talker.write_list(works)
+                raise ConnectionError("simulated crash")
+            self.mp.setattr(talker, "write_work_nodes_edges", crash)
+            with self.assertRaises(ConnectionError):
+                client.get_works_for_topic_by_cursor("T10017", per_page=4, checkpoint_file=ckpt)
+            self.assertTrue(os.path.exists(ckpt))
+            self.mp.delattr(talker, "write_work_nodes_edges")
+
+            works = client.get_works_for_topic_by_cursor("T10017", per_page=4, checkpoint_file=ckpt)
+            self.assertEqual(len(works), 4)
+            ids = [r["id"] for r in talker.read_file(nodes)]
+            self.assertEqual(ids, [f"https://openalex.org/W{i}" for i in range(4)])
+
+            talker.edge_sink = object()
+            with self.assertRaises(ValueError):
+                client.get_works_for_topic_by_cursor("T10017", checkpoint_file=ckpt)
+        self.mp.undo()
+
+    def test_iter_works_for_topic_is_lazy(self):
+        pages = {"*": ("c1", range(0, 4)), "c1": ("c2", range(4, 8)), "c2": (None, range(8, 10))}
+        calls = []
+        def fake_get(self, path, params=None):
+            calls.append(params["cursor"])
+            next_cursor, ids = pages[params["cursor"]]
+            return {"meta": {"next_cursor": next_cursor}, "results": [{"id": f"https://openalex.org/W{i}", "referenced_works": ["https://openalex.org/W1"]} for i in ids]}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+        with tempfile.TemporaryDirectory() as tmp:
+            nodes, edges = os.path.join(tmp, "nodes.json"), os.path.join(tmp, "edges.csv")
+            client = OpenAlexClient(talker=NetworkFileTalker(json_out_file=nodes, reference_edge_file=edges))
+            works = client.iter_works_for_topic("T10017", per_page=4)
+            self.assertEqual(next(works).id, "https://openalex.org/W0")
+            self.assertEqual(calls, ["*"])
+            self.assertEqual(len(list(works)), 9)
+            self.assertFalse(os.path.exists(nodes))
+
+            works = list(client.iter_works_for_topic("T10017", per_page=4, max_items=6, talker=client.talker))
+            self.assertEqual([w.id for w in works], [f"https://openalex.org/W{i}" for i in range(6)])
+            self.assertEqual(len(client.talker.read_file(nodes)), 6)
+        self.mp.undo()
+
     def test_get_work(self):
         # monkeypatch OpenAlexClient._get to return the sample work JSON
         self._get_returns_file_contents("sample_work.json")
@@ -66,6 +174,42 @@ class TestOpenAlexClient(unittest.TestCase):
         self.assertEqual(work.references[-1], "https://openalex.org/W4256135186")
         self.mp.undo()
 
+    def test_enrich_references_batches_requests(self):
+        self._get_returns_file_contents("sample_work.json")
+        work = self.client.get_work("W4249751050")
+        self.mp.undo()
+        calls = []
+        def fake_get(self, path, params=None):
+            calls.append((path, params))
+            ids = params["filter"].split(":", 1)[1].split("|")
+            return {"results": [{"id": f"https://openalex.org/{i}", "cited_by_count": 1} for i in ids]}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+        cited = self.client.enrich_references([work], batch_size=50)
+        self.assertEqual(len(calls), 2)  # 65 distinct references, 50 per request
+        self.assertEqual(calls[0][0], "/works")
+        self.assertIn("referenced_works", calls[0][1]["select"])
+        self.assertEqual(len(cited), 65)
+        self.assertIsInstance(cited["https://openalex.org/W1529443799"], Work)
+        self.assertEqual(cited["https://openalex.org/W4256135186"].cited_by_count, 1)
+        self.mp.undo()
+
+    def test_work_requests_select_work_fields(self):
+        self.assertEqual(WORK_SELECT_FIELDS, ["id", "title", "referenced_works", "publication_year", "doi", "cited_by_count", "best_oa_location"])
+        calls = []
+        def fake_get(self, path, params=None):
+            calls.append(params)
+            return {"id": "https://openalex.org/W1", "results": [], "meta": {}}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+        self.client.get_work("W1")
+        self.client.get_works_for_topic("T10017")
+        self.client.get_work("W1", select=["id", "title"])
+        self.client.get_works_for_topic("T10017", select=[])
+        self.assertEqual(calls[0]["select"], ",".join(WORK_SELECT_FIELDS))
+        self.assertEqual(calls[1]["select"], ",".join(WORK_SELECT_FIELDS))
+        self.assertEqual(calls[2]["select"], "id,title")
+        self.assertNotIn("select", calls[3])
+        self.mp.undo()
+
     def test_build_reference_edges(self):
         self._get_returns_file_contents("sample_work.json")
         work = self.client.get_work("W4249751050")
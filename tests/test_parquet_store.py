@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from climate_citations import parquet_store
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import CompactWork, OpenAlexClient, Work
+
+
+def works_for_year(year, first):
+    return [Work(id=f"https://openalex.org/W{k}", title=f"work {k}", references=[f"https://openalex.org/W{k - 1}"] if k > 1 else [], publication_year=year, cited_by_count=k) for k in range(first, first + 5)]
+
+
+@unittest.skipIf(parquet_store.pa is None, "pyarrow is not installed")
+class TestParquetStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.nodes = os.path.join(self.tmp.name, "nodes.parquet")
+        self.edges = os.path.join(self.tmp.name, "edges.parquet")
+        # one page (row group) per year
+        with parquet_store.ParquetNetworkSink(self.nodes, self.edges) as sink:
+            for n, year in enumerate((2000, 2010, 2020)):
+                page = works_for_year(year, 1 + 5 * n)
+                sink.write_work_nodes_edges([CompactWork.from_work(w) for w in page] if year == 2010 else page)
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_pages_are_typed_row_groups(self):
+        meta = parquet_store.pq.ParquetFile(self.nodes).metadata
+        self.assertEqual((meta.num_row_groups, meta.num_rows), (3, 15))
+        table = parquet_store.read_nodes(self.nodes)
+        self.assertEqual(table.schema, parquet_store.node_schema())
+        self.assertEqual(table.column("id").to_pylist(), list(range(1, 16)))
+        self.assertEqual(parquet_store.pq.read_table(self.edges).num_rows, 14)
+
+    def test_predicate_pushdown_prunes_row_groups(self):
+        fragment = next(iter(parquet_store.pq.ParquetDataset(self.nodes).fragments))
+        expr = parquet_store.node_filter(min_year=2015)
+        self.assertEqual([rg.id for f in fragment.split_by_row_group(expr) for rg in f.row_groups], [2])
+        self.assertEqual(parquet_store.read_nodes(self.nodes, min_year=2005, max_cited_by=12).column("id").to_pylist(), [6, 7, 8, 9, 10, 11, 12])
+
+    def test_read_subgraph(self):
+        nodes, edges = parquet_store.read_subgraph(self.nodes, self.edges, min_year=2010, max_year=2010, node_columns=["title"])
+        self.assertEqual(nodes.column_names, ["id", "title"])
+        self.assertEqual(sorted(edges.column("source").to_pylist()), [6, 7, 8, 9, 10])
+        _, internal = parquet_store.read_subgraph(self.nodes, self.edges, min_year=2010, max_year=2010, internal_only=True)
+        self.assertEqual(internal.num_rows, 4)
+
+    def test_convert_talker_files(self):
+        talker = NetworkFileTalker(json_out_file=os.path.join(self.tmp.name, "nodes.json"), reference_edge_file=os.path.join(self.tmp.name, "edges.csv"))
+        sample = OpenAlexClient(talker=talker)
+        works = [sample.build_work(r) for r in talker.read_file(os.path.join(os.path.dirname(__file__), "sample_works_list.json"), key="results")]
+        talker.write_work_nodes_edges(works)
+        out_nodes, out_edges = os.path.join(self.tmp.name, "c_nodes.parquet"), os.path.join(self.tmp.name, "c_edges.parquet")
+        nodes, edges = parquet_store.convert_talker_files(talker.json_out_file, talker.reference_edge_file, out_nodes, out_edges, batch_size=100)
+        self.assertEqual((nodes, edges), (len(works), sum(len(w.references or []) for w in works)))
+        table = parquet_store.read_nodes(out_nodes, columns=["id", "title"])
+        self.assertEqual(table.column("title").to_pylist(), [w.title for w in works])
+
+
+if __name__ == "__main__":
+    unittest.main()
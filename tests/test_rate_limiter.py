@@ -0,0 +1,37 @@
+import threading
+import unittest
+
+from climate_citations.rate_limiter import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        print(f"Running test: {self._testMethodName}")
+
+    def test_concurrent_penalties_do_not_add_up(self):
+        limiter = RateLimiter(10)
+        threads = [threading.Thread(target=limiter.penalize, args=(5,)) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # one 5 s hold-back for everyone, not ten of them
+        wait = limiter._reserve()
+        self.assertGreater(wait, 4.9)
+        self.assertLess(wait, 5.2)
+
+    def test_penalty_keeps_existing_debt(self):
+        limiter = RateLimiter(10, burst=1)
+        for _ in range(80):
+            limiter._reserve()
+        limiter.penalize(1)
+        self.assertGreater(limiter._reserve(), 7.0)
+
+    def test_rate_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from pytest import MonkeyPatch
+
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex import OpenAlexClient
+from climate_citations.snowball_crawler import SnowballCrawler
+
+# W1 -> W2, W3; W2 -> W4; W4 -> W5; W6 -> W1
+GRAPH = {
+    "W1": (["W2", "W3"], 50),
+    "W2": (["W4"], 40),
+    "W3": ([], 30),
+    "W4": (["W5"], 20),
+    "W5": ([], 10),
+    "W6": (["W1"], 5),
+}
+
+
+def record(key):
+    refs, cited = GRAPH[key]
+    return {"id": f"https://openalex.org/{key}", "referenced_works": [f"https://openalex.org/{r}" for r in refs], "cited_by_count": cited}
+
+
+class TestSnowballCrawler(unittest.TestCase):
+
+    def setUp(self):
+        self.mp = MonkeyPatch()
+        self.requests = []
+        def fake_get(client, path, params=None):
+            self.requests.append(params["filter"])
+            name, values = params["filter"].split(":", 1)
+            keys = values.split("|")
+            if name == "openalex_id":
+                hits = [k for k in keys if k in GRAPH]
+            else:  # cites
+                hits = [k for k, (refs, _) in GRAPH.items() if set(refs) & set(keys)]
+            return {"meta": {"next_cursor": None}, "results": [record(k) for k in hits]}
+        self.mp.setattr(OpenAlexClient, "_get", fake_get)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.nodes = os.path.join(self.tmp.name, "nodes.json")
+        self.talker = NetworkFileTalker(json_out_file=self.nodes, reference_edge_file=os.path.join(self.tmp.name, "edges.csv"))
+        self.client = OpenAlexClient(talker=self.talker)
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.mp.undo()
+        self.tmp.cleanup()
+
+    def written_ids(self):
+        return {r["id"].rsplit("/", 1)[-1] for r in self.talker.read_file(self.nodes)}
+
+    def test_backward_two_hops(self):
+        stats = SnowballCrawler(self.client, max_hops=2).crawl(["W1"])
+        self.assertEqual(self.written_ids(), {"W1", "W2", "W3", "W4"})
+        self.assertEqual(stats.nodes_written, 4)
+        self.assertEqual(stats.edges_written, 4)
+        self.assertEqual(stats.max_depth, 2)
+
+    def test_both_directions(self):
+        SnowballCrawler(self.client, max_hops=1, direction="both").crawl(["W2"])
+        self.assertEqual(self.written_ids(), {"W1", "W2", "W4"})
+        self.assertIn("cites:W2", self.requests)
+
+    def test_node_budget(self):
+        stats = SnowballCrawler(self.client, max_hops=3, max_nodes=2).crawl(["W1"])
+        self.assertEqual(stats.stopped_by, "max_nodes")
+        self.assertEqual(self.written_ids(), {"W1", "W2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import unittest
+
+from pytest import MonkeyPatch
+
+from climate_citations.csr import CSRAdjacency
+from climate_citations.network_file_talker import NetworkFileTalker
+from climate_citations.openalex_topic_client import OpenAlexTopicClient
+from climate_citations.topic_citation_network import TopicCitationNetworkBuilder
+
+
+class FakeTopicClient:
+    """
+    Serves the records of sample_works_list.json from iter_topic_works.
+    """
+    def __init__(self):
+        sample_path = os.path.join(os.path.dirname(__file__), "sample_works_list.json")
+        self.records = NetworkFileTalker().read_file(sample_path, key="results")
+
+    def iter_topic_works(self, topic_id, per_page=200, max_results=None, filter_q=None, select=None):
+        yield from self.records[:max_results]
+
+
+class TestTopicCitationNetworkBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.builder = TopicCitationNetworkBuilder(client=FakeTopicClient(), max_works=5)
+        print(f"Running test: {self._testMethodName}")
+
+    def test_build_network_for_topic(self):
+        G = self.builder.build_network_for_topic("T10017")
+        self.assertEqual(G.number_of_edges(), 249)
+        first = G.nodes["https://openalex.org/W4249751050"]
+        self.assertEqual(first["year"], 2013)
+        self.assertTrue(G.has_edge("https://openalex.org/W4249751050", "https://openalex.org/W1529443799"))
+
+    def test_process_pool_build_matches_serial(self):
+        serial = self.builder.build_network_for_topic("T10017")
+        parallel = self.builder.build_network_for_topic("T10017", workers=2)
+        self.assertEqual(set(parallel.edges), set(serial.edges))
+        self.assertEqual(dict(parallel.nodes(data=True)), dict(serial.nodes(data=True)))
+
+    def test_build_csr(self):
+        serial = self.builder.build_network_for_topic("T10017")
+        csr = self.builder.build_network_for_topic("T10017", as_csr=True)
+        self.assertIsInstance(csr, CSRAdjacency)
+        self.assertEqual(csr.num_nodes, serial.number_of_nodes())
+        self.assertEqual(csr.num_edges, serial.number_of_edges())
+        self.assertEqual(set(csr.edges()), set(serial.edges))
+        work_id = "https://openalex.org/W4249751050"
+        self.assertEqual(sorted(csr.successors(work_id)), sorted(serial.successors(work_id)))
+        self.assertEqual(csr.node_attrs[csr.index_of(work_id)]["year"], 2013)
+
+    def test_build_with_openalex_topic_client(self):
+        records = FakeTopicClient().records
+        requests = []
+        def fake_get(client, path, params=None):
+            requests.append(params)
+            start = 0 if params["cursor"] == "*" else int(params["cursor"])
+            next_cursor = str(start + 2) if start + 2 < len(records) else None
+            return {"meta": {"next_cursor": next_cursor}, "results": records[start:start + 2]}
+        mp = MonkeyPatch()
+        mp.setattr(OpenAlexTopicClient, "_get", fake_get)
+        try:
+            builder = TopicCitationNetworkBuilder(client=OpenAlexTopicClient(), max_works=4, per_page=2)
+            G = builder.build_network_for_topic("T10017")
+        finally:
+            mp.undo()
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[0]["select"], ",".join(builder.select))
+        self.assertTrue(G.has_node("https://openalex.org/W4249751050"))
+
+
+if __name__ == "__main__":
+    unittest.main()
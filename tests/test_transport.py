@@ -0,0 +1,98 @@
+import gzip
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from climate_citations.openalex import OpenAlexClient
+from climate_citations.retry_policy import RetryPolicy
+from climate_citations.transport import Transport
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # statuses to answer with before succeeding
+    failures = []
+    seen_encodings = []
+
+    def do_GET(self):
+        self.seen_encodings.append(self.headers.get("Accept-Encoding"))
+        if self.failures:
+            status = self.failures.pop(0)
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = gzip.compress(json.dumps({"meta": {"count": 1}, "results": [{"id": "https://openalex.org/T1"}]}).encode())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        Handler.failures = []
+        Handler.seen_encodings = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"Running test: {self._testMethodName}")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        with Transport(pool_size=2) as transport:
+            for _ in range(5):
+                self.assertEqual(transport.get_json(f"{self.url}/topics")["meta"]["count"], 1)
+            stats = transport.stats
+        self.assertEqual((stats.requests, stats.new_connections), (5, 1))
+        self.assertEqual(stats.reuse_rate(), 0.8)
+        self.assertIn("gzip", Handler.seen_encodings[0])
+
+    def test_stats_are_counted_across_threads(self):
+        with Transport(pool_size=4) as transport:
+            def fetch():
+                for _ in range(25):
+                    transport.send(self.url)
+            threads = [threading.Thread(target=fetch) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            stats = transport.stats
+        self.assertEqual(stats.requests, 100)
+        self.assertEqual(stats.bytes_received, 100 * len(json.dumps({"meta": {"count": 1}, "results": [{"id": "https://openalex.org/T1"}]})))
+
+    def test_retry_policy_is_shared(self):
+        Handler.failures = [429, 503]
+        transport = Transport(retry_policy=RetryPolicy(max_retries=2, backoff_base=0.0, jitter=0.0))
+        client = OpenAlexClient(transport=transport)
+        client._client.BASE = self.url
+        self.assertEqual([t.id for t in client.search_topics("climate")], ["https://openalex.org/T1"])
+        stats = client.transport_stats
+        self.assertEqual((stats.requests, stats.retries, stats.rate_limited), (3, 2, 1))
+        self.assertIn("connection reuse", str(stats))
+
+    def test_default_client_retries_429_once(self):
+        Handler.failures = [429, 429]
+        client = OpenAlexClient(sleep_on_rate_limit=0)
+        client._client.BASE = self.url
+        with self.assertRaises(requests.HTTPError):
+            list(client.search_topics("climate"))
+        self.assertEqual(client.transport_stats.requests, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()